@@ -21,6 +21,7 @@ import pytest
 
 from stepler.baremetal import steps
 from stepler import config
+from stepler.third_party import resource_registry
 
 __all__ = [
     'get_ironic_node_steps',
@@ -69,27 +70,50 @@ def unexpected_node_cleanup(primary_nodes,
 @pytest.fixture
 def ironic_node_steps(unexpected_node_cleanup,
                       get_ironic_node_steps,
-                      cleanup_nodes):
+                      uncleanable):
     """Callable function fixture to get ironic steps.
 
     Can be called several times during a test.
-    After the test it destroys all created nodes.
+    After the test it destroys nodes registered by steps. If
+    ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set, nodes created bypassing
+    steps are found by listing and destroyed too.
 
     Args:
         get_ironic_node_steps (function): function to get ironic steps
-        cleanup_nodes (function): function to cleanup nodes after test
+        uncleanable (AttrDict): data structure with skipped resources
 
     Yields:
         IronicNodeSteps: instantiated ironic node steps
     """
+    nodeid = resource_registry.REGISTRY.nodeid
     _node_steps = get_ironic_node_steps()
 
-    nodes_before = _node_steps.get_ironic_nodes(check=False)
-    nodes_uuids_before = {node.uuid for node in nodes_before}
+    def _delete_nodes(nodes_uuids):
+        uuids = set()
+        for owner_uuids in nodes_uuids.values():
+            uuids.update(owner_uuids)
+        uuids -= uncleanable.nodes_ids
+
+        # nodes deleted by test itself are skipped
+        deleting_nodes = [node
+                          for node in _node_steps.get_ironic_nodes(check=False)
+                          if node.uuid in uuids]
+        _node_steps.delete_ironic_nodes(deleting_nodes)
+
+    resource_registry.REGISTRY.set_cleaner('node', _delete_nodes)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        nodes_before = _node_steps.get_ironic_nodes(check=False)
+        nodes_uuids_before = {node.uuid for node in nodes_before}
 
     yield _node_steps
-    cleanup_nodes(_node_steps,
-                  uncleanable_nodes_uuids=nodes_uuids_before)
+
+    resource_registry.REGISTRY.cleanup('node', nodeid=nodeid)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        _delete_nodes({None: {
+            node.uuid for node in _node_steps.get_ironic_nodes(check=False)
+            if node.uuid not in nodes_uuids_before}})
 
 
 @pytest.fixture(scope='session')
@@ -21,6 +21,7 @@ from hamcrest import equal_to, assert_that, is_not, empty  # noqa
 from ironicclient import exceptions
 
 from stepler.base import BaseSteps
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 from stepler.third_party import waiter
@@ -74,6 +75,8 @@ class IronicNodeSteps(BaseSteps):
 
             _nodes_names[node.uuid] = name
             nodes_list.append(node)
+            # ironic nodes are identified by uuid
+            resource_registry.REGISTRY.register('node', [{'id': node.uuid}])
 
         if check:
             self.check_ironic_nodes_presence(nodes_list)
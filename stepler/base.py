@@ -17,9 +17,15 @@ Base
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import types
+import threading
+import time
 
 import requests
+from requests import adapters
+from requests.packages.urllib3.util import retry
+import six
+
+from stepler import config
 
 __all__ = [
     'BaseApiClient',
@@ -201,8 +207,74 @@ class BaseSteps(object):
         self._client = client
 
 
+_HTTP_SESSIONS = {}
+_HTTP_SESSIONS_LOCK = threading.Lock()
+
+
+def _get_http_session(endpoint):
+    """Get shared HTTP session with keep-alive connections pool to endpoint.
+
+    Idempotent requests are retried with backoff if endpoint responds with
+    5xx status or connection is failed.
+
+    Args:
+        endpoint (str): endpoint URL
+
+    Returns:
+        requests.Session: HTTP session
+    """
+    with _HTTP_SESSIONS_LOCK:
+        if endpoint not in _HTTP_SESSIONS:
+            max_retries = retry.Retry(
+                total=config.API_RETRIES,
+                backoff_factor=config.API_RETRY_BACKOFF,
+                status_forcelist=config.API_RETRY_STATUSES,
+                raise_on_status=False)
+            adapter = adapters.HTTPAdapter(
+                pool_maxsize=config.API_POOL_SIZE, max_retries=max_retries)
+
+            http_session = requests.Session()
+            http_session.mount(endpoint, adapter)
+            _HTTP_SESSIONS[endpoint] = http_session
+
+        return _HTTP_SESSIONS[endpoint]
+
+
+class _ApiClientMeta(type):
+    """Metaclass to register API client methods by namespaces once."""
+
+    def __init__(cls, name, bases, attrs):
+        super(_ApiClientMeta, cls).__init__(name, bases, attrs)
+
+        attrs = {}
+        for klass in reversed(cls.__mro__):
+            attrs.update(klass.__dict__)
+
+        # method ``volumes_create`` is registered as method ``create`` of
+        # namespace ``volumes``
+        cls._namespaces_methods = {}
+        for attr, func in attrs.items():
+            if attr.startswith('_'):
+                continue
+
+            parts = attr.split('_')
+            for i in range(1, len(parts)):
+                namespace = '_'.join(parts[:i])
+                method_name = '_'.join(parts[i:])
+                cls._namespaces_methods.setdefault(
+                    namespace, {})[method_name] = func
+
+        cls._namespaces_classes = {}
+
+
+@six.add_metaclass(_ApiClientMeta)
 class BaseApiClient(object):
-    """Base API Client."""
+    """Base API Client.
+
+    Requests to API are sent via keep-alive connections pool shared by all
+    clients of the same endpoint. Endpoint URL and auth token are cached by
+    client.
+    """
 
     def __init__(self, session):
         """Constructor.
@@ -211,9 +283,11 @@ class BaseApiClient(object):
           session (object): keystone session.
         """
         self._session = session
+        self._cache = {}
+        self._namespaces = {}
 
     def __getattr__(self, name):
-        """Return new instance of API client.
+        """Return API client of namespace.
 
         That mechanism allow to request method particulary, for ex.:
         ``cinder_client.volumes.create()``, but really method is defined as
@@ -222,50 +296,67 @@ class BaseApiClient(object):
         It allows to avoid redundant structure repetition and to provide full
         compatibility with python clients.
 
+        Namespace client is created once per client and shares its session,
+        cached endpoint and token.
+
         Args:
             name (str): Name of attribute.
 
         Returns:
-            BaseApiClient: New instance if attribute name matches existing
-                attributes.
+            BaseApiClient: Namespace client if attribute name matches
+                existing attributes.
 
         Raises:
             AttributeError: If attribute name doesn't match exisiting
                 attributes.
         """
-        matcher = name + '_'  # particular methods prefix
-        methods = {}
+        if name.startswith('_') or name not in self._namespaces_methods:
+            return super(BaseApiClient, self).__getattribute__(name)
 
-        # filter methods corresponding to particular request
-        for attr, func in self.__class__.__dict__.items():
-            if attr.startswith(matcher):
+        if name not in self._namespaces:
+            client = self._get_namespace_class(name)(self._session)
+            client._cache = self._cache  # share cached endpoint and token
+            self._namespaces[name] = client
 
-                new_attr = attr.split(matcher, 1)[-1]
-                methods[new_attr] = func
+        return self._namespaces[name]
 
-        if methods:
-            client = self.__class__(self._session)  # create clone of client
+    @classmethod
+    def _get_namespace_class(cls, name):
+        """Get client class with methods of namespace.
 
-            # set particular methods to client
-            for attr_name, func in methods.items():
-                method = types.MethodType(func, client, client.__class__)
-                setattr(client, attr_name, method)
+        Args:
+            name (str): namespace name
 
-            return client
-        else:
-            return super(BaseApiClient, self).__getattribute__(name)
+        Returns:
+            type: subclass of client class
+        """
+        if name not in cls._namespaces_classes:
+            attrs = dict(cls._namespaces_methods[name])
+            attrs['__module__'] = cls.__module__
+            cls._namespaces_classes[name] = type(
+                str('{}_{}'.format(cls.__name__, name)), (cls,), attrs)
+
+        return cls._namespaces_classes[name]
 
     @property
     def _auth_headers(self):
         """Get auth headers.
 
+        Auth token is cached for ``config.API_TOKEN_CACHE_TIME``.
+
         Returns:
             dict: authentication headers.
         """
         # TODO(schipiga): may be need to use native API
+        token, token_time = self._cache.get('token', (None, 0))
+
+        if time.time() - token_time > config.API_TOKEN_CACHE_TIME:
+            # catch only token to avoid side effects
+            token = self._session.get_auth_headers()['X-Auth-Token']
+            self._cache['token'] = (token, time.time())
 
-        return {  # catch only token to avoid side effects
-            'X-Auth-Token': self._session.get_auth_headers()['X-Auth-Token'],
+        return {
+            'X-Auth-Token': token,
         }
 
     @property
@@ -278,58 +369,73 @@ class BaseApiClient(object):
         # TODO(schipiga): may be need to use native API
         raise NotImplemented
 
-    def _head(self, url, headers=None, params=None, **kwgs):
-        """HEAD request to API."""
-        headers = headers or {}
-        headers.update(self._auth_headers)
+    @property
+    def _endpoint_url(self):
+        """Get cached endpoint URL.
 
-        url = self._endpoint + url
-        return requests.head(url, headers=headers, params=params, **kwgs)
+        Returns:
+          str: endpoint URL.
+        """
+        if 'endpoint' not in self._cache:
+            self._cache['endpoint'] = self._endpoint
+        return self._cache['endpoint']
 
-    def _get(self, url, headers=None, params=None, **kwgs):
-        """GET request to API."""
-        headers = headers or {}
-        headers.update(self._auth_headers)
+    def _request(self, method, url, headers=None, **kwgs):
+        """Send request to API.
 
-        url = self._endpoint + url
+        If API rejects cached auth token, request is sent again with new one.
 
-        return requests.get(url, headers=headers, params=params, **kwgs)
+        Args:
+            method (str): HTTP method
+            url (str): URL path relative to endpoint
+            headers (dict, optional): request headers
+            **kwgs: ``requests.Session.request`` arguments
 
-    def _put(self, url, headers=None, data=None, **kwgs):
-        """PUT request to API."""
+        Returns:
+            requests.Response: API response
+        """
         headers = headers or {}
         headers.update(self._auth_headers)
 
-        url = self._endpoint + url
+        url = self._endpoint_url + url
+        http_session = _get_http_session(self._endpoint_url)
 
-        return requests.put(url, headers=headers, data=data, **kwgs)
+        response = http_session.request(method, url, headers=headers, **kwgs)
+        if response.status_code == requests.codes.unauthorized:
+            self._session.invalidate()
+            self._cache.pop('token', None)
+            headers.update(self._auth_headers)
+            response = http_session.request(
+                method, url, headers=headers, **kwgs)
 
-    def _post(self, url, headers=None, data=None, **kwgs):
-        """POST request to API."""
-        headers = headers or {}
-        headers.update(self._auth_headers)
+        return response
 
-        url = self._endpoint + url
+    def _head(self, url, headers=None, params=None, **kwgs):
+        """HEAD request to API."""
+        kwgs.setdefault('allow_redirects', False)
+        return self._request('HEAD', url, headers=headers, params=params,
+                             **kwgs)
 
-        return requests.post(url, headers=headers, json=data, **kwgs)
+    def _get(self, url, headers=None, params=None, **kwgs):
+        """GET request to API."""
+        return self._request('GET', url, headers=headers, params=params,
+                             **kwgs)
 
-    def _patch(self, url, headers=None, data=None, **kwgs):
-        """PATCH request to API."""
-        headers = headers or {}
-        headers.update(self._auth_headers)
+    def _put(self, url, headers=None, data=None, **kwgs):
+        """PUT request to API."""
+        return self._request('PUT', url, headers=headers, data=data, **kwgs)
 
-        url = self._endpoint + url
+    def _post(self, url, headers=None, data=None, **kwgs):
+        """POST request to API."""
+        return self._request('POST', url, headers=headers, json=data, **kwgs)
 
-        return requests.patch(url, headers=headers, data=data, **kwgs)
+    def _patch(self, url, headers=None, data=None, **kwgs):
+        """PATCH request to API."""
+        return self._request('PATCH', url, headers=headers, data=data, **kwgs)
 
     def _delete(self, url, headers=None, **kwgs):
         """DELETE request to API."""
-        headers = headers or {}
-        headers.update(self._auth_headers)
-
-        url = self._endpoint + url
-
-        return requests.delete(url, headers=headers, **kwgs)
+        return self._request('DELETE', url, headers=headers, **kwgs)
 
 
 class Resource(object):
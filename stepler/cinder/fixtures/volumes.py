@@ -21,6 +21,7 @@ import pytest
 
 from stepler.cinder import steps
 from stepler import config
+from stepler.third_party import resource_registry
 from stepler.third_party import utils
 
 __all__ = [
@@ -77,24 +78,63 @@ def unexpected_volumes_cleanup(primary_volumes,
 @pytest.fixture
 def volume_steps(unexpected_volumes_cleanup,
                  get_volume_steps,
-                 cleanup_volumes):
+                 uncleanable,
+                 credentials):
     """Function fixture to get volume steps.
 
+    Volumes registered by steps during test are deleted with credentials
+    which created them, after registered servers. If
+    ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set, volumes created
+    bypassing steps are found by listing and deleted too.
+
     Args:
         get_volume_steps (function): function to get volume steps
-        cleanup_volumes (function): function to cleanup volumes after test
+        uncleanable (AttrDict): data structure with skipped resources
+        credentials (object): CredentialsManager instance
 
     Yields:
         VolumeSteps: instantiated volume steps
     """
+    initial_alias = credentials.current_alias
+    nodeid = resource_registry.REGISTRY.nodeid
     _volume_steps = get_volume_steps(
         config.CURRENT_CINDER_VERSION, is_api=False)
-    volumes = _volume_steps.get_volumes(check=False)
-    volume_ids_before = {volume.id for volume in volumes}
+
+    def _delete_volumes(volume_ids):
+        for owner, ids in volume_ids.items():
+            ids -= uncleanable.volume_ids
+            if not ids:
+                continue
+
+            with credentials.change(owner):
+                owner_volume_steps = _volume_steps
+                if owner != initial_alias:
+                    owner_volume_steps = get_volume_steps(
+                        config.CURRENT_CINDER_VERSION, is_api=False)
+
+                # volumes deleted by test itself are skipped
+                deleting_volumes = [
+                    volume for volume in
+                    owner_volume_steps.get_volumes(check=False)
+                    if volume.id in ids and
+                    volume.status != config.STATUS_DELETING]
+                owner_volume_steps.delete_volumes(deleting_volumes,
+                                                  cascade=True, force=True)
+
+    resource_registry.REGISTRY.set_cleaner('volume', _delete_volumes)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        volumes = _volume_steps.get_volumes(check=False)
+        volume_ids_before = {volume.id for volume in volumes}
 
     yield _volume_steps
 
-    cleanup_volumes(_volume_steps, uncleanable_ids=volume_ids_before)
+    resource_registry.REGISTRY.cleanup('volume', nodeid=nodeid)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        _delete_volumes({initial_alias: {
+            volume.id for volume in _volume_steps.get_volumes(check=False)
+            if volume.id not in volume_ids_before}})
 
 
 @pytest.fixture(scope='session')
@@ -17,8 +17,9 @@ Snapshot steps
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from cinderclient import exceptions
 from hamcrest import (assert_that, equal_to, is_not, empty,
-                      equal_to_ignoring_case, any_of)  # noqa H301
+                      equal_to_ignoring_case, any_of, not_none)  # noqa H301
 
 from stepler import base
 from stepler import config
@@ -32,6 +33,13 @@ __all__ = ['SnapshotSteps']
 class SnapshotSteps(base.BaseSteps):
     """Snapshot steps."""
 
+    def _find_snapshot(self, snapshot_id):
+        # snapshots of other projects aren't listed without all_tenants
+        try:
+            return self._client.get(snapshot_id)
+        except exceptions.NotFound:
+            return None
+
     @steps_checker.step
     def create_snapshots(self,
                          volume,
@@ -62,10 +70,9 @@ class SnapshotSteps(base.BaseSteps):
             snapshots.append(snapshot)
 
         if check:
-            for snapshot in snapshots:
-                self.check_snapshot_status(
-                    snapshot, [config.STATUS_AVAILABLE],
-                    timeout=config.SNAPSHOT_AVAILABLE_TIMEOUT)
+            self.check_snapshots_status(
+                snapshots, [config.STATUS_AVAILABLE],
+                timeout=config.SNAPSHOT_AVAILABLE_TIMEOUT)
             for snapshot in snapshots:
                 assert_that(snapshot.volume_id, equal_to(volume.id))
 
@@ -82,11 +89,11 @@ class SnapshotSteps(base.BaseSteps):
         Raises:
            TimeoutExpired: if check failed after timeout
         """
+        self.check_snapshots_status(
+            snapshots,
+            statuses=[config.STATUS_AVAILABLE, config.STATUS_ERROR],
+            timeout=config.VOLUME_IN_USE_TIMEOUT)
         for snapshot in snapshots:
-            self.check_snapshot_status(
-                snapshot,
-                statuses=[config.STATUS_AVAILABLE, config.STATUS_ERROR],
-                timeout=config.VOLUME_IN_USE_TIMEOUT)
             self._client.delete(snapshot=snapshot.id)
 
         if check:
@@ -102,6 +109,9 @@ class SnapshotSteps(base.BaseSteps):
                                  timeout=0):
         """Step to check snapshots presence status.
 
+        All snapshots are polled together with one snapshots listing per
+        iteration.
+
         Args:
             snapshots (list): cinder volume snapshots to check presence status
             must_present (bool): flag whether snapshot should present
@@ -110,20 +120,15 @@ class SnapshotSteps(base.BaseSteps):
         Raises:
             TimeoutExpired: if check failed after timeout
         """
-        snapshot_ids = [snapshot.id for snapshot in snapshots]
-        # Make a dict with desired presence values for each snapshot
-        expected_presence = dict.fromkeys(snapshot_ids, must_present)
+        def _check_snapshot_presence(snapshot):
+            return waiter.expect_that(snapshot is not None,
+                                      equal_to(must_present))
 
-        def _check_snapshots_presence():
-            # Make a dict with actual presence values for each snapshot
-            actual_presence = dict.fromkeys(snapshot_ids, False)
-            for snapshot in self._client.list():
-                if snapshot.id in actual_presence:
-                    actual_presence[snapshot.id] = True
-            return waiter.expect_that(actual_presence,
-                                      equal_to(expected_presence))
-
-        waiter.wait(_check_snapshots_presence, timeout_seconds=timeout)
+        waiter.wait_resources(self._client.list,
+                              [snapshot.id for snapshot in snapshots],
+                              _check_snapshot_presence,
+                              get_resource=self._find_snapshot,
+                              timeout_seconds=timeout)
 
     @steps_checker.step
     def check_snapshot_status(self, snapshot, statuses, timeout=0):
@@ -151,6 +156,37 @@ class SnapshotSteps(base.BaseSteps):
 
         waiter.wait(_check_snapshot_status, timeout_seconds=timeout)
 
+    @steps_checker.step
+    def check_snapshots_status(self, snapshots, statuses, timeout=0):
+        """Step to check status of several snapshots.
+
+        All snapshots are polled together with one snapshots listing per
+        iteration.
+
+        Args:
+            snapshots (list): cinder volume snapshots to check status
+            statuses (list): list of statuses names to check
+            timeout (int): seconds to wait a result of check
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+        """
+        matchers = [equal_to_ignoring_case(status) for status in statuses]
+
+        def _check_snapshot_status(snapshot):
+            waiter.expect_that(snapshot, not_none(), "Snapshot is absent")
+            return waiter.expect_that(snapshot.status, any_of(*matchers))
+
+        fresh_snapshots = waiter.wait_resources(
+            self._client.list,
+            [snapshot.id for snapshot in snapshots],
+            _check_snapshot_status,
+            get_resource=self._find_snapshot,
+            timeout_seconds=timeout)
+
+        for snapshot in snapshots:
+            snapshot._add_details(fresh_snapshots[snapshot.id]._info)
+
     @steps_checker.step
     def get_snapshots(self, search_opts=None, check=True):
         """Step to get snapshots.
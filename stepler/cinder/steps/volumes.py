@@ -23,10 +23,11 @@ import attrdict
 from cinderclient import exceptions
 from hamcrest import (assert_that, calling, empty, equal_to, has_entries,
                       has_properties, has_property, is_not, raises,
-                      equal_to_ignoring_case, any_of)  # noqa H301
+                      equal_to_ignoring_case, any_of, not_none)  # noqa H301
 
 from stepler import base
 from stepler import config
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 from stepler.third_party import waiter
@@ -37,6 +38,13 @@ __all__ = ['VolumeSteps']
 class VolumeSteps(base.BaseSteps):
     """Volume steps."""
 
+    def _find_volume(self, volume_id):
+        # volumes of other projects aren't listed without all_tenants
+        try:
+            return self._client.get(volume_id)
+        except exceptions.NotFound:
+            return None
+
     @steps_checker.step
     def check_volume_not_created_with_long_name(self, name):
         """Step to check volume is not created with long name.
@@ -140,15 +148,17 @@ class VolumeSteps(base.BaseSteps):
                 _volume_names[volume.id] = name
                 volumes_chunk.append(volume)
 
+            resource_registry.REGISTRY.register('volume', volumes_chunk)
+
             if check:
-                for volume in volumes_chunk:
-                    self.check_volume_status(
-                        volume, [config.STATUS_AVAILABLE],
-                        transit_statuses=(config.STATUS_CREATING,
-                                          config.STATUS_DOWNLOADING,
-                                          config.STATUS_UPLOADING),
-                        timeout=config.VOLUME_AVAILABLE_TIMEOUT)
+                self.check_volumes_status(
+                    volumes_chunk, [config.STATUS_AVAILABLE],
+                    transit_statuses=(config.STATUS_CREATING,
+                                      config.STATUS_DOWNLOADING,
+                                      config.STATUS_UPLOADING),
+                    timeout=config.VOLUME_AVAILABLE_TIMEOUT)
 
+                for volume in volumes_chunk:
                     if snapshot_id:
                         assert_that(volume.snapshot_id, equal_to(snapshot_id))
                     if _volume_names[volume.id]:
@@ -179,26 +189,27 @@ class VolumeSteps(base.BaseSteps):
                 regardless of state
             check (bool): flag whether to check step or not
         """
+        if not force:
+            self.check_volumes_status(
+                volumes,
+                statuses=[config.STATUS_AVAILABLE, config.STATUS_ERROR],
+                transit_statuses=[
+                    config.STATUS_CREATING, config.STATUS_DELETING,
+                    config.STATUS_UPDATING
+                ],
+                timeout=config.VOLUME_IN_USE_TIMEOUT)
+
         for volume in volumes:
             if force:
                 self._client.force_delete(volume.id)
             else:
-                self.check_volume_status(
-                    volume,
-                    statuses=[config.STATUS_AVAILABLE, config.STATUS_ERROR],
-                    transit_statuses=[
-                        config.STATUS_CREATING, config.STATUS_DELETING,
-                        config.STATUS_UPDATING
-                    ],
-                    timeout=config.VOLUME_IN_USE_TIMEOUT)
                 self._client.delete(volume.id, cascade=cascade)
 
         if check:
-            for volume in volumes:
-                self.check_volume_presence(
-                    volume,
-                    must_present=False,
-                    timeout=config.VOLUME_DELETE_TIMEOUT)
+            self.check_volumes_presence(
+                volumes,
+                must_present=False,
+                timeout=config.VOLUME_DELETE_TIMEOUT)
 
     @steps_checker.step
     def check_volume_presence(self, volume, must_present=True, timeout=0):
@@ -251,6 +262,68 @@ class VolumeSteps(base.BaseSteps):
         matchers = [equal_to_ignoring_case(status) for status in statuses]
         assert_that(volume.status, any_of(*matchers))
 
+    @steps_checker.step
+    def check_volumes_presence(self, volumes, must_present=True, timeout=0):
+        """Check step presence status of several volumes.
+
+        All volumes are polled together with one volumes listing per
+        iteration.
+
+        Args:
+            volumes (list): cinder volumes to check presence status
+            must_present (bool): flag whether volumes should present or not
+            timeout (int): seconds to wait a result of check
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+        """
+        def _check_volume_presence(volume):
+            return waiter.expect_that(volume is not None,
+                                      equal_to(must_present))
+
+        waiter.wait_resources(self._client.list,
+                              [volume.id for volume in volumes],
+                              _check_volume_presence,
+                              get_resource=self._find_volume,
+                              timeout_seconds=timeout)
+
+    @steps_checker.step
+    def check_volumes_status(self, volumes, statuses, transit_statuses=(),
+                             timeout=0):
+        """Check step status of several volumes.
+
+        All volumes are polled together with one volumes listing per
+        iteration, so waiting time is bounded by the slowest volume.
+
+        Args:
+            volumes (list): cinder volumes to check status
+            statuses (list): list of statuses to check
+            transit_statuses (tuple): possible volume transitional statuses
+            timeout (int): seconds to wait a result of check
+
+        Raises:
+            TimeoutExpired|AssertionError: if check failed after timeout
+        """
+        transit_matchers = [equal_to_ignoring_case(status)
+                            for status in transit_statuses]
+
+        def _check_volume_status(volume):
+            waiter.expect_that(volume, not_none(), "Volume is absent")
+            return waiter.expect_that(volume.status,
+                                      is_not(any_of(*transit_matchers)))
+
+        fresh_volumes = waiter.wait_resources(
+            self._client.list,
+            [volume.id for volume in volumes],
+            _check_volume_status,
+            get_resource=self._find_volume,
+            timeout_seconds=timeout)
+
+        matchers = [equal_to_ignoring_case(status) for status in statuses]
+        for volume in volumes:
+            volume._add_details(fresh_volumes[volume.id]._info)
+            assert_that(volume.status, any_of(*matchers))
+
     @steps_checker.step
     def get_volumes(self,
                     name_prefix=None,
@@ -516,6 +589,10 @@ class VolumeSteps(base.BaseSteps):
             image_name=image_name,
             container_format=container_format,
             disk_format=disk_format)
+        upload_info = image.get('os-volume_upload_image', {})
+        if 'image_id' in upload_info:
+            resource_registry.REGISTRY.register(
+                'image', [{'id': upload_info['image_id']}])
 
         if check:
             assert_that(response.status_code, equal_to(202))
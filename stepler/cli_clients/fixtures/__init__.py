@@ -28,6 +28,7 @@ from .object_storage import *  # noqa
 from .openstack import *  # noqa
 
 __all__ = [
+    'get_remote_shell',
     'remote_executor',
 
     'cli_cinder_steps',
@@ -21,49 +21,118 @@ import pytest
 from six import moves
 
 from stepler import config
+from stepler.third_party import remote_shell
+from stepler.third_party import ssh_executor
 
 __all__ = [
+    'get_remote_shell',
     'remote_executor',
 ]
 
 
+def _get_environ_string(environ):
+    return ' '.join("{0}={1}".format(key, moves.shlex_quote(str(value)))
+                    for key, value in environ.items())
+
+
+@pytest.fixture(scope='session')
+def get_remote_shell(nodes_ssh_executor):
+    """Callable session fixture to get persistent remote shell on node.
+
+    Shells are reused by tests with the same node and init command, and are
+    closed at session end.
+
+    Args:
+        nodes_ssh_executor (SshExecutor|None): executor of shell commands on
+            nodes; shells can't be opened if it's None
+
+    Returns:
+        function: function to get remote shell
+
+    **Returned function description:**
+
+    Args:
+        node (NodeCollection): node to open shell on
+        init_cmd (str, optional): command to prepare shell environment
+
+    Returns:
+        RemoteShell: remote shell, which is opened on first command
+    """
+    shells = {}
+
+    def _get_remote_shell(node, init_cmd=None):
+        host = next(iter(node))
+        key = (host.ip, init_cmd)
+        if key not in shells:
+            shells[key] = remote_shell.RemoteShell(
+                nodes_ssh_executor.get_client(host.ip), init_cmd,
+                sudo=nodes_ssh_executor.sudo)
+        return shells[key]
+
+    yield _get_remote_shell
+
+    for shell in shells.values():
+        shell.close()
+
+
 @pytest.fixture
-def remote_executor(nova_api_node, os_faults_steps, credentials):
+def remote_executor(nova_api_node, os_faults_steps, nodes_ssh_executor,
+                    get_remote_shell, credentials):
     """Function fixture to get remote command executor.
 
+    Commands are executed in persistent remote shell, where openrc is sourced
+    once for each credentials. With ``CLI_ANSIBLE_EXECUTOR`` or if nodes
+    aren't accessible via SSH directly, each command is executed with
+    separate os-faults task.
+
     Args:
         nova_api_node (object): controller (node with nova-api service)
         os_faults_steps (object): instantiated os_faults steps
+        nodes_ssh_executor (SshExecutor|None): executor of shell commands on
+            nodes
+        get_remote_shell (function): function to get remote shell
         credentials (object): CredentialsManager instance
 
     Returns:
         callable: function to execute command on `nova_api_node`
     """
-    def _execute_cli(cmd, use_openrc=True, environ=None, **kwargs):
-        environ = environ or {}
-
+    def _execute_cli(cmd, use_openrc=True, environ=None, timeout=0,
+                     check=True):
         if use_openrc:
-            source_cmd = config.OPENRC_ACTIVATE_CMD + ";"
-
-            environ['OS_PROJECT_NAME'] = credentials.project_name
-            environ['OS_TENANT_NAME'] = credentials.project_name
-            environ['OS_USERNAME'] = credentials.username
-            environ['OS_PASSWORD'] = credentials.password
-
-            environ['PYTHONIOENCODING'] = 'utf-8'
+            openrc_environ = {
+                'OS_PROJECT_NAME': credentials.project_name,
+                'OS_TENANT_NAME': credentials.project_name,
+                'OS_USERNAME': credentials.username,
+                'OS_PASSWORD': credentials.password,
+                'PYTHONIOENCODING': 'utf-8',
+            }
+            init_cmd = u"{source_cmd}; export {env}".format(
+                source_cmd=config.OPENRC_ACTIVATE_CMD,
+                env=_get_environ_string(openrc_environ))
         else:
-            source_cmd = ""
+            init_cmd = None
 
-        environ_string = ' '.join("{0}={1}".format(key,
-                                                   moves.shlex_quote(
-                                                       str(value)))
-                                  for key, value in environ.items())
+        cmd = u"{env} {command}".format(env=_get_environ_string(environ or {}),
+                                        command=cmd)
 
-        cmd = u"{source_cmd} {env} {command}".format(source_cmd=source_cmd,
-                                                     env=environ_string,
-                                                     command=cmd)
+        if config.CLI_ANSIBLE_EXECUTOR or nodes_ssh_executor is None:
+            if init_cmd:
+                cmd = u"{}; {}".format(init_cmd, cmd)
+            return os_faults_steps.execute_cmd(nodes=nova_api_node, cmd=cmd,
+                                               timeout=timeout, check=check)
 
-        return os_faults_steps.execute_cmd(nodes=nova_api_node, cmd=cmd,
-                                           **kwargs)
+        shell = get_remote_shell(nova_api_node, init_cmd)
+        exit_code, stdout, stderr = shell.execute(cmd, timeout=timeout)
+        status = (config.STATUS_OK if exit_code == 0
+                  else ssh_executor.STATUS_FAILED)
+        # ansible strips trailing newlines of output
+        payload = {'rc': exit_code,
+                   'stdout': stdout.rstrip('\r\n'),
+                   'stderr': stderr.rstrip('\r\n')}
+        host = next(iter(nova_api_node))
+        return [ssh_executor.ExecutionRecord(host=host.ip,
+                                             status=status,
+                                             task={'shell': cmd},
+                                             payload=payload)]
 
     return _execute_cli
@@ -17,10 +17,65 @@ Base CLI client steps
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from hamcrest import assert_that, is_  # noqa
+import re
+import uuid
+
+from hamcrest import assert_that, is_, only_contains  # noqa H301
+from six import moves
 
 from stepler import base
 
+# client commands of batch are authenticated with token issued once; legacy
+# clients (nova, glance, cinder, neutron) need endpoint URL with token, so
+# they are authenticated with password
+BATCH_TOKEN_CLIENTS = ('openstack',)
+BATCH_TOKEN_CMD = 'openstack token issue -f value -c id'
+BATCH_TOKEN_ENV = 'env ${token:+OS_AUTH_TYPE=token OS_TOKEN="$token"} '
+
+
+def _is_token_command(cmd):
+    """Check whether command is executed with client supporting token."""
+    return cmd.split(' ', 1)[0] in BATCH_TOKEN_CLIENTS
+
+
+def _get_batch_script(cmds, marker, use_token=False):
+    """Get shell script to run commands concurrently and print results."""
+    lines = ['d=$(mktemp -d) || exit 1']
+    if use_token:
+        lines.append('token=$({} 2>/dev/null)'.format(BATCH_TOKEN_CMD))
+
+    for i, cmd in enumerate(cmds):
+        if use_token and _is_token_command(cmd):
+            cmd = BATCH_TOKEN_ENV + cmd
+        lines.append(
+            '{{ ({cmd}) </dev/null >$d/{i}.out 2>$d/{i}.err; '
+            'echo $? >$d/{i}.rc; }} &'.format(cmd=cmd, i=i))
+
+    lines.append('wait')
+    lines.append(
+        'for i in {indexes}; do '
+        'printf "\\n%s %s %s\\n" {marker} $i '
+        '"$(cat $d/$i.rc 2>/dev/null || echo -1)"; cat $d/$i.out; '
+        'printf "\\n%s\\n" {marker}; cat $d/$i.err; done'.format(
+            indexes=' '.join(str(i) for i in range(len(cmds))),
+            marker=marker))
+    lines.append('printf "\\n%s end\\n" {}'.format(marker))
+    lines.append('rm -rf $d')
+    return '\n'.join(lines)
+
+
+def _parse_batch_output(output, marker):
+    """Split batch script output to results of each command."""
+    result_re = re.compile(
+        r'\n{0} (\d+) (-?\d+)\n(.*?)\n{0}\n(.*?)(?=\n{0} )'.format(marker),
+        re.DOTALL)
+    results = {}
+    for match in result_re.finditer(output):
+        index, exit_code, stdout, stderr = match.groups()
+        results[int(index)] = (int(exit_code), stdout.rstrip('\r\n'),
+                               stderr.rstrip('\r\n'))
+    return [results[i] for i in sorted(results)]
+
 
 class BaseCliSteps(base.BaseSteps):
     """Base CLI client steps."""
@@ -56,3 +111,50 @@ class BaseCliSteps(base.BaseSteps):
         if check:
             assert_that(payload['rc'], is_(0))
         return payload['rc'], payload['stdout'], payload['stderr']
+
+    def execute_commands(self,
+                         cmds,
+                         use_openrc=True,
+                         environ=None,
+                         timeout=0,
+                         check=True):
+        """Execute independent client commands in one shell invocation.
+
+        Commands are executed concurrently, so they must not depend on each
+        other, for ex: read-only ``list`` and ``show`` commands. If batch has
+        several ``openstack`` commands, they are authenticated with token
+        issued once instead of password.
+
+        Args:
+            cmds (list): client commands to execute
+            use_openrc (bool): add 'source openrc' before commands executing
+            environ (dict): shell environment variables to set before
+                commands executing. By default it not set any variable
+            timeout (int): seconds to wait all commands executed
+            check (bool): flag whether to check results or not
+
+        Returns:
+            list: (exit_code, stdout, stderr) tuples - results of commands
+                execution in the same order as commands
+
+        Raises:
+            AssertionError: if results check was failed
+        """
+        marker = uuid.uuid4().hex
+        use_token = use_openrc and len(
+            [cmd for cmd in cmds if _is_token_command(cmd)]) > 1
+        script = _get_batch_script(cmds, marker, use_token=use_token)
+
+        _, stdout, _ = self.execute_command(
+            'bash -c {}'.format(moves.shlex_quote(script)),
+            use_openrc=use_openrc,
+            environ=environ,
+            timeout=timeout,
+            check=check)
+        results = _parse_batch_output(stdout, marker)
+
+        if check:
+            assert_that(len(results), is_(len(cmds)))
+            assert_that([exit_code for exit_code, _, _ in results],
+                        only_contains(0))
+        return results
@@ -23,6 +23,7 @@ from six import moves
 from stepler.cli_clients.steps import base
 from stepler import config
 from stepler.third_party import output_parser
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 
 
@@ -59,6 +60,8 @@ class CliCinderSteps(base.BaseCliSteps):
             cmd, timeout=config.VOLUME_AVAILABLE_TIMEOUT, check=check)
         volume_table = output_parser.table(stdout)
         volume = {key: value for key, value in volume_table['values']}
+        if exit_code == 0:
+            resource_registry.REGISTRY.register('volume', [volume])
         return volume
 
     @steps_checker.step
@@ -24,6 +24,7 @@ from six import moves
 from stepler.cli_clients.steps import base
 from stepler import config
 from stepler.third_party import output_parser
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 
@@ -31,6 +32,24 @@ from stepler.third_party import utils
 class CliGlanceSteps(base.BaseCliSteps):
     """CLI glance client steps."""
 
+    def _get_list_images_cmd(self, property_filter, api_version):
+        cmd = 'glance image-list'
+        if property_filter:
+            if api_version == 2:
+                cmd = '{} --property {}'.format(cmd, property_filter)
+            else:
+                cmd = '{} --property-filter {}'.format(cmd, property_filter)
+        return cmd
+
+    def _parse_images_list(self, stdout, api_version):
+        images_table = output_parser.table(stdout)['values']
+        if api_version == 1:
+            # Take two first elements from information of each image
+            # because it is id and name of image
+            images_list = [img[0:2] for img in images_table]
+            return {id_img: name_img for id_img, name_img in images_list}
+        return {id_img: name_img for id_img, name_img in images_table}
+
     @steps_checker.step
     def image_create(self, image_file=None, image_name=None, disk_format=None,
                      container_format=None,
@@ -73,9 +92,11 @@ class CliGlanceSteps(base.BaseCliSteps):
             cmd, environ={'OS_IMAGE_API_VERSION': api_version},
             check=check)
 
-        if check:
+        if exit_code == 0:
             image_table = output_parser.table(stdout)
             image = {key: value for key, value in image_table['values']}
+            # image is registered for cleanup even if step isn't checked
+            resource_registry.REGISTRY.register('image', [image])
 
         return image, exit_code, stdout, stderr
 
@@ -158,25 +179,12 @@ class CliGlanceSteps(base.BaseCliSteps):
         Raises:
             AnsibleExecutionException: if command execution failed
         """
-        images = []
-        cmd = 'glance image-list'
-        if property_filter:
-            if api_version == 2:
-                cmd = '{} --property {}'.format(cmd, property_filter)
-            else:
-                cmd = '{} --property-filter {}'.format(cmd, property_filter)
+        cmd = self._get_list_images_cmd(property_filter, api_version)
         exit_code, stdout, stderr = self.execute_command(
             cmd, environ={'OS_IMAGE_API_VERSION': api_version}, check=check)
+        images = []
         if check:
-            images_table = output_parser.table(stdout)['values']
-            if api_version == 1:
-                # Take two first elements from information of each image
-                # because it is id and name of image
-                images_list = [img[0:2] for img in images_table]
-                images = {id_img: name_img for id_img, name_img in images_list}
-            else:
-                images = {id_img: name_img for id_img, name_img
-                          in images_table}
+            images = self._parse_images_list(stdout, api_version)
         return images
 
     @steps_checker.step
@@ -414,10 +422,13 @@ class CliGlanceSteps(base.BaseCliSteps):
             property_filter (str): image field name to filter images
             api_version (int): glance api version (1 or 2)
         """
-        for image in images:
-            properties = property_filter + '=' + image[property_filter]
-            filtered_images = self.list_images(property_filter=properties,
-                                               api_version=api_version)
+        cmds = [self._get_list_images_cmd(
+            property_filter + '=' + image[property_filter], api_version)
+            for image in images]
+        results = self.execute_commands(
+            cmds, environ={'OS_IMAGE_API_VERSION': api_version})
+        for image, (_, stdout, _) in zip(images, results):
+            filtered_images = self._parse_images_list(stdout, api_version)
             assert_that(image['name'], is_in(filtered_images.values()))
 
     @steps_checker.step
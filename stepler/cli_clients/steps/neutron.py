@@ -17,12 +17,14 @@ Neutron CLI client steps
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
 from hamcrest import assert_that, contains_string, empty, is_not  # noqa H301
 from six import moves
 
 from stepler.cli_clients.steps import base
 from stepler import config
-from stepler.third_party import output_parser
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 
@@ -56,7 +58,7 @@ class CliNeutronSteps(base.BaseCliSteps):
         """
         name = name or next(utils.generate_ids())
         router = None
-        cmd = 'neutron router-create ' + moves.shlex_quote(name)
+        cmd = 'neutron router-create -f json ' + moves.shlex_quote(name)
 
         if project:
             cmd += ' --os-project-name ' + project
@@ -70,8 +72,8 @@ class CliNeutronSteps(base.BaseCliSteps):
             cmd, timeout=config.ROUTER_AVAILABLE_TIMEOUT, check=check)
 
         if not expected_error:
-            router_table = output_parser.table(stdout)
-            router = {key: value for key, value in router_table['values']}
+            router = json.loads(stdout)
+            resource_registry.REGISTRY.register('router', [router])
             if check:
                 assert_that(router, is_not(empty()))
 
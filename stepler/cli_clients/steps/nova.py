@@ -17,7 +17,7 @@ Nova CLI client steps
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from hamcrest import (assert_that, empty, equal_to, is_not,
+from hamcrest import (assert_that, equal_to, is_not,
                       has_items)  # noqa H301
 
 from stepler.cli_clients.steps import base
@@ -49,8 +49,9 @@ class CliNovaSteps(base.BaseCliSteps):
             cmd, timeout=config.SERVER_LIST_TIMEOUT, check=check)
 
         if check:
-            list_result = output_parser.listing(stdout)
-            assert_that(list_result, is_not(empty()))
+            # only first row is needed, so big listing isn't parsed entirely
+            first_server = next(output_parser.iter_listing(stdout), None)
+            assert_that(first_server, is_not(None))
 
     @steps_checker.step
     def live_evacuate(self, source_host, target_host, servers, check=True):
@@ -21,7 +21,6 @@ import json
 
 from hamcrest import (assert_that, empty, has_entries, is_not,
                       equal_to)  # noqa: H301
-import yaml
 
 from stepler.cli_clients.steps import base
 from stepler import config
@@ -39,15 +38,18 @@ class CliOpenstackSteps(base.BaseCliSteps):
             check (bool): flag whether to check result or not
 
         Returns:
-            str: result of command shell execution
+            list: servers dicts
 
         Raises:
             TimeoutExpired|AssertionError: if check failed after timeout
         """
-        cmd = 'openstack server list'
-        result = self.execute_command(
+        cmd = 'openstack server list -f json'
+        exit_code, stdout, stderr = self.execute_command(
             cmd, timeout=config.SERVER_LIST_TIMEOUT, check=check)
-        return result
+        servers = []
+        if check:
+            servers = json.loads(stdout)
+        return servers
 
     @steps_checker.step
     def baremetal_node_list(self, check=True):
@@ -56,13 +58,19 @@ class CliOpenstackSteps(base.BaseCliSteps):
         Args:
             check (bool): flag whether to check result or not
 
+        Returns:
+            list: baremetal nodes dicts
+
         Raises:
             TimeoutExpired|AssertionError: if check failed after timeout
         """
-        cmd = 'openstack baremetal list'
-        self.execute_command(cmd,
-                             timeout=config.SERVER_LIST_TIMEOUT,
-                             check=check)
+        cmd = 'openstack baremetal list -f json'
+        exit_code, stdout, stderr = self.execute_command(
+            cmd, timeout=config.SERVER_LIST_TIMEOUT, check=check)
+        nodes = []
+        if check:
+            nodes = json.loads(stdout)
+        return nodes
 
     @steps_checker.step
     def create_stack(self, name, template_file, parameters=None, check=True):
@@ -258,11 +266,11 @@ class CliOpenstackSteps(base.BaseCliSteps):
         Returns:
             dict: resource template
         """
-        cmd = ('openstack orchestration resource type show '
+        cmd = ('openstack orchestration resource type show -f json '
                '--template-type hot {}').format(resource_type.resource_type)
         exit_code, stdout, stderr = self.execute_command(
             cmd, timeout=config.STACK_CLI_TIMEOUT, check=check)
-        template = yaml.load(stdout)
+        template = json.loads(stdout)
         return template
 
     @steps_checker.step
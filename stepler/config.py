@@ -83,6 +83,13 @@ FORCE_API = bool(os.environ.get('FORCE_API_USAGE'))
 # TODO(schipiga): copied from mos-integration-tests, need refactor.
 TEST_IMAGE_PATH = os.environ.get("TEST_IMAGE_PATH",
                                  os.path.expanduser('~/images'))
+# Max total size of downloaded images in MB, least recently used images are
+# deleted if it's exceeded
+TEST_IMAGE_CACHE_MAX_SIZE = int(os.environ.get(
+    'TEST_IMAGE_CACHE_MAX_SIZE', 30 * 1024)) * 1024 * 1024
+# File with leases of images shared between modules and workers
+IMAGES_POOL_LEASES_PATH = os.environ.get(
+    'IMAGES_POOL_LEASES_PATH', os.path.join(TEST_IMAGE_PATH, 'pool.json'))
 
 TEST_REPORTS_DIR = os.environ.get(
     "TEST_REPORTS_DIR",
@@ -96,6 +103,12 @@ if not os.path.exists(TEST_REPORTS_DIR):
 GOOGLE_DNS_IP = '8.8.8.8'
 
 ANSIBLE_EXECUTION_MAX_TIMEOUT = 1200
+# Shell commands of os-faults steps are executed on nodes via SSH. If flag is
+# set, each command is executed with separate os-faults (ansible) task.
+OS_FAULTS_ANSIBLE_EXECUTOR = bool(
+    os.environ.get('OS_FAULTS_ANSIBLE_EXECUTOR', False))
+# Seconds between command calls while it's polled on nodes side
+REMOTE_POLL_INTERVAL = 0.2
 
 # IMAGE / SERVER CREDENTIALS
 CIRROS_USERNAME = 'cirros'
@@ -111,6 +124,17 @@ CURRENT_CINDER_VERSION = '2'
 CURRENT_IRONIC_VERSION = '1'
 CURRENT_IRONIC_MICRO_VERSION = '1.9'
 
+# API CLIENTS
+# Max count of keep-alive connections to one API endpoint
+API_POOL_SIZE = int(os.environ.get('API_POOL_SIZE', 10))
+# Retries of idempotent requests failed with 5xx status or connection error
+API_RETRIES = int(os.environ.get('API_RETRIES', 3))
+API_RETRY_BACKOFF = 0.5
+API_RETRY_STATUSES = (500, 502, 503, 504)
+# Auth token is requested again after it's cached this time or API returned
+# 401 status
+API_TOKEN_CACHE_TIME = 5 * 60
+
 # SERVICES
 CINDER = 'cinder'
 CINDERV2 = 'cinderv2'
@@ -453,6 +477,16 @@ IMAGE_DOWNLOAD_TIMEOUT = 60
 
 # For DevStack cmd should looks like `source devstack/openrc admin admin`
 OPENRC_ACTIVATE_CMD = os.environ.get('OPENRC_ACTIVATE_CMD', 'source /root/openrc')  # noqa E501
+# CLI commands are executed in persistent remote shell. If flag is set, each
+# command is executed with separate os-faults (ansible) task.
+CLI_ANSIBLE_EXECUTOR = bool(os.environ.get('CLI_ANSIBLE_EXECUTOR', False))
+
+# Cleanup fixtures delete resources registered by steps and find resources
+# created bypassing steps (heat stacks, CLI clients, uploads) by listing before
+# and after test. If flag is set, listing is skipped and such resources are
+# left to session end cleanups.
+CLEANUP_UNREGISTERED_RESOURCES = not bool(
+    os.environ.get('SKIP_CLEANUP_UNREGISTERED_RESOURCES', False))
 
 CLEANUP_UNEXPECTED_BEFORE_TEST = bool(
     os.environ.get('CLEANUP_UNEXPECTED_BEFORE_TEST', False))
@@ -705,17 +739,9 @@ S3_PORT = '8080'
 RADOSGW_SOCK_FILE = '/var/run/ceph/ceph-client.radosgw.gateway.asok'
 
 # NFV
-CPU_PINNING_CMD_1 = ("grep isolcpus /proc/cmdline > /dev/null && "
-                     "lscpu | grep 'NUMA node(s)'")
-CPU_PINNING_CMD_2 = "grep isolcpus /proc/cmdline && lscpu | grep 'NUMA node'"
-CPU_PINNING_CMD_3 = "grep MemTotal /sys/devices/system/node/node*/meminfo"
 CANNOT_FIT_NUMA_TOPOLOGY = ('Requested instance NUMA topology cannot fit '
                             'the given host NUMA topology')
 
 page_1gb = 1048576
 page_2mb = 2048
-HP_GET_DATA_CMD_1 = ("cat /sys/kernel/mm/hugepages/hugepages-{size}kB/"
-                     "{type}_hugepages || echo 0")
-HP_GET_DATA_CMD_2 = ("cat /sys/devices/system/node/node{numa_id}/hugepages/"
-                     "hugepages-{size}kB/{type}_hugepages || echo 0")
 TIME_AFTER_NOVA_COMPUTE_UP = 10
@@ -102,6 +102,7 @@ __all__ = sorted([  # sort for documentation
     'glance_steps',
     'glance_steps_v1',
     'glance_steps_v2',
+    'images_pool',
     'ubuntu_image',
     'ubuntu_xenial_image',
     'conntrack_cirros_image',
@@ -226,6 +227,7 @@ __all__ = sorted([  # sort for documentation
 
     'os_faults_client',
     'os_faults_steps',
+    'nodes_ssh_executor',
     'patch_ini_file_and_restart_services',
     'execute_command_with_rollback',
     'nova_api_node',
@@ -267,8 +269,11 @@ _plugins = [
     'idempotent_id',
     'no_tests_found',
     'reports_cleaner',
+    'resource_registry',
     'skip_list',
+    'skip_requires',
     'steps_checker',
+    'steps_trace',
     'supported_platforms',
 ]
 
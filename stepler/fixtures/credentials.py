@@ -22,6 +22,7 @@ import pytest
 
 from stepler import config
 from stepler.third_party import context
+from stepler.third_party import resource_registry
 
 __all__ = [
     'credentials',
@@ -55,6 +56,8 @@ class CredentialsManager(object):
         assert alias in self._creds
         if alias != self._current_alias:
             self._current_alias = alias
+            # resources are registered with alias of credentials created them
+            resource_registry.REGISTRY.owner = alias
 
     @context.context
     def change(self, alias):
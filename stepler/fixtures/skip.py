@@ -17,12 +17,13 @@ Skip autouse fixture
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import ast
 import functools
 
 import pytest
 
 from stepler import config
+from stepler.third_party import facts_cache
+from stepler.third_party import skip_requires
 
 __all__ = [
     'skip_test',
@@ -30,9 +31,6 @@ __all__ = [
 ]
 
 
-PREDICATES = 'predicates'
-
-
 @pytest.fixture
 def predicates(request):
     """Returns instance of predicates.
@@ -56,50 +54,41 @@ def skip_test(request, predicates):
         It supports any logical and arithmetical operations and their
         combinations.
 
+    Note:
+        Plugin ``stepler.third_party.skip_requires`` sets up this fixture
+        before other test fixtures.
+
     Args:
         request (object): pytest request
     """
-    marker = request.node.get_marker('requires')
+    marker = request.node.get_marker(skip_requires.REQUIRES)
     if not marker:
         return
 
-    for requires in reversed(marker.args):
-
-        tree = ast.parse(requires, mode='eval')
-
-        tree = RewritePredicates().visit(tree)
-        tree = ast.fix_missing_locations(tree)
-        code = compile(tree, '<ast>', mode='eval')
-
-        if not eval(code, {PREDICATES: predicates}):
-            pytest.skip('Skipped due to a mismatch to condition: {!r}\n'
-                        'Calculated conditions: {}'.format(
-                            requires, predicates._get_calculated_conditions()))
-
-        predicates._clear_calls()
-
-
-class RewritePredicates(ast.NodeTransformer):
-    """Class to rewrite requires to predicate instance attributes."""
-
-    def visit_Name(self, node):
-        return ast.copy_location(
-            ast.Attribute(
-                value=ast.Name(
-                    id=PREDICATES, ctx=ast.Load()),
-                attr=node.id,
-                ctx=node.ctx),
-            node)
+    skip_requires.check_requires(predicates, reversed(marker.args))
 
 
 class Predicates(object):
-    """Namespace for predicates to skip a test."""
+    """Namespace for predicates to skip a test.
+
+    Values of predicates which describe cloud configuration are memoized in
+    session-wide ``facts_cache.CLOUD_FACTS``. It's invalidated after cloud
+    reverting and services configuration changes.
+    """
 
-    def __init__(self, request):
+    def __init__(self, request, facts=None):
         """Initialize."""
         self._request = request
+        self._facts = facts or facts_cache.CLOUD_FACTS
         self._calls = []
 
+    def _cached_fact(f):
+        """Decorator to memoize method result in cloud facts cache."""
+        @functools.wraps(f)
+        def wrapper(self):
+            return self._facts.get(f.__name__, f, self)
+        return wrapper
+
     def _store_call(f):
         """Decorator to store each method call with result."""
         @functools.wraps(f)
@@ -125,12 +114,14 @@ class Predicates(object):
         return self._request.getfixturevalue(fixture_name)
 
     @property
+    @_cached_fact
     def _network_type(self):
         os_faults_steps = self._get_fixture('os_faults_steps')
         return os_faults_steps.get_network_type()
 
     @property
     @_store_call
+    @_cached_fact
     def computes_count(self):
         """Returns computes count."""
         hypervisor_steps = self._get_fixture('hypervisor_steps')
@@ -138,6 +129,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def controllers_count(self):
         """Returns controllers count."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -146,6 +138,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def ironic_nodes_count(self):
         """Returns ironic nodes count."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -154,6 +147,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def dhcp_agent_nodes_count(self):
         """Get DHCP agents nodes count."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -163,6 +157,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def l3_agent_nodes_count(self):
         """Get L3 agents nodes count."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -172,6 +167,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def l3_agent_nodes_with_snat_count(self):
         """Get count of L3 agent nodes with SNAT."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -188,18 +184,21 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def vlan(self):
         """Define whether neutron configures with vlan."""
         return self._network_type == config.NETWORK_TYPE_VLAN
 
     @property
     @_store_call
+    @_cached_fact
     def vxlan(self):
         """Define whether neutron configures with vxlan."""
         return self._network_type == config.NETWORK_TYPE_VXLAN
 
     @property
     @_store_call
+    @_cached_fact
     def l3_ha(self):
         """Define whether neutron configures with l3 ha."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -207,6 +206,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def dvr(self):
         """Define whether neutron configures with DVR."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -214,6 +214,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def l2pop(self):
         """Define whether neutron configures with L2pop."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -221,6 +222,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def glance_backend(self):
         """Get glance default backend."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -228,6 +230,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def cinder_storage_protocol(self):
         """Get cinder storage protocol."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -235,6 +238,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def ceilometer(self):
         """Define whether ceilometer is enabled."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -242,6 +246,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def cinder_nodes_count(self):
         """Get count of cinder nodes."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -251,6 +256,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def neutron_debug(self):
         """Define whether neutron configures with debug mode."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -258,6 +264,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def cinder_backup(self):
         """Define whether cinder backup enabled."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -265,6 +272,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def horizon_cinder_backup(self):
         """Define whether horizon cinder backup enabled."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -290,6 +298,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def kvm_nodes_count(self):
         """Get count of KVM nodes."""
         os_faults_steps = self._get_fixture('os_faults_steps')
@@ -297,6 +306,7 @@ class Predicates(object):
 
     @property
     @_store_call
+    @_cached_fact
     def cpu_pinning_computes_count(self):
         """Get count of computes with CPU pinning."""
         os_faults_steps = self._get_fixture('os_faults_steps')
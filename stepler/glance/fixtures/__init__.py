@@ -40,6 +40,7 @@ __all__ = sorted([  # sort for documentation
     'glance_steps_v2',
     'ubuntu_image',
     'images_cleanup',
+    'images_pool',
     'ubuntu_xenial_image',
     'baremetal_ubuntu_image',
     'conntrack_cirros_image',
@@ -17,6 +17,8 @@ Glance fixtures
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import hashlib
 import json
 import logging
 
@@ -27,6 +29,8 @@ import pytest
 from stepler import config
 from stepler.glance import steps
 from stepler.third_party import context
+from stepler.third_party import lease_registry
+from stepler.third_party import resource_registry
 from stepler.third_party import utils
 
 __all__ = [
@@ -42,6 +46,7 @@ __all__ = [
     'glance_steps_v2',
     'ubuntu_image',
     'images_cleanup',
+    'images_pool',
     'ubuntu_xenial_image',
     'baremetal_ubuntu_image',
     'conntrack_cirros_image',
@@ -194,35 +199,64 @@ def api_glance_steps(get_glance_steps):
 
 
 @pytest.fixture
-def images_cleanup(uncleanable):
+def images_cleanup(uncleanable, credentials, get_glance_steps):
     """Callable function fixture to cleanup images after test.
 
+    Images registered by steps inside context are deleted with credentials
+    which created them. If ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set,
+    images created bypassing steps are found by listing and deleted too.
+
     Args:
         uncleanable (AttrDict): data structure with skipped resources
+        credentials (object): CredentialsManager instance
+        get_glance_steps (function): function to get glance steps
 
     Returns:
         function: function to cleanup images
     """
     @context.context
     def _images_cleanup(glance_steps):
+        initial_alias = credentials.current_alias
+        nodeid = resource_registry.REGISTRY.nodeid
 
         def _get_images():
             # check=False because in best case no servers will be
             return glance_steps.get_images(
                 name_prefix=config.STEPLER_PREFIX, check=False)
 
-        image_ids_before = [image.id for image in _get_images()]
+        def _delete_images(image_ids):
+            for owner, ids in image_ids.items():
+                ids -= uncleanable.image_ids
+                if not ids:
+                    continue
 
-        yield
+                with credentials.change(owner):
+                    owner_glance_steps = glance_steps
+                    if owner != initial_alias:
+                        owner_glance_steps = get_glance_steps(
+                            version=config.CURRENT_GLANCE_VERSION,
+                            is_api=False)
+
+                    # images deleted by test itself are skipped
+                    deleting_images = [
+                        image for image in
+                        owner_glance_steps.get_images(check=False)
+                        if image.id in ids]
+                    owner_glance_steps.delete_images(deleting_images)
 
-        deleting_images = []
-        for image in _get_images():
+        resource_registry.REGISTRY.set_cleaner('image', _delete_images)
 
-            if (image.id not in uncleanable.image_ids and
-                    image.id not in image_ids_before):
-                deleting_images.append(image)
+        if config.CLEANUP_UNREGISTERED_RESOURCES:
+            image_ids_before = [image.id for image in _get_images()]
 
-        glance_steps.delete_images(deleting_images)
+        yield
+
+        resource_registry.REGISTRY.cleanup('image', nodeid=nodeid)
+
+        if config.CLEANUP_UNREGISTERED_RESOURCES:
+            _delete_images({initial_alias: {
+                image.id for image in _get_images()
+                if image.id not in image_ids_before}})
 
     return _images_cleanup
 
@@ -248,6 +282,8 @@ def create_images_context(get_glance_steps, uncleanable, credentials,
             image_names=image_names,
             image_path=utils.get_file_path(image_url),
             **kwargs)
+    # images are deleted at context exit, not by cleanup fixtures
+    resource_registry.REGISTRY.unregister('image', images)
 
     for image in images:
         uncleanable.image_ids.add(image.id)
@@ -267,112 +303,191 @@ def create_images_context(get_glance_steps, uncleanable, credentials,
         uncleanable.image_ids.remove(image.id)
 
 
-@pytest.fixture(scope='module')
-def ubuntu_image(get_glance_steps, uncleanable, credentials):
-    """Module fixture to create ubuntu image.
-    Creates image from config.UBUNTU_QCOW2_URL with default options.
+@pytest.fixture(scope='session')
+def images_pool(get_glance_steps, uncleanable, credentials):
+    """Callable session fixture to get image shared between tests.
+
+    Image is looked up by name, which is tagged with hash of its source URL,
+    content checksum, options and leases registry scope, and is created only
+    if it's absent. Modules of session share the same image, workers of
+    pytest-xdist share it via leases registry at
+    ``config.IMAGES_POOL_LEASES_PATH``. Image is deleted at session end by
+    the last worker which uses it, or at next session start if all workers
+    which used it died.
 
     Args:
         get_glance_steps (function): function to get glance steps
         uncleanable (AttrDict): data structure with skipped resources
         credentials (object): CredentialsManager instance
 
+    Returns:
+        function: function to get shared image
+
+    **Returned function description:**
+
+    Args:
+        name (str): image name part, ex: 'cirros'
+        image_url (str): url to download image from
+        **kwargs: additional arguments to pass to API
+
+    Returns:
+        object: glance image
+    """
+    initial_alias = credentials.current_alias
+    registry = lease_registry.LeaseRegistry(config.IMAGES_POOL_LEASES_PATH)
+    # (image_url, kwargs) -> (key, lease, image)
+    leases = collections.OrderedDict()
+
+    def _delete_image(image_id):
+        glance_steps = get_glance_steps(version=config.CURRENT_GLANCE_VERSION,
+                                        is_api=False)
+        images = glance_steps.get_images(id=image_id, check=False)
+        try:
+            glance_steps.delete_images(images)
+        except exceptions.HTTPNotFound:
+            pass
+
+    # finalizer of previous pool of this process is skipped if cloud was
+    # reverted, so its leases are released here; images of crashed
+    # processes are deleted too
+    with credentials.change(initial_alias):
+        registry.release_process_leases(_delete_image)
+        registry.finalize_orphans(_delete_image)
+
+    def _get_image(name, image_url, **kwargs):
+        pool_key = json.dumps([image_url, sorted(kwargs.items())])
+        if pool_key in leases:
+            return leases[pool_key][2]
+
+        image_path = utils.get_file_path(image_url)
+        checksum = utils.get_md5sum(image_path)
+        key = json.dumps([config.AUTH_URL, image_url, checksum,
+                          sorted(kwargs.items())])
+
+        # image is shared only by processes which share leases registry,
+        # others can't see its leases and must not take or delete it
+        name_key = json.dumps([registry.scope, key])
+        image_name = '{}-pool-{}-{}'.format(
+            config.BASE_PREFIX, name,
+            hashlib.md5(name_key.encode('utf-8')).hexdigest()[:8])
+        found_images = []
+
+        def _get_or_create_image(image_id):
+            glance_steps = get_glance_steps(
+                version=config.CURRENT_GLANCE_VERSION, is_api=False)
+            images = glance_steps.get_images(
+                name=image_name, status='active', checksum=checksum,
+                check=False)
+            # image registered by another worker is preferred
+            images.sort(key=lambda image: image.id != image_id)
+            if not images:
+                images = glance_steps.create_images(
+                    image_names=[image_name], image_path=image_path, **kwargs)
+                # pool image is deleted by pool, not by cleanup fixtures
+                resource_registry.REGISTRY.unregister('image', images)
+            found_images.append(images[0])
+            return images[0].id
+
+        with credentials.change(initial_alias):
+            _, lease = registry.acquire(key, _get_or_create_image)
+
+        image = found_images[0]
+        uncleanable.image_ids.add(image.id)
+        leases[pool_key] = key, lease, image
+        return image
+
+    yield _get_image
+
+    with credentials.change(initial_alias):
+        for key, lease, image in leases.values():
+            registry.release(key, lease, _delete_image)
+            uncleanable.image_ids.discard(image.id)
+
+
+@pytest.fixture(scope='module')
+def ubuntu_image(images_pool):
+    """Module fixture to create ubuntu image.
+    Creates image from config.UBUNTU_QCOW2_URL with default options.
+
+    Args:
+        images_pool (function): function to get shared image
+
     Returns:
         object: ubuntu glance image
     """
-    with create_images_context(
-            get_glance_steps,
-            uncleanable,
-            credentials,
-            utils.generate_ids('ubuntu'),
-            config.UBUNTU_QCOW2_URL,
-            visibility=config.IMAGE_VISIBILITY_PUBLIC) as images:
-        yield images[0]
+    return images_pool('ubuntu', config.UBUNTU_QCOW2_URL,
+                       visibility=config.IMAGE_VISIBILITY_PUBLIC)
 
 
 @pytest.fixture(scope='module')
-def ubuntu_xenial_image(get_glance_steps, uncleanable, credentials):
+def ubuntu_xenial_image(images_pool):
     """Module fixture to create ubuntu xenial image.
     Creates image from config.UBUNTU_XENIAL_QCOW2_URL with default options.
 
     Args:
-        get_glance_steps (function): function to get glance steps
-        uncleanable (AttrDict): data structure with skipped resources
-        credentials (object): CredentialsManager instance
+        images_pool (function): function to get shared image
 
     Returns:
         object: ubuntu xenial glance image
     """
-    with create_images_context(
-            get_glance_steps,
-            uncleanable,
-            credentials,
-            utils.generate_ids('ubuntu-xenial'),
-            config.UBUNTU_XENIAL_QCOW2_URL,
-            visibility=config.IMAGE_VISIBILITY_PUBLIC) as images:
-        yield images[0]
+    return images_pool('ubuntu-xenial', config.UBUNTU_XENIAL_QCOW2_URL,
+                       visibility=config.IMAGE_VISIBILITY_PUBLIC)
 
 
 @pytest.fixture(scope='module')
-def cirros_image(get_glance_steps, uncleanable, credentials):
+def cirros_image(images_pool):
     """Module fixture to create cirros image with default options.
 
     Args:
-        get_glance_steps (function): function to get glance steps
-        uncleanable (AttrDict): data structure with skipped resources
-        credentials (object): CredentialsManager instance
+        images_pool (function): function to get shared image
 
     Returns:
         object: cirros glance image
     """
-    with create_images_context(
-            get_glance_steps,
-            uncleanable,
-            credentials,
-            utils.generate_ids('cirros'),
-            config.CIRROS_QCOW2_URL,
-            visibility=config.IMAGE_VISIBILITY_PUBLIC) as images:
-        yield images[0]
+    return images_pool('cirros', config.CIRROS_QCOW2_URL,
+                       visibility=config.IMAGE_VISIBILITY_PUBLIC)
 
 
 @pytest.fixture(scope='module')
-def cirros_image_shared(get_glance_steps, cirros_image):
+def cirros_image_shared(get_glance_steps, uncleanable, credentials):
     """Module fixture to create shared cirros image with default options.
 
+    Image isn't taken from images pool, because its visibility is changed.
+
     Args:
         get_glance_steps (function): function to get glance steps
-        cirros_image (object): cirros glance image
+        uncleanable (AttrDict): data structure with skipped resources
+        credentials (object): CredentialsManager instance
 
     Returns:
         object: shared cirros glance image
     """
-    glance_steps = get_glance_steps(
-        version=config.CURRENT_GLANCE_VERSION, is_api=False)
-    glance_steps.update_images(
-        [cirros_image], visibility=config.IMAGE_VISIBILITY_SHARED)
-    return cirros_image
+    with create_images_context(
+            get_glance_steps,
+            uncleanable,
+            credentials,
+            utils.generate_ids('cirros'),
+            config.CIRROS_QCOW2_URL,
+            visibility=config.IMAGE_VISIBILITY_PUBLIC) as images:
+        glance_steps = get_glance_steps(
+            version=config.CURRENT_GLANCE_VERSION, is_api=False)
+        glance_steps.update_images(
+            images, visibility=config.IMAGE_VISIBILITY_SHARED)
+        yield images[0]
 
 
 @pytest.fixture
-def conntrack_cirros_image(get_glance_steps, uncleanable, credentials):
+def conntrack_cirros_image(images_pool):
     """Function fixture to create cirros image with patches for conntrack.
 
     Args:
-        get_glance_steps (function): function to get glance steps
-        uncleanable (AttrDict): data structure with skipped resources
-        credentials (object): CredentialsManager instance
+        images_pool (function): function to get shared image
 
     Returns:
         object: public cirros glance image
     """
-    with create_images_context(
-            get_glance_steps,
-            uncleanable,
-            credentials,
-            utils.generate_ids('cirros'),
-            config.CONNTRACK_CIRROS_IMAGE,
-            visibility=config.IMAGE_VISIBILITY_PUBLIC) as images:
-        yield images[0]
+    return images_pool('conntrack-cirros', config.CONNTRACK_CIRROS_IMAGE,
+                       visibility=config.IMAGE_VISIBILITY_PUBLIC)
 
 
 @pytest.fixture(scope='module')
@@ -23,6 +23,7 @@ import warlock.model
 
 from stepler import base
 from stepler import config
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 from stepler.third_party import waiter
@@ -122,6 +123,7 @@ class BaseGlanceSteps(base.BaseSteps):
                 disk_format=disk_format,
                 container_format=container_format,
                 **kwargs)
+            resource_registry.REGISTRY.register('image', [image])
 
             if upload:
                 self.upload_image(image, image_path, check=False)
@@ -161,7 +163,8 @@ class BaseGlanceSteps(base.BaseSteps):
             return waiter.expect_that(image.status.lower(),
                                       equal_to(status.lower()))
 
-        waiter.wait(_check_image_status, timeout_seconds=timeout)
+        waiter.wait(_check_image_status, timeout_seconds=timeout,
+                    sleep_seconds=waiter.SLOW_BACKOFF)
 
     @steps_checker.step
     def delete_images(self, images, check=True):
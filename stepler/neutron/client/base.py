@@ -71,20 +71,15 @@ def transform_many(f):
 
 
 def filter_by_project(f):
-    """Decorator to filter list of objects by current project."""
+    """Decorator to filter list of objects by current project.
+
+    Objects are filtered by neutron server.
+    """
     @functools.wraps(f)
     def wrapper(self, current_project_only=True, *args, **kwargs):
-        result = f(self, *args, **kwargs)
         if current_project_only:
-            current_project_id = self._rest_client.get_auth_info()[
-                'auth_tenant_id']
-            filtered_objs = []
-            for item in result:
-                if current_project_id in (item.get('project_id'),
-                                          item.get('tenant_id')):
-                    filtered_objs.append(item)
-            result = filtered_objs
-        return result
+            kwargs.setdefault('tenant_id', self.client.project_id)
+        return f(self, *args, **kwargs)
     return wrapper
 
 
@@ -156,6 +151,11 @@ class BaseNeutronManager(object):
         """Base delete."""
         self._delete_method(obj_id)
 
+    def delete_many(self, obj_ids):
+        """Base bulk delete."""
+        for obj_id in obj_ids:
+            self.delete(obj_id)
+
     @transform_many
     def list(self):
         """Base list (retrive all)."""
@@ -165,11 +165,32 @@ class BaseNeutronManager(object):
     def find_all(self, **kwargs):
         """Returns a list of objects by conditions.
 
-        Results may be empty.
+        Conditions are passed to neutron server, ex: ``id=[id1, id2]``,
+        ``fields=['id', 'status']``. Results may be empty.
         """
         objs = self._list_method(**kwargs)[self.NAME + 's']
         return objs
 
+    def iter_all(self, page_size=500, **kwargs):
+        """Iterate objects by conditions page by page.
+
+        Objects are requested from neutron server with pagination, so only
+        one page is kept in memory. Use ``fields=[...]`` to request only
+        required attributes and ``id=[...]`` to filter several objects.
+
+        Args:
+            page_size (int): count of objects in one page
+            **kwargs: conditions to filter objects
+
+        Yields:
+            Resource: object
+        """
+        pages = self._list_method(retrieve_all=False, limit=page_size,
+                                  **kwargs)
+        for page in pages:
+            for obj in page[self.NAME + 's']:
+                yield self._make_resource(obj)
+
     @transform_one
     def find(self, **kwargs):
         """Returns one found object.
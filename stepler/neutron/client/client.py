@@ -35,6 +35,15 @@ class NeutronClient(object):
     """Wrapper for python-neutronclient."""
     def __init__(self, client):
         self._rest_client = client
+        self._project_id = None
+
+    @property
+    def project_id(self):
+        """Current project id, requested once per client."""
+        if self._project_id is None:
+            self._project_id = self._rest_client.get_auth_info()[
+                'auth_tenant_id']
+        return self._project_id
 
     @property
     def agents(self):
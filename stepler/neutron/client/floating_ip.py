@@ -55,3 +55,7 @@ class FloatingIPManager(base.BaseNeutronManager):
     @base.filter_by_project
     def find_all(self, **kwargs):
         return super(FloatingIPManager, self).find_all(**kwargs)
+
+    @base.filter_by_project
+    def iter_all(self, **kwargs):
+        return super(FloatingIPManager, self).iter_all(**kwargs)
@@ -35,15 +35,50 @@ class PortManager(base.BaseNeutronManager):
 
         Args:
             port_id (str): port identifier
+
+        Raises:
+            NotFound: if port doesn't exist
+        """
+        self._delete_ports([self.get(port_id)])
+
+    def delete_many(self, port_ids):
+        """Delete ports.
+
+        Ports are requested and deleted with a few API calls, router
+        interfaces are removed from routers. Absent ports are skipped.
+
+        Args:
+            port_ids (list): ports identifiers
         """
-        port = self.get(port_id)
-        if port['device_owner'] == 'network:router_interface':
-            self.client.routers.remove_port_interface(
-                port['device_id'], port_id)
-        # If port wasn't deleted - delete it
-        if self.find_all(id=port_id):
-            super(PortManager, self).delete(port_id)
+        port_ids = list(port_ids)
+        if not port_ids:
+            return
+
+        ports = self.find_all(id=port_ids,
+                              fields=['id', 'device_id', 'device_owner'],
+                              current_project_only=False)
+        self._delete_ports(ports)
+
+    def _delete_ports(self, ports):
+        removed = False
+        for port in ports:
+            if port['device_owner'] == 'network:router_interface':
+                self.client.routers.remove_port_interface(
+                    port['device_id'], port['id'])
+                removed = True
+
+        # If ports weren't deleted with routers interfaces - delete them
+        if removed:
+            ports = self.find_all(id=[port['id'] for port in ports],
+                                  fields=['id'],
+                                  current_project_only=False)
+        for port in ports:
+            super(PortManager, self).delete(port['id'])
 
     @base.filter_by_project
     def find_all(self, **kwargs):
         return super(PortManager, self).find_all(**kwargs)
+
+    @base.filter_by_project
+    def iter_all(self, **kwargs):
+        return super(PortManager, self).iter_all(**kwargs)
@@ -58,15 +58,12 @@ class RouterManager(base.BaseNeutronManager):
 
     def get_interfaces_ports(self, router_id):
         """Get router interface ports."""
-        router_ports = self.client.ports.find_all(device_id=router_id,
-                                                  current_project_only=False)
-        dev_owner_values = ('network:router_interface',
+        dev_owner_values = ['network:router_interface',
                             'network:ha_router_replicated_interface',
-                            'network:router_interface_distributed')
-        return [
-            port for port in router_ports
-            if port['device_owner'] in dev_owner_values
-        ]
+                            'network:router_interface_distributed']
+        return self.client.ports.find_all(device_id=router_id,
+                                          device_owner=dev_owner_values,
+                                          current_project_only=False)
 
     def get_router_interfaces_subnets_ids(self, router_id):
         """Get router interfaces subnets ids list."""
@@ -136,3 +133,7 @@ class RouterManager(base.BaseNeutronManager):
     @base.filter_by_project
     def find_all(self, **kwargs):
         return super(RouterManager, self).find_all(**kwargs)
+
+    @base.filter_by_project
+    def iter_all(self, **kwargs):
+        return super(RouterManager, self).iter_all(**kwargs)
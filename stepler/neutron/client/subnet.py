@@ -61,16 +61,18 @@ class SubnetManager(base.BaseNeutronManager):
         return super(SubnetManager, self).create(**query)
 
     def get_ports(self, subnet_id):
-        """Return ports with interface to subnet."""
-        subnet_ports = []
-        for port in self.client.ports.list():
-            if subnet_id in [ip['subnet_id'] for ip in port['fixed_ips']]:
-                subnet_ports.append(port)
-        return subnet_ports
+        """Return ports with interface to subnet of all projects."""
+        return self.client.ports.find_all(
+            fixed_ips=['subnet_id={}'.format(subnet_id)],
+            current_project_only=False)
 
     def get_fixed_ips(self, subnet_id):
         """Return subnet allocated fixed ip addresses."""
-        for port in self.get_ports(subnet_id):
+        ports = self.client.ports.iter_all(
+            fixed_ips=['subnet_id={}'.format(subnet_id)],
+            fields=['fixed_ips'],
+            current_project_only=False)
+        for port in ports:
             for ip in port['fixed_ips']:
                 if ip['subnet_id'] == subnet_id:
                     yield ip['ip_address']
@@ -81,8 +83,8 @@ class SubnetManager(base.BaseNeutronManager):
         Subnet can't be deleted until it has active ports, so we delete such
         ports before deleting subnet.
         """
-        for port in self.get_ports(subnet_id):
-            self.client.ports.delete(port['id'])
+        self.client.ports.delete_many(
+            port['id'] for port in self.get_ports(subnet_id))
         return super(SubnetManager, self).delete(subnet_id)
 
     @base.filter_by_project
@@ -21,6 +21,7 @@ import pytest
 
 from stepler import config
 from stepler.neutron import steps
+from stepler.third_party import resource_registry
 from stepler.third_party.utils import generate_ids
 
 __all__ = [
@@ -62,6 +63,7 @@ def network_steps(get_network_steps, uncleanable):
     Yields:
         stepler.neutron.steps.NetworkSteps: instantiated network steps
     """
+    nodeid = resource_registry.REGISTRY.nodeid
     _network_steps = get_network_steps()
 
     networks = _network_steps.get_networks(check=False)
@@ -69,6 +71,9 @@ def network_steps(get_network_steps, uncleanable):
 
     yield _network_steps
 
+    # registered servers and ports can use networks
+    resource_registry.REGISTRY.cleanup('network', nodeid=nodeid)
+
     uncleanable_ids = network_ids_before | uncleanable.network_ids
     _cleanup_networks(_network_steps, uncleanable_ids=uncleanable_ids)
 
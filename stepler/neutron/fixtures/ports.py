@@ -20,6 +20,7 @@ Ports fixtures
 import pytest
 
 from stepler.neutron import steps
+from stepler.third_party import resource_registry
 
 __all__ = [
     'create_port',
@@ -48,6 +49,7 @@ def create_port(port_steps):
         function: function to create port as batch with options
     """
     ports = []
+    nodeid = resource_registry.REGISTRY.nodeid
 
     def _create_port(network, **kwargs):
         port = port_steps.create(network, **kwargs)
@@ -56,8 +58,11 @@ def create_port(port_steps):
 
     yield _create_port
 
-    for port in ports:
-        port_steps.delete(port)
+    # registered servers can use ports
+    resource_registry.REGISTRY.cleanup('port', nodeid=nodeid)
+
+    if ports:
+        port_steps.delete_ports(ports)
 
 
 @pytest.fixture
@@ -23,6 +23,8 @@ import pytest
 
 from stepler import config
 from stepler.neutron import steps
+from stepler.third_party import resource_registry
+from stepler.third_party import utils
 from stepler.third_party.utils import generate_ids
 
 __all__ = [
@@ -120,21 +122,42 @@ def router(request, router_steps, create_router, public_network):
 def routers_cleanup(router_steps):
     """Fixture to clear created routers after test.
 
-    It stores ids of all routers before test and removes all
-    new routers after test.
+    Routers registered by steps during test are deleted concurrently, after
+    registered servers, ports and volumes. If
+    ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set, routers created
+    bypassing steps are found by listing and deleted too.
 
     Args:
         router_steps (obj): instantiated neutron routers steps
     """
-    preserve_routers_ids = set(
-        router['id'] for router in router_steps.get_routers())
+    nodeid = resource_registry.REGISTRY.nodeid
+
+    def _delete_routers(router_ids):
+        ids = set()
+        for owner_ids in router_ids.values():
+            ids.update(owner_ids)
+
+        # routers deleted by test itself are skipped
+        deleting_routers = [router
+                            for router in router_steps.get_routers(check=False)
+                            if router['id'] in ids]
+        utils.parallel_map(router_steps.delete, deleting_routers)
+
+    resource_registry.REGISTRY.set_cleaner('router', _delete_routers)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        preserve_routers_ids = set(
+            router['id'] for router in router_steps.get_routers())
 
     yield
 
-    for router in router_steps.get_routers():
-        if (router['id'] not in preserve_routers_ids and
-                router['name'].startswith(config.STEPLER_PREFIX)):
-            router_steps.delete(router)
+    resource_registry.REGISTRY.cleanup('router', nodeid=nodeid)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        _delete_routers({None: {
+            router['id'] for router in router_steps.get_routers(check=False)
+            if router['id'] not in preserve_routers_ids and
+            router['name'].startswith(config.STEPLER_PREFIX)}})
 
 
 @pytest.fixture
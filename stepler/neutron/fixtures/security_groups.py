@@ -21,6 +21,7 @@ import pytest
 
 from stepler import config
 from stepler.neutron import steps
+from stepler.third_party import resource_registry
 from stepler.third_party import utils
 
 
@@ -74,20 +75,45 @@ def neutron_security_group_steps(get_neutron_security_group_steps,
 def neutron_security_groups_cleanup(get_neutron_security_group_steps):
     """Function fixture to cleanup security groups after test.
 
+    Security groups registered by steps during test are deleted concurrently,
+    after registered resources of other services which can use them. If
+    ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set, security groups created
+    bypassing steps are found by listing and deleted too.
+
     Args:
         get_neutron_security_group_steps (function): function to get
             instantiated neutron security group steps
     """
+    nodeid = resource_registry.REGISTRY.nodeid
     security_group_steps = get_neutron_security_group_steps()
-    groups_before = security_group_steps.get_security_groups(check=False)
-    group_ids_before = [group['id'] for group in groups_before]
+
+    def _delete_groups(group_ids):
+        ids = set()
+        for owner_ids in group_ids.values():
+            ids.update(owner_ids)
+
+        # security groups deleted by test itself are skipped
+        deleting_groups = [
+            group for group in
+            security_group_steps.get_security_groups(check=False)
+            if group['id'] in ids]
+        utils.parallel_map(security_group_steps.delete, deleting_groups)
+
+    resource_registry.REGISTRY.set_cleaner('security_group', _delete_groups)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        groups_before = security_group_steps.get_security_groups(check=False)
+        group_ids_before = [group['id'] for group in groups_before]
 
     yield
 
-    groups = security_group_steps.get_security_groups(check=False)
-    for group in groups:
-        if group['id'] not in group_ids_before:
-            security_group_steps.delete(group)
+    resource_registry.REGISTRY.cleanup('security_group', nodeid=nodeid)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        _delete_groups({None: {
+            group['id'] for group in
+            security_group_steps.get_security_groups(check=False)
+            if group['id'] not in group_ids_before}})
 
 
 @pytest.fixture
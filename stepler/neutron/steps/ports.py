@@ -62,6 +62,21 @@ class PortSteps(base.BaseSteps):
         if check:
             self.check_presence(port, must_present=False)
 
+    @steps_checker.step
+    def delete_ports(self, ports, check=True):
+        """Step to delete ports with bulk requests.
+
+        Args:
+            ports (list): ports to delete
+            check (bool): flag whether to check step or not
+
+        Raises:
+            TimeoutExpired: if ports are present after deletion
+        """
+        self._client.delete_many(port['id'] for port in ports)
+        if check:
+            self.check_ports_presence(ports, must_present=False)
+
     @steps_checker.step
     def update(self, port, check=True, **kwargs):
         """Step to update port attributes.
@@ -94,11 +109,37 @@ class PortSteps(base.BaseSteps):
             TimeoutExpired: if check failed after timeout
         """
         def _check_port_presence():
-            is_present = bool(self._client.find_all(id=port['id']))
+            is_present = bool(
+                self._client.find_all(id=port['id'], fields=['id']))
             return waiter.expect_that(is_present, equal_to(must_present))
 
         waiter.wait(_check_port_presence, timeout_seconds=timeout)
 
+    @steps_checker.step
+    def check_ports_presence(self, ports, must_present=True, timeout=0):
+        """Verify step to check ports are present with one request.
+
+        Args:
+            ports (list): neutron ports to check presence status
+            must_present (bool): flag whether ports must present or not
+            timeout (int): seconds to wait a result of check
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+        """
+        port_ids = [port['id'] for port in ports]
+        expected_ids = port_ids if must_present else []
+
+        def _check_ports_presence():
+            present_ids = []
+            if port_ids:  # empty ids list means no filter
+                present_ids = [port['id'] for port in self._client.find_all(
+                    id=port_ids, fields=['id'], current_project_only=False)]
+            return waiter.expect_that(sorted(present_ids),
+                                      equal_to(sorted(expected_ids)))
+
+        waiter.wait(_check_ports_presence, timeout_seconds=timeout)
+
     @steps_checker.step
     def get_port(self, check=True, **kwargs):
         """Step to get port by params in '**kwargs'.
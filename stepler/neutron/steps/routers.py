@@ -23,6 +23,7 @@ from hamcrest import (assert_that, calling, empty, equal_to, has_entries,
 from neutronclient.common import exceptions
 
 from stepler import base
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 from stepler.third_party import waiter
@@ -48,6 +49,7 @@ class RouterSteps(base.BaseSteps):
         """
         router = self._client.create(name=router_name, distributed=distributed,
                                      **kwargs)
+        resource_registry.REGISTRY.register('router', [router])
 
         if check:
             self.check_presence(router)
@@ -22,6 +22,7 @@ from hamcrest import (assert_that, calling, empty, equal_to, has_entries,
 from neutronclient.common import exceptions
 
 from stepler import base
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 from stepler.third_party import waiter
@@ -47,6 +48,7 @@ class NeutronSecurityGroupSteps(base.BaseSteps):
         group_name = group_name or next(utils.generate_ids())
         description = description or ''
         group = self._client.create(name=group_name, description=description)
+        resource_registry.REGISTRY.register('security_group', [group])
 
         if check:
             self.check_presence(group)
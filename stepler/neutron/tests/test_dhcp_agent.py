@@ -1129,8 +1129,7 @@ def test_ban_two_dhcp_and_two_l3_agents(router,
     controllers = os_faults_steps.get_nodes_for_agents(dhcp_agents)
 
     log_file = config.AGENT_LOGS[config.NEUTRON_SERVER_SERVICE][0]
-    line_count_file_path = os_faults_steps.store_file_line_count(controllers,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(controllers, log_file)
 
     network = create_max_networks_with_instances(router)[0]
 
@@ -1167,5 +1166,5 @@ def test_ban_two_dhcp_and_two_l3_agents(router,
         file_name=log_file,
         keyword=config.STR_ERROR,
         non_matching=config.STR_NEUTRON_API_V2_ERROR,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
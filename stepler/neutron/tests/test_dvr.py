@@ -1276,8 +1276,7 @@ def test_check_router_update_notification_for_l3_agents(
 
     log_file = config.AGENT_LOGS[config.NEUTRON_L3_SERVICE][1]
 
-    line_count_file_path = os_faults_steps.store_file_line_count(nodes,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(nodes, log_file)
 
     network = net_subnet_router[0]
     server_host_name = host_steps.get_host(fqdn=server_host_fqdn).host_name
@@ -1296,13 +1295,13 @@ def test_check_router_update_notification_for_l3_agents(
     os_faults_steps.check_string_in_file(
         server_node, file_name=log_file,
         keyword=config.STR_L3_AGENT_NOTIFICATION,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         expected_count=3)
 
     os_faults_steps.check_string_in_file(
         nodes - server_node, file_name=log_file,
         keyword=config.STR_L3_AGENT_NOTIFICATION,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
 
 
@@ -1442,8 +1441,7 @@ def test_add_router_interface_with_port_id(create_router,
 
     log_file = config.AGENT_LOGS[config.NEUTRON_SERVER_SERVICE][0]
 
-    line_count_file_path = os_faults_steps.store_file_line_count(nodes,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(nodes, log_file)
 
     router_name = next(utils.generate_ids())
     router = create_router(router_name, distributed=True)
@@ -1454,5 +1452,5 @@ def test_add_router_interface_with_port_id(create_router,
     os_faults_steps.check_string_in_file(
         nodes, file_name=log_file,
         keyword=config.STR_ERROR_GATEWAY_PORT,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
@@ -21,6 +21,7 @@ from hamcrest import greater_than
 import pytest
 
 from stepler import config
+from stepler.third_party import tcpdump
 from stepler.third_party import utils
 
 pytestmark = [
@@ -610,8 +611,8 @@ def test_ping_routing_during_l3_agent_ban(
             old_l3_agent=old_agent,
             timeout=config.AGENT_RESCHEDULING_TIMEOUT)
     os_faults_steps.stop_tcpdump(agent_nodes, tcpdump_files)
-    pcap_files = os_faults_steps.download_tcpdump_results(agent_nodes,
-                                                          tcpdump_files)
+    pcap_files = os_faults_steps.download_tcpdump_results(
+        agent_nodes, tcpdump_files, bpf_filter=tcpdump.BPF_ICMP_REPLY)
 
     new_agent = agent_steps.get_l3_agents_for_router(
         router, filter_attrs=config.HA_STATE_ACTIVE_ATTRS)[0]
@@ -66,8 +66,7 @@ def test_restart_agent_controller_with_sighup(agent_steps,
         # agent is running on gtw node
         log_file = config.AGENT_LOGS[agent_name][2]
 
-    line_count_file_path = os_faults_steps.store_file_line_count(node,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(node, log_file)
 
     pid = os_faults_steps.get_process_pid(node, agent_name)
 
@@ -85,19 +84,19 @@ def test_restart_agent_controller_with_sighup(agent_steps,
         file_name=log_file,
         keyword=config.STR_ERROR,
         non_matching='ERROR %(name)s',
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_TRACE,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_SIGHUP,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         expected_count=1)
 
 
@@ -124,8 +123,7 @@ def test_restart_neutron_server_with_sighup(os_faults_steps,
         service_names=[config.NOVA_API, config.NEUTRON_SERVER_SERVICE])
 
     log_file = config.AGENT_LOGS[config.NEUTRON_SERVER_SERVICE][0]
-    line_count_file_path = os_faults_steps.store_file_line_count(node,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(node, log_file)
 
     pid = os_faults_steps.get_process_pid(node, config.NEUTRON_SERVER_SERVICE,
                                           get_parent=is_parent)
@@ -145,13 +143,13 @@ def test_restart_neutron_server_with_sighup(os_faults_steps,
         file_name=log_file,
         keyword=config.STR_ERROR,
         non_matching='ERROR %(name)s',
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_TRACE,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
 
     # TODO(ssokolov) find a way to remove `if`-statement from test
@@ -160,14 +158,14 @@ def test_restart_neutron_server_with_sighup(os_faults_steps,
             node,
             file_name=log_file,
             keyword=config.STR_SIGHUP,
-            start_line_number_file=line_count_file_path,
+            log_cursors=log_cursors,
             must_present=True)
     else:
         os_faults_steps.check_string_in_file(
             node,
             file_name=log_file,
             keyword=config.STR_SIGHUP,
-            start_line_number_file=line_count_file_path,
+            log_cursors=log_cursors,
             expected_count=1)
 
 
@@ -208,8 +206,7 @@ def test_restart_metadata_agent_controller_with_sighup(agent_steps,
         # agent is running on gtw node
         log_file = config.AGENT_LOGS[agent_name][2]
 
-    line_count_file_path = os_faults_steps.store_file_line_count(node,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(node, log_file)
 
     pid = os_faults_steps.get_process_pid(node, agent_name,
                                           get_parent=is_parent)
@@ -229,19 +226,19 @@ def test_restart_metadata_agent_controller_with_sighup(agent_steps,
         file_name=log_file,
         keyword=config.STR_ERROR,
         non_matching='ERROR %(name)s',
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_TRACE,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_SIGHUP,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         expected_count=1)
 
 
@@ -271,8 +268,7 @@ def test_restart_metadata_agent_compute_with_sighup(agent_steps,
                                                    agent_name])
 
     log_file = config.AGENT_LOGS[agent_name][1]
-    line_count_file_path = os_faults_steps.store_file_line_count(node,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(node, log_file)
 
     pid = os_faults_steps.get_process_pid(node, agent_name,
                                           get_parent=is_parent)
@@ -292,19 +288,19 @@ def test_restart_metadata_agent_compute_with_sighup(agent_steps,
         file_name=log_file,
         keyword=config.STR_ERROR,
         non_matching='ERROR %(name)s',
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_TRACE,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_SIGHUP,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         expected_count=1)
 
 
@@ -329,8 +325,7 @@ def test_restart_l3_agent_compute_with_sighup(agent_steps,
                                                    agent_name])
 
     log_file = config.AGENT_LOGS[agent_name][1]
-    line_count_file_path = os_faults_steps.store_file_line_count(node,
-                                                                 log_file)
+    log_cursors = os_faults_steps.get_log_cursors(node, log_file)
 
     pid = os_faults_steps.get_process_pid(node, agent_name)
 
@@ -348,17 +343,17 @@ def test_restart_l3_agent_compute_with_sighup(agent_steps,
         file_name=log_file,
         keyword=config.STR_ERROR,
         non_matching='ERROR %(name)s',
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_TRACE,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         must_present=False)
     os_faults_steps.check_string_in_file(
         node,
         file_name=log_file,
         keyword=config.STR_SIGHUP,
-        start_line_number_file=line_count_file_path,
+        log_cursors=log_cursors,
         expected_count=1)
@@ -86,8 +86,8 @@ def test_vni_matching_network_segmentation_id(
     os_faults_steps.ping_ip_with_router_namescape(agent_node, fixed_ip, router)
 
     os_faults_steps.stop_tcpdump(compute_node, tcpdump_files)
-    pcap_files = os_faults_steps.download_tcpdump_results(compute_node,
-                                                          tcpdump_files)
+    pcap_files = os_faults_steps.download_tcpdump_results(
+        compute_node, tcpdump_files, bpf_filter=tcpdump.BPF_VXLAN_ICMP)
 
     os_faults_steps.check_vni_segmentation(pcap_files[compute_host_name],
                                            network,
@@ -153,8 +153,8 @@ def test_vni_matching_network_segmentation_id_for_different_computes(
         ping_plan, timeout=config.PING_BETWEEN_SERVERS_TIMEOUT)
 
     os_faults_steps.stop_tcpdump(computes, tcpdump_files)
-    pcap_files = os_faults_steps.download_tcpdump_results(computes,
-                                                          tcpdump_files)
+    pcap_files = os_faults_steps.download_tcpdump_results(
+        computes, tcpdump_files, bpf_filter=tcpdump.BPF_VXLAN_ICMP)
 
     networks = neutron_2_servers_diff_nets_with_floating.networks
 
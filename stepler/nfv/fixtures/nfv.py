@@ -21,6 +21,7 @@ import pytest
 
 from stepler import config
 from stepler.nfv import steps
+from stepler.third_party import facts_cache
 from stepler.third_party import utils
 
 __all__ = [
@@ -221,9 +222,12 @@ def create_servers_to_allocate_hp(cirros_image,
     """
     def _create_servers_to_allocate_hp(fqdn, size, ram_left_free=0):
         node = os_faults_steps.get_nodes(fqdns=[fqdn])
-        host_cpus = os_faults_steps.get_cpu_distribition_per_numa_node(node)
+        # node is probed once for CPU and hugepages data
+        facts = facts_cache.FactsCache()
+        host_cpus = os_faults_steps.get_cpu_distribition_per_numa_node(
+            node, facts=facts)
         hp_data = os_faults_steps.get_hugepage_distribition_per_numa_node(
-            node, numa_count=len(host_cpus), sizes=[size])
+            node, numa_count=len(host_cpus), sizes=[size], facts=facts)
 
         flv_sizes = [hp_data[numa][size]['free'] * size / 1024
                      for numa, hp in hp_data.items() if hp[size]['free'] != 0]
@@ -22,6 +22,7 @@ import pytest
 from stepler import config
 from stepler.nova import steps
 from stepler.third_party import context
+from stepler.third_party import resource_registry
 
 __all__ = [
     'keypair',
@@ -68,35 +69,62 @@ def keypair_steps(get_keypair_steps, keypairs_cleanup):
 
 
 @pytest.fixture
-def keypairs_cleanup(uncleanable):
+def keypairs_cleanup(uncleanable, credentials, get_keypair_steps):
     """Callable function fixture to cleanup keypairs after test.
 
+    Keypairs registered by steps inside context are deleted with credentials
+    which created them. If ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set,
+    keypairs created bypassing steps are found by listing and deleted too.
+
     Args:
         uncleanable (AttrDict): data structure with skipped resources
+        credentials (object): CredentialsManager instance
+        get_keypair_steps (function): function to get keypair steps
 
     Returns:
         function: function to cleanup keypairs
     """
     @context.context
     def _keypairs_cleanup(keypair_steps):
+        initial_alias = credentials.current_alias
+        nodeid = resource_registry.REGISTRY.nodeid
 
         def _get_keypairs():
             # check=False because in best case no keypairs will be
             return keypair_steps.get_keypairs(
                 name_prefix=config.STEPLER_PREFIX, check=False)
 
-        keypair_ids_before = [keypair.id for keypair in _get_keypairs()]
+        def _delete_keypairs(keypair_ids):
+            for owner, ids in keypair_ids.items():
+                ids -= uncleanable.keypair_ids
+                if not ids:
+                    continue
 
-        yield
+                with credentials.change(owner):
+                    owner_keypair_steps = keypair_steps
+                    if owner != initial_alias:
+                        owner_keypair_steps = get_keypair_steps()
+
+                    # keypairs deleted by test itself are skipped
+                    deleting_keypairs = [
+                        keypair for keypair in
+                        owner_keypair_steps.get_keypairs(check=False)
+                        if keypair.id in ids]
+                    owner_keypair_steps.delete_keypairs(deleting_keypairs)
 
-        deleting_keypairs = []
-        for keypair in _get_keypairs():
+        resource_registry.REGISTRY.set_cleaner('keypair', _delete_keypairs)
+
+        if config.CLEANUP_UNREGISTERED_RESOURCES:
+            keypair_ids_before = [keypair.id for keypair in _get_keypairs()]
+
+        yield
 
-            if keypair.id not in uncleanable.keypair_ids:
-                if keypair.id not in keypair_ids_before:
-                    deleting_keypairs.append(keypair)
+        resource_registry.REGISTRY.cleanup('keypair', nodeid=nodeid)
 
-        keypair_steps.delete_keypairs(deleting_keypairs)
+        if config.CLEANUP_UNREGISTERED_RESOURCES:
+            _delete_keypairs({initial_alias: {
+                keypair.id for keypair in _get_keypairs()
+                if keypair.id not in keypair_ids_before}})
 
     return _keypairs_cleanup
 
@@ -25,6 +25,7 @@ import pytest
 from stepler import config
 from stepler.nova import steps
 from stepler.third_party import context
+from stepler.third_party import resource_registry
 from stepler.third_party import utils
 from stepler.third_party import waiter
 
@@ -116,12 +117,20 @@ def server_steps(get_server_steps, servers_cleanup):
 
 
 @pytest.fixture
-def servers_cleanup(uncleanable, get_server_steps):
+def servers_cleanup(uncleanable, credentials, get_server_steps):
     """Function fixture to cleanup servers after test.
 
+    Servers registered by steps during test are deleted with credentials
+    which created them. If ``config.CLEANUP_UNREGISTERED_RESOURCES`` is set,
+    servers created bypassing steps are found by listing and deleted too.
+
     Args:
         uncleanable (AttrDict): data structure with skipped resources
+        credentials (object): CredentialsManager instance
+        get_server_steps (function): function to get server steps
     """
+    initial_alias = credentials.current_alias
+    nodeid = resource_registry.REGISTRY.nodeid
     server_steps = get_server_steps()
 
     def _get_servers():
@@ -129,24 +138,44 @@ def servers_cleanup(uncleanable, get_server_steps):
         return server_steps.get_servers(
             name_prefix=config.STEPLER_PREFIX, check=False)
 
-    server_ids_before = [server.id for server in _get_servers()]
+    def _delete_servers(server_ids):
+        for owner, ids in server_ids.items():
+            ids -= uncleanable.server_ids
+            if not ids:
+                continue
 
-    yield
+            with credentials.change(owner):
+                owner_server_steps = server_steps
+                if owner != initial_alias:
+                    owner_server_steps = get_server_steps()
+
+                # servers deleted by test itself are skipped
+                deleting_servers = [
+                    server for server in
+                    owner_server_steps.get_servers(check=False)
+                    if server.id in ids]
 
-    deleting_servers = []
-    for server in _get_servers():
+                # we should use force deletion as teardown of this fixture
+                # can be performed before fixtures which can change config
+                # file and restart services
+                # as result reclaim_instance_interval can be big and check of
+                # ``delete_servers`` step can fail
+                owner_server_steps.delete_servers(deleting_servers,
+                                                  force=True)
 
-        if server.id not in uncleanable.server_ids:
-            if server.id not in server_ids_before:
+    resource_registry.REGISTRY.set_cleaner('server', _delete_servers)
+
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        server_ids_before = [server.id for server in _get_servers()]
+
+    yield
 
-                deleting_servers.append(server)
+    resource_registry.REGISTRY.cleanup('server', nodeid=nodeid)
 
-    # we should use force deletion as teardown of this fixture can be
-    # performed before fixtures which can change config file and
-    # restart services
-    # as result reclaim_instance_interval can be big and check of
-    # ``delete_servers`` step can fail
-    server_steps.delete_servers(deleting_servers, force=True)
+    if config.CLEANUP_UNREGISTERED_RESOURCES:
+        _delete_servers({initial_alias: {
+            server.id for server in _get_servers()
+            if server.id not in server_ids_before}})
 
 
 @pytest.fixture
@@ -21,6 +21,7 @@ from hamcrest import assert_that, empty, equal_to, is_not  # noqa
 from novaclient import exceptions as nova_exceptions
 
 from stepler import base
+from stepler.third_party import resource_registry
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
 from stepler.third_party import waiter
@@ -59,6 +60,7 @@ class KeypairSteps(base.BaseSteps):
         keypairs = []
         for name in names:
             keypair = self._client.create(name, public_key=public_key)
+            resource_registry.REGISTRY.register('keypair', [keypair])
             keypairs.append(keypair)
 
         if check:
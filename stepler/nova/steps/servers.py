@@ -27,7 +27,7 @@ import time
 from hamcrest import (assert_that, calling, empty, equal_to, has_entries,
                       has_item, is_, is_in, is_not, less_than_or_equal_to,
                       raises, greater_than, has_key, contains_string,
-                      has_properties)  # noqa: H301
+                      has_properties, not_none)  # noqa: H301
 
 from novaclient import exceptions as nova_exceptions
 import paramiko
@@ -38,6 +38,7 @@ from stepler.third_party import arping
 from stepler.third_party import chunk_serializer
 from stepler.third_party import iperf
 from stepler.third_party import ping
+from stepler.third_party import resource_registry
 from stepler.third_party import ssh
 from stepler.third_party import steps_checker
 from stepler.third_party import utils
@@ -138,16 +139,15 @@ class ServerSteps(base.BaseSteps):
                     block_device_mapping=block_device_mapping,
                     userdata=userdata,
                     meta=meta)
+                resource_registry.REGISTRY.register('server', [server])
                 servers_chunk.append(server)
 
             if check:
-                for server in servers_chunk:
-
-                    self.check_server_status(
-                        server,
-                        expected_statuses=[config.STATUS_ACTIVE],
-                        transit_statuses=[config.STATUS_BUILD],
-                        timeout=config.SERVER_ACTIVE_TIMEOUT)
+                self.check_servers_status(
+                    servers_chunk,
+                    expected_statuses=[config.STATUS_ACTIVE],
+                    transit_statuses=[config.STATUS_BUILD],
+                    timeout=config.SERVER_ACTIVE_TIMEOUT)
 
             servers.extend(servers_chunk)
 
@@ -236,6 +236,69 @@ class ServerSteps(base.BaseSteps):
         err_msg = self._error_message(server)
         assert_that(server.status.lower(), is_in(expected_statuses), err_msg)
 
+    @steps_checker.step
+    def check_servers_presence(self, servers, present=True, timeout=0):
+        """Check-step to check presence of several servers.
+
+        All servers are polled together with one servers listing per
+        iteration.
+
+        Args:
+            servers (list): nova servers
+            present (bool): flag to check are servers present or absent
+            timeout (int): seconds to wait a result of check
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+        """
+        def _check_server_presence(server):
+            return waiter.expect_that(server is not None, equal_to(present))
+
+        waiter.wait_resources(self._client.list,
+                              [server.id for server in servers],
+                              _check_server_presence,
+                              get_resource=self._find_server,
+                              timeout_seconds=timeout)
+
+    @steps_checker.step
+    def check_servers_status(self,
+                             servers,
+                             expected_statuses,
+                             transit_statuses=(),
+                             timeout=0):
+        """Verify step to check status of several servers.
+
+        All servers are polled together with one servers listing per
+        iteration, so waiting time is bounded by the slowest server.
+
+        Args:
+            servers (list): nova servers to check their status
+            expected_statuses (list): expected servers statuses
+            transit_statuses (iterable): allowed transit statuses
+            timeout (int): seconds to wait a result of check
+
+        Raises:
+            TimeoutExpired: if check failed after timeout
+            AssertionError: if any server status is unexpected
+        """
+        def _check_server_status(server):
+            waiter.expect_that(server, not_none(), "Server is absent")
+            return waiter.expect_that(server.status.lower(),
+                                      is_not(is_in(transit_statuses)))
+
+        fresh_servers = waiter.wait_resources(
+            self._client.list,
+            [server.id for server in servers],
+            _check_server_status,
+            get_resource=self._find_server,
+            timeout_seconds=timeout)
+
+        for server in servers:
+            server._add_details(fresh_servers[server.id]._info)
+            err_msg = self._error_message(server)
+            assert_that(server.status.lower(), is_in(expected_statuses),
+                        err_msg)
+
     @steps_checker.step
     def get_server_credentials(self, server):
         """Step to retrieve server credentials.
@@ -702,10 +765,78 @@ class ServerSteps(base.BaseSteps):
             parsed_ping_plan[server_from] = ips_list
         return parsed_ping_plan
 
+    def _get_ping_losses(self, server, ssh_params, ips, ping_count):
+        """Ping ips from server, it's called in separate thread.
+
+        Connection is established without waiting: unreachable server is
+        considered as failed to ping all ips.
+        """
+        try:
+            with ssh.SshClient(**ssh_params) as server_ssh:
+                results = ping.ping_many(server_ssh, ips, count=ping_count)
+        except (paramiko.SSHException, socket.error, EOFError,
+                ssh.ExecutionTimeout):
+            return dict.fromkeys(ips)
+
+        losses = {}
+        for ip, result in results.items():
+            try:
+                losses[ip] = result.loss
+            except ValueError:  # ping output has no statistics
+                losses[ip] = None
+        return losses
+
+    @steps_checker.step
+    def get_ping_losses_by_plan(self, ping_plan, ping_count=3, check=True):
+        """Step to ping ips from servers concurrently using ping plan dict.
+
+        Each server pings its ips from one SSH session and one command, and
+        all servers are processed in parallel.
+
+        Args:
+            ping_plan (dict): servers and lists of
+                ips/tuples(server, ip_type)/servers to ping
+            ping_count (int): count of pings to send to each ip
+            check (bool): flag whether to check step or not
+
+        Returns:
+            dict: ping losses matrix ``{server: {ip: loss}}``; loss is None
+                if server is unreachable or ping has no result
+
+        Raises:
+            AssertionError: if check failed
+        """
+        parsed_ping_plan = self._parse_ping_plan(ping_plan)
+
+        tasks = []
+        for server, ips in parsed_ping_plan.items():
+            credentials = self.get_server_credentials(server)
+            ssh_params = {
+                'host': self.get_floating_ip(server),
+                'pkey': credentials.get('private_key'),
+                'username': credentials.get('username'),
+                'password': credentials.get('password'),
+                'timeout': config.SSH_CLIENT_TIMEOUT,
+            }
+            tasks.append((server, ssh_params, ips))
+
+        losses = utils.parallel_map(
+            lambda task: self._get_ping_losses(*task, ping_count=ping_count),
+            tasks)
+        losses_matrix = {task[0]: loss for task, loss in zip(tasks, losses)}
+
+        if check:
+            assert_that(losses_matrix, is_not(empty()))
+
+        return losses_matrix
+
     @steps_checker.step
     def check_ping_by_plan(self, ping_plan, timeout=0):
         """Step to check ping using ping plan dict.
 
+        Servers ping their ips concurrently; only failed pairs are pinged
+        again during waiting.
+
         Args:
             ping_plan (dict): servers and lists of
                 ips/tuples(server, ip_type)/servers to ping
@@ -714,21 +845,24 @@ class ServerSteps(base.BaseSteps):
         Raises:
             TimeoutExpired: if check failed after timeout
         """
-        parsed_ping_plan = self._parse_ping_plan(ping_plan)
+        failed_ping_plan = self._parse_ping_plan(ping_plan)
 
         def _check_ping_by_plan():
-            for server, ips in parsed_ping_plan.items():
-                floating_ip = self.get_floating_ip(server)
+            losses_matrix = self.get_ping_losses_by_plan(failed_ping_plan,
+                                                         check=False)
+            for server, losses in losses_matrix.items():
+                failed_ips = [ip for ip, loss in losses.items() if loss != 0]
+                if failed_ips:
+                    failed_ping_plan[server] = failed_ips
+                else:
+                    del failed_ping_plan[server]
 
-                with self.get_server_ssh(server, ip=floating_ip) as server_ssh:
-                    for ip in ips:
-                        self.check_ping_for_ip(ip, remote_from=server_ssh)
-            return True
+            failed_pairs = {server.id: ips
+                            for server, ips in failed_ping_plan.items()}
+            return waiter.expect_that(failed_pairs, empty(),
+                                      'Ping losses are not 0')
 
-        waiter.wait(
-            _check_ping_by_plan,
-            timeout_seconds=timeout,
-            expected_exceptions=waiter.TimeoutExpired)
+        waiter.wait(_check_ping_by_plan, timeout_seconds=timeout)
 
     def _get_ping_plan_for_servers(self, servers, ip_types):
         """Get dict which contains ip list to ping for all servers"""
@@ -1456,22 +1590,20 @@ class ServerSteps(base.BaseSteps):
             server.delete()
 
         if check:
-            for server in servers:
-                self.check_server_presence(
-                    server,
-                    present=False,
-                    timeout=config.SERVER_DELETE_TIMEOUT)
+            self.check_servers_presence(
+                servers,
+                present=False,
+                timeout=config.SERVER_DELETE_TIMEOUT)
 
     def _hard_delete_servers(self, servers, check):
         for server in servers:
             server.force_delete()  # delete server really
 
         if check:
-            for server in servers:
-                self.check_server_presence(
-                    server,
-                    present=False,
-                    timeout=config.SERVER_DELETE_TIMEOUT)
+            self.check_servers_presence(
+                servers,
+                present=False,
+                timeout=config.SERVER_DELETE_TIMEOUT)
 
     @steps_checker.step
     def resize(self, server, flavor, check=True):
@@ -1627,6 +1759,13 @@ class ServerSteps(base.BaseSteps):
         assert_that(result['summary']['error_percent'],
                     less_than_or_equal_to(max_loss))
 
+    def _find_server(self, server_id):
+        # servers of other projects aren't listed without all_tenants
+        try:
+            return self._client.get(server_id)
+        except nova_exceptions.NotFound:
+            return None
+
     def _error_message(self, server):
         fault = getattr(server, 'fault', {})
         if not fault:
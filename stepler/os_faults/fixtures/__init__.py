@@ -22,6 +22,7 @@ from .faults import *  # noqa
 __all__ = sorted([  # sort for documentation
     'os_faults_client',
     'os_faults_steps',
+    'nodes_ssh_executor',
     'patch_ini_file_and_restart_services',
     'execute_command_with_rollback',
     'nova_api_node',
@@ -17,6 +17,7 @@ os_faults fixtures
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import time
 
 import os_faults
@@ -26,11 +27,14 @@ from stepler import config
 from stepler.os_faults.steps import OsFaultsSteps
 from stepler import os_faults_config
 from stepler.third_party import context
+from stepler.third_party import facts_cache
 from stepler.third_party import network_checks
+from stepler.third_party import ssh_executor
 
 __all__ = [
     'os_faults_client',
     'os_faults_steps',
+    'nodes_ssh_executor',
     'patch_ini_file_and_restart_services',
     'execute_command_with_rollback',
     'nova_api_node',
@@ -58,16 +62,61 @@ def os_faults_client():
 
 
 @pytest.fixture(scope='session')
-def os_faults_steps(os_faults_client):
+def nodes_ssh_executor(os_faults_client):
+    """Session fixture to get executor of shell commands on nodes via SSH.
+
+    It uses the same user and private key as os-faults ansible executor does.
+    Executor isn't created if both os-faults steps and CLI steps use ansible,
+    if cloud has no private key file or if nodes are reachable through jump
+    host only; ansible is used in these cases.
+
+    Args:
+        os_faults_client (object): instantiated os_faults client
+
+    Returns:
+        SshExecutor|None: executor of shell commands on nodes
+    """
+    if config.OS_FAULTS_ANSIBLE_EXECUTOR and config.CLI_ANSIBLE_EXECUTOR:
+        return None
+
+    private_key_file = getattr(os_faults_client, 'private_key_file', None)
+    if not private_key_file:
+        return None
+
+    # fuel and tcpcloud slaves are accessed through master by default
+    if not getattr(os_faults_client, 'slave_direct_ssh', True):
+        return None
+
+    username = os_faults_client.username
+    sudo = False
+    if os_faults_client.get_driver_name() == config.TCP_CLOUD:
+        username = os_faults_client.slave_username
+        sudo = bool(os_faults_client.cloud_executor.options.become)
+
+    with open(os.path.expanduser(private_key_file)) as f:
+        pkey = f.read()
+
+    return ssh_executor.SshExecutor(username,
+                                    pkey=pkey,
+                                    sudo=sudo,
+                                    timeout=config.SSH_CLIENT_TIMEOUT)
+
+
+@pytest.fixture(scope='session')
+def os_faults_steps(os_faults_client, nodes_ssh_executor):
     """Function fixture to get os_faults steps.
 
     Args:
         os_faults_client (object): instantiated os_faults client
+        nodes_ssh_executor (SshExecutor|None): executor of shell commands on
+            nodes; ansible is used if it's None
 
     Returns:
         stepler.os_faults.steps.OsFaultsSteps: instantiated os_faults steps
     """
-    return OsFaultsSteps(os_faults_client)
+    if config.OS_FAULTS_ANSIBLE_EXECUTOR or nodes_ssh_executor is None:
+        return OsFaultsSteps(os_faults_client)
+    return OsFaultsSteps(os_faults_client, executor=nodes_ssh_executor)
 
 
 @pytest.fixture(scope='session')
@@ -75,7 +124,8 @@ def patch_ini_file_and_restart_services(os_faults_steps):
     """Session callable fixture to modify config files and restart services.
 
     It can be called several times during test. It is used as context manager
-    to guarantee the result.
+    to guarantee the result. Cached cloud facts are invalidated after each
+    configuration change.
 
     Args:
         os_faults_steps: instantiated os_faults steps.
@@ -93,11 +143,13 @@ def patch_ini_file_and_restart_services(os_faults_steps):
         backup_path = os_faults_steps.patch_ini_file(
             nodes, file_path, option, value, section)
         os_faults_steps.restart_services(service_names)
+        facts_cache.CLOUD_FACTS.invalidate()
 
         yield
 
         os_faults_steps.restore_backup(nodes, file_path, backup_path)
         os_faults_steps.restart_services(service_names)
+        facts_cache.CLOUD_FACTS.invalidate()
 
     return _patch_ini_file_and_restart_services
 
@@ -21,6 +21,7 @@ import collections
 import os
 import re
 import tempfile
+import threading
 import time
 import warnings
 import yaml
@@ -36,7 +37,10 @@ from six import moves
 
 from stepler import base
 from stepler import config
+from stepler.third_party import facts_cache
+from stepler.third_party import log_cursor
 from stepler.third_party import network_checks
+from stepler.third_party import node_probe
 from stepler.third_party import steps_checker
 from stepler.third_party import tcpdump
 from stepler.third_party import utils
@@ -45,8 +49,84 @@ from stepler.third_party import waiter
 __all__ = ['OsFaultsSteps']
 
 
+# name of cached nodes inventory in ``facts_cache.CLOUD_FACTS``, so it's
+# invalidated after cloud reverting too
+INVENTORY_FACT = 'os_faults_inventory'
+
+
+class _NodesInventory(object):
+    """Index of cloud nodes and services nodes."""
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        self._services_nodes = {}
+        self.nodes = client.get_nodes()
+        self.nodes_by_fqdn = {node.fqdn: node for node in self.nodes}
+        self.fqdns_by_host_name = collections.defaultdict(list)
+        for node in self.nodes:
+            self.fqdns_by_host_name[node.fqdn.split('.')[0]].append(node.fqdn)
+        # cache of nodes facts, ex: IP addresses
+        self.facts = facts_cache.FactsCache()
+
+    def get_nodes(self, fqdns=None):
+        if not fqdns:
+            return self.nodes
+        fqdns = set(fqdns)
+        return self.nodes.filter(lambda node: node.fqdn in fqdns)
+
+    def get_service_nodes(self, name):
+        with self._lock:
+            if name not in self._services_nodes:
+                self._services_nodes[name] = self._client.get_service(
+                    name).get_nodes()
+            return self._services_nodes[name]
+
+    def get_fqdns(self, host_name):
+        if host_name in self.nodes_by_fqdn:
+            return [host_name]
+        if host_name in self.fqdns_by_host_name:
+            return self.fqdns_by_host_name[host_name]
+        return [fqdn for fqdn in self.nodes_by_fqdn
+                if fqdn.startswith(host_name)]
+
+
 class OsFaultsSteps(base.BaseSteps):
-    """os-faults steps."""
+    """os-faults steps.
+
+    Nodes and nodes of services are looked up in inventory, which is built
+    once and invalidated after steps changing cloud topology (restart of
+    services, nodes power management) or cloud reverting.
+    """
+
+    def __init__(self, client, executor=None):
+        """Constructor.
+
+        Args:
+            client (object): os-faults client
+            executor (SshExecutor, optional): executor of shell commands on
+                nodes. By default commands are executed with ansible tasks.
+        """
+        super(OsFaultsSteps, self).__init__(client)
+        self._executor = executor
+
+    def _run_shell(self, nodes, cmd, timeout=None):
+        """Execute shell command on nodes and get their results.
+
+        Ansible is used only if executor isn't set.
+        """
+        if self._executor is None:
+            task = {'shell': cmd.encode('utf-8')}
+            return nodes.run_task(task, raise_on_error=False)
+        return self._executor.execute([node.ip for node in nodes], cmd,
+                                      timeout=timeout)
+
+    def _get_inventory(self):
+        return facts_cache.CLOUD_FACTS.get(INVENTORY_FACT, _NodesInventory,
+                                           self._client)
+
+    def _invalidate_inventory(self):
+        facts_cache.CLOUD_FACTS.invalidate(INVENTORY_FACT)
 
     @steps_checker.step
     def get_cloud_param_value(self, param_name):
@@ -83,9 +163,10 @@ class OsFaultsSteps(base.BaseSteps):
         Returns:
             NodeCollection: one or more nodes
         """
-        nodes = self._client.get_nodes(fqdns=fqdns)
+        inventory = self._get_inventory()
+        nodes = inventory.get_nodes(fqdns=fqdns)
         for service_name in service_names or []:
-            nodes &= self._client.get_service(service_name).get_nodes()
+            nodes &= inventory.get_service_nodes(service_name)
 
         if check:
             assert_that(nodes, is_not(empty()))
@@ -142,9 +223,10 @@ class OsFaultsSteps(base.BaseSteps):
         Returns:
             NodeCollection: one or more nodes
         """
-        nodes = self._client.get_service(service_names[0]).get_nodes()
+        inventory = self._get_inventory()
+        nodes = inventory.get_service_nodes(service_names[0])
         for service_name in service_names[1:]:
-            nodes |= self._client.get_service(service_name).get_nodes()
+            nodes |= inventory.get_service_nodes(service_name)
 
         if check:
             assert_that(nodes, is_not(empty()))
@@ -197,10 +279,21 @@ class OsFaultsSteps(base.BaseSteps):
             timeout (int, optional): seconds to wait a result of check
 
         Raises:
-            TimeoutExpired: if service state is wrong after timeout
+            TimeoutExpired|AssertionError: if service state is wrong after
+                timeout
         """
         service = self._client.get_service(service_name)
 
+        # service is polled by process pattern on nodes side if it's possible
+        grep = getattr(service, 'grep', None) or getattr(service, 'GREP', None)
+        if grep:
+            cmd = "ps ax | grep -v grep | grep -q {}".format(
+                moves.shlex_quote(grep))
+            if not must_run:
+                cmd = '! ' + cmd
+            self.get_cmd_success_times(nodes, cmd, timeout=timeout)
+            return
+
         def _check_service_state():
             matcher = has_items(*nodes)
             if not must_run:
@@ -225,14 +318,18 @@ class OsFaultsSteps(base.BaseSteps):
             ServiceError: if wrong service name or other errors
             AssertionError: if nodes don't contain service
         """
-        nodes = nodes or self._client.get_nodes()
+        inventory = self._get_inventory()
+        nodes = nodes or inventory.nodes
         service = self._client.get_service(name=name)
-        running_nodes = service.get_nodes()
+        running_nodes = inventory.get_service_nodes(name)
         to_restart_nodes = running_nodes & nodes
         if check:
             assert_that(to_restart_nodes, is_not(empty()))
         if to_restart_nodes:
-            service.restart(nodes=to_restart_nodes)
+            try:
+                service.restart(nodes=to_restart_nodes)
+            finally:
+                self._invalidate_inventory()
         return to_restart_nodes
 
     @steps_checker.step
@@ -270,13 +367,18 @@ class OsFaultsSteps(base.BaseSteps):
             ServiceError: if wrong service name or other errors
         """
         service = self._client.get_service(service_name)
-        service.terminate(nodes)
-        if check:
-            self.check_service_state(
-                service_name,
-                nodes,
-                must_run=False,
-                timeout=config.SERVICE_TERMINATE_TIMEOUT)
+        try:
+            service.terminate(nodes)
+            if check:
+                self.check_service_state(
+                    service_name,
+                    nodes,
+                    must_run=False,
+                    timeout=config.SERVICE_TERMINATE_TIMEOUT)
+        finally:
+            # nodes are discovered by running services, so inventory is
+            # refreshed when service state is changed
+            self._invalidate_inventory()
 
     @steps_checker.step
     def start_service(self, service_name, nodes, check=True):
@@ -291,13 +393,16 @@ class OsFaultsSteps(base.BaseSteps):
             ServiceError: if wrong service name or other errors
         """
         service = self._client.get_service(service_name)
-        service.start(nodes)
-        if check:
-            self.check_service_state(
-                service_name,
-                nodes,
-                must_run=True,
-                timeout=config.SERVICE_START_TIMEOUT)
+        try:
+            service.start(nodes)
+            if check:
+                self.check_service_state(
+                    service_name,
+                    nodes,
+                    must_run=True,
+                    timeout=config.SERVICE_START_TIMEOUT)
+        finally:
+            self._invalidate_inventory()
 
     @steps_checker.step
     def get_nodes_private_key_path(self, check=True):
@@ -471,23 +576,22 @@ class OsFaultsSteps(base.BaseSteps):
             self.check_file_exists(nodes, backup_path, present=False)
 
     @steps_checker.step
-    def check_file_exists(self, nodes, file_path, present=True):
+    def check_file_exists(self, nodes, file_path, present=True, timeout=0):
         """Step to check that remote file exists.
 
         Args:
             nodes (obj): nodes to check file on them
             file_path (str): path to file on remote hosts
             present (bool): should file be present or not
+            timeout (int, optional): seconds to wait a result of check
 
         Raises:
-            AssertionError: if any of nodes doesn't contain file
+            AssertionError: if any of nodes doesn't contain file after timeout
         """
-        command = 'ls "{path}"'.format(path=file_path)
+        cmd = 'ls "{path}"'.format(path=file_path)
         if not present:
-            command = '! ' + command
-        task = {'shell': command}
-        result = nodes.run_task(task, raise_on_error=False)
-        assert_that(result, only_contains(has_properties(status='OK')))
+            cmd = '! ' + cmd
+        self.get_cmd_success_times(nodes, cmd, timeout=timeout)
 
     @steps_checker.step
     def patch_ini_file(self, nodes, file_path, option, value,
@@ -544,14 +648,13 @@ class OsFaultsSteps(base.BaseSteps):
                 failed in case of check=True
 
         Returns:
-            list: AnsibleExecutionRecord(s)
+            list: AnsibleExecutionRecord(s) or ExecutionRecord(s)
         """
         cmd = (u"timeout {timeout} "
                u"bash -c {cmd}").format(timeout=timeout,
                                         cmd=moves.shlex_quote(cmd))
 
-        task = {'shell': cmd.encode('utf-8')}
-        result = nodes.run_task(task, raise_on_error=False)
+        result = self._run_shell(nodes, cmd, timeout=timeout)
 
         if check:
             assert_that(
@@ -559,6 +662,59 @@ class OsFaultsSteps(base.BaseSteps):
 
         return result
 
+    @steps_checker.step
+    def get_cmd_success_times(self, nodes, cmd, timeout=0,
+                              interval=config.REMOTE_POLL_INTERVAL,
+                              check=True):
+        """Step to wait on nodes until command succeeds.
+
+        Command is polled on nodes side with loop bounded by ``timeout``, so
+        polling interval isn't limited by round trip to nodes. Nodes are
+        polled concurrently.
+
+        Args:
+            nodes (NodeCollection): nodes to poll command on
+            cmd (str): bash command to poll, its output is discarded
+            timeout (int, optional): seconds to wait command succeeds. If 0,
+                command is executed once.
+            interval (float, optional): seconds between command calls
+            check (bool): flag whether check step or not
+
+        Raises:
+            AssertionError: if command doesn't succeed on some nodes after
+                timeout in case of check=True
+
+        Returns:
+            dict: node's fqdn -> seconds passed until command succeeded or
+                None if it didn't succeed
+        """
+        poll_cmd = u"{{ {cmd}\n}} >/dev/null 2>&1".format(cmd=cmd)
+        if timeout:
+            poll_cmd = (u"timeout {timeout} bash -c {loop}").format(
+                timeout=timeout,
+                loop=moves.shlex_quote(u"until {}; do sleep {}; done".format(
+                    poll_cmd, interval)))
+        poll_cmd = (u"start=$(date +%s%N); {poll_cmd}; rc=$?; "
+                    u"echo $(( ($(date +%s%N) - start) / 1000000 )); "
+                    u"exit $rc").format(poll_cmd=poll_cmd)
+
+        fqdns = {node.ip: node.fqdn for node in nodes}
+        results = self.execute_cmd(nodes, poll_cmd, check=False)
+
+        times = {fqdn: None for fqdn in fqdns.values()}
+        for result in results:
+            if result.status == config.STATUS_OK:
+                milliseconds = int(result.payload['stdout_lines'][-1])
+                times[fqdns[result.host]] = milliseconds / 1000.
+
+        if check:
+            failed_fqdns = [fqdn for fqdn, seconds in times.items()
+                            if seconds is None]
+            assert_that(failed_fqdns, empty(),
+                        "`{}` didn't succeed in {} seconds".format(cmd,
+                                                                   timeout))
+        return times
+
     @steps_checker.step
     def check_no_nova_server_artifacts(self, server):
         """Step to check that compute doesn't contain server's artifacts.
@@ -578,11 +734,14 @@ class OsFaultsSteps(base.BaseSteps):
             result, only_contains(has_properties(status=config.STATUS_FAILED)))
 
     @steps_checker.step
-    def store_file_line_count(self, node, file_name, check=True):
-        """Step to store line count in a textual file on nodes.
+    def get_log_cursors(self, nodes, file_name, check=True):
+        """Step to get cursors at the end of textual file on nodes.
+
+        Cursor is file's inode and size, so next search of file lines reads
+        only bytes appended after cursor and detects file rotation.
 
         Args:
-            node (NodeCollection): nodes
+            nodes (NodeCollection): nodes
             file_name (str): name of textual file
             check (bool): flag whether check step or not
 
@@ -591,12 +750,18 @@ class OsFaultsSteps(base.BaseSteps):
                 failed in case of check=True
 
         Returns:
-            str: path to file with stored lines counts
+            dict: node's fqdn -> LogCursor
         """
-        file_to_store = tempfile.mktemp()
-        cmd = "cat {} | wc -l > {}".format(file_name, file_to_store)
-        self.execute_cmd(node, cmd, check=check)
-        return file_to_store
+        fqdns = {node.ip: node.fqdn for node in nodes}
+        results = self.execute_cmd(
+            nodes, log_cursor.build_mark_command(file_name), check=check)
+
+        cursors = {}
+        for result in results:
+            if result.status == config.STATUS_OK:
+                cursors[fqdns[result.host]] = log_cursor.parse_mark_output(
+                    file_name, result.payload['stdout'])
+        return cursors
 
     @steps_checker.step
     def get_process_pid(self, node, process_name, get_parent=True,
@@ -707,24 +872,79 @@ class OsFaultsSteps(base.BaseSteps):
         if delay:
             time.sleep(delay)
 
+    @steps_checker.step
+    def get_log_matches(self,
+                        nodes,
+                        file_name,
+                        keywords=None,
+                        regexes=None,
+                        non_matching=None,
+                        log_cursors=None,
+                        check=True):
+        """Step to get lines of textual file matched to patterns on nodes.
+
+        All patterns are searched in one pass over file on each node, nodes
+        are processed concurrently.
+
+        Args:
+            nodes (NodeCollection): nodes
+            file_name (str): name of textual file
+            keywords (list|None): strings to search
+            regexes (list|None): extended regular expressions to search
+            non_matching (str|None): string to be absent in matched lines
+            log_cursors (dict|None): node's fqdn -> LogCursor to search lines
+                after it, as :meth:`get_log_cursors` returns. Whole file is
+                searched on nodes without cursor.
+            check (bool): flag whether check step or not
+
+        Raises:
+            AssertionError|AnsibleExecutionException: if command execution
+                failed in case of check=True
+
+        Returns:
+            dict: node's fqdn -> OrderedDict pattern -> list of LogMatch(es)
+                with line and its timestamp in order of lines in file
+        """
+        log_cursors = log_cursors or {}
+        patterns = log_cursor.get_patterns(keywords, regexes)
+
+        def _get_node_matches(node):
+            cursor = log_cursors.get(node.fqdn,
+                                     log_cursor.LogCursor(file_name, None, 0))
+            cmd = log_cursor.build_read_command(cursor,
+                                                keywords=keywords,
+                                                regexes=regexes,
+                                                non_matching=non_matching)
+            # cursors differ on nodes, so command is executed for each node
+            result = self.execute_cmd(
+                nodes.filter(lambda host: host.fqdn == node.fqdn), cmd,
+                check=check)[0]
+            return log_cursor.parse_read_output(
+                result.payload.get('stdout', ''), patterns)
+
+        nodes_list = list(nodes)
+        matches = utils.parallel_map(_get_node_matches, nodes_list)
+        return {node.fqdn: node_matches
+                for node, node_matches in zip(nodes_list, matches)}
+
     @steps_checker.step
     def check_string_in_file(self,
                              node,
                              file_name,
                              keyword,
                              non_matching=None,
-                             start_line_number_file=None,
+                             log_cursors=None,
                              must_present=True,
                              expected_count=None):
-        """Step to check number of keywords in a textual file on a single node.
+        """Step to check number of keywords in a textual file on nodes.
 
         Args:
             node (NodeCollection): nodes
             file_name (str): name of textual file
             keyword (str): string to search
             non_matching (str|None): string to be absent in result
-            start_line_number_file (str|None): file path with number of first
-                line for searching
+            log_cursors (dict|None): node's fqdn -> LogCursor to search lines
+                after it, as :meth:`get_log_cursors` returns
             must_present (bool): flag that keyword must be present or not
             expected_count (int|None): expected count of lines containing
                 keyword
@@ -734,20 +954,6 @@ class OsFaultsSteps(base.BaseSteps):
                 failed in case of check=True or real count of lines with
                 keyword is not equal to expected one
         """
-
-        # check that file is exists
-        self.execute_cmd(node, 'ls {}'.format(file_name))
-
-        if start_line_number_file:
-            start_line_number_cmd = 'cat ' + start_line_number_file
-        else:
-            start_line_number_cmd = 'echo 0'
-        cmd = "tail -n +$({0}) {1} | grep {2}".format(
-            start_line_number_cmd, file_name,
-            moves.shlex_quote(keyword))
-        if non_matching:
-            cmd += " | grep -v {0}".format(moves.shlex_quote(non_matching))
-
         if expected_count is None:
             if must_present:
                 matcher = greater_than(0)
@@ -755,10 +961,14 @@ class OsFaultsSteps(base.BaseSteps):
                 matcher = 0
         else:
             matcher = expected_count
-        result = self.execute_cmd(node, cmd, check=False)
-        for node_result in result:
-            lines = node_result.payload['stdout_lines']
-            assert_that(lines, has_length(matcher))
+
+        matches = self.get_log_matches(node,
+                                       file_name,
+                                       keywords=[keyword],
+                                       non_matching=non_matching,
+                                       log_cursors=log_cursors)
+        for node_matches in matches.values():
+            assert_that(node_matches[keyword], has_length(matcher))
 
     @steps_checker.step
     def get_ovs_flows_cookies(self, node, check=True):
@@ -1070,18 +1280,13 @@ class OsFaultsSteps(base.BaseSteps):
             timeout (int, optional): seconds to wait a result of check
 
         Raises:
-            TimeoutExpired: if check failed after timeout
+            AssertionError: if check failed after timeout
         """
         router_namespace = "qrouter-{0}".format(router['id'])
         cmd = 'ip net | grep {}'.format(router_namespace)
-        status = config.STATUS_OK if must_present else config.STATUS_FAILED
-
-        def _check_router_namespace_presence():
-            result = self.execute_cmd(node, cmd, check=False)
-            return waiter.expect_that(
-                result, only_contains(has_properties(status=status)))
-
-        waiter.wait(_check_router_namespace_presence, timeout_seconds=timeout)
+        if not must_present:
+            cmd = '! ' + cmd
+        self.get_cmd_success_times(node, cmd, timeout=timeout)
 
     @steps_checker.step
     def delete_router_namespace(self, nodes, router, check=True):
@@ -1203,13 +1408,16 @@ class OsFaultsSteps(base.BaseSteps):
             TimeoutExpired: if nodes are available on 22 TCP port after
                 shutdown
         """
-        # TODO(ssokolov) poweroff -> shutdown when implemented in os-faults
-        nodes.poweroff()
-        # nodes.shutdown()
-        if check:
-            self.check_nodes_tcp_availability(
-                nodes, must_available=False,
-                timeout=config.NODE_SHUTDOWN_TIMEOUT)
+        try:
+            # TODO(ssokolov) poweroff -> shutdown when implemented in os-faults
+            nodes.poweroff()
+            # nodes.shutdown()
+            if check:
+                self.check_nodes_tcp_availability(
+                    nodes, must_available=False,
+                    timeout=config.NODE_SHUTDOWN_TIMEOUT)
+        finally:
+            self._invalidate_inventory()
 
     @steps_checker.step
     def poweroff_nodes(self, nodes, check=True):
@@ -1223,11 +1431,14 @@ class OsFaultsSteps(base.BaseSteps):
             TimeoutExpired: if nodes are available on 22 TCP port after power
                 off
         """
-        nodes.poweroff()
-        if check:
-            self.check_nodes_tcp_availability(
-                nodes, must_available=False,
-                timeout=config.NODE_POWEROFF_TIMEOUT)
+        try:
+            nodes.poweroff()
+            if check:
+                self.check_nodes_tcp_availability(
+                    nodes, must_available=False,
+                    timeout=config.NODE_POWEROFF_TIMEOUT)
+        finally:
+            self._invalidate_inventory()
 
     @steps_checker.step
     def poweron_nodes(self, nodes, check=True):
@@ -1241,10 +1452,13 @@ class OsFaultsSteps(base.BaseSteps):
             TimeoutExpired: if nodes are not available on 22 TCP port after
                 power on
         """
-        nodes.poweron()
-        if check:
-            self.check_nodes_tcp_availability(
-                nodes, timeout=config.NODE_REBOOT_TIMEOUT)
+        try:
+            nodes.poweron()
+            if check:
+                self.check_nodes_tcp_availability(
+                    nodes, timeout=config.NODE_REBOOT_TIMEOUT)
+        finally:
+            self._invalidate_inventory()
 
     @steps_checker.step
     def reset_nodes(self, nodes, native=True, wait_reboot=True, check=True):
@@ -1259,14 +1473,17 @@ class OsFaultsSteps(base.BaseSteps):
             check (bool, optional): flag whether to check this step or not
         """
         if native:
-            nodes.reset()
-            if check:
-                self.check_nodes_tcp_availability(
-                    nodes, must_available=False,
-                    timeout=config.NODE_SHUTDOWN_TIMEOUT)
-            if wait_reboot:
-                self.check_nodes_tcp_availability(
-                    nodes, timeout=config.NODE_REBOOT_TIMEOUT)
+            try:
+                nodes.reset()
+                if check:
+                    self.check_nodes_tcp_availability(
+                        nodes, must_available=False,
+                        timeout=config.NODE_SHUTDOWN_TIMEOUT)
+                if wait_reboot:
+                    self.check_nodes_tcp_availability(
+                        nodes, timeout=config.NODE_REBOOT_TIMEOUT)
+            finally:
+                self._invalidate_inventory()
         else:
             # workaround for libvirt issue that node is not powered
             # on sometimes after native reset
@@ -1367,13 +1584,17 @@ class OsFaultsSteps(base.BaseSteps):
                'do sleep 1; done;').format(base_path)
 
     @steps_checker.step
-    def download_tcpdump_results(self, nodes, base_path, check=True):
+    def download_tcpdump_results(self, nodes, base_path, bpf_filter=None,
+                                 check=True):
         """Step to copy tcpdump cap files to local server.
 
         Args:
             nodes (NodeCollection): nodes to start tcpdump
             base_path (str): base path for cap, pid, stdout, stderr files for
                 tcpdump
+            bpf_filter (str, optional): BPF filter to select packets on nodes,
+                so only selected packets are copied. By default all packets
+                are copied.
             check (bool, optional): flag whether to check this step or not
 
         Returns:
@@ -1384,10 +1605,17 @@ class OsFaultsSteps(base.BaseSteps):
             AssertionError|AnsibleExecutionException: if command execution
                 failed
         """
+        src_path = base_path + '.cap'
+        if bpf_filter:
+            src_path = base_path + '.filtered.cap'
+            cmd = "tcpdump -r {}.cap -w {} {}".format(
+                base_path, src_path, moves.shlex_quote(bpf_filter))
+            self.execute_cmd(nodes, cmd)
+
         dest_dir = tempfile.mkdtemp()
         task = {
             'fetch': {
-                'src': base_path + '.cap',
+                'src': src_path,
                 'dest': dest_dir,
             }
         }
@@ -1400,7 +1628,7 @@ class OsFaultsSteps(base.BaseSteps):
         cap_files = {}
         for node in nodes:
             path = os.path.join(dest_dir, node.ip)
-            cap_files[node.fqdn] = path + base_path + '.cap'
+            cap_files[node.fqdn] = path + src_path
 
         if check:
             for path in cap_files.values():
@@ -1490,13 +1718,13 @@ class OsFaultsSteps(base.BaseSteps):
         Raises:
             AssertionError: if check failed
         """
-        filters = add_filters or []
+        filters = list(add_filters or [])
         filters.append(tcpdump.filter_vxlan)
         lfilter = lambda x: all(filter_(x) for filter_ in filters)
         vnis = set()
         for packet in tcpdump.read_pcap(
                 pcap_path, lfilter=lfilter):
-            vnis.add(packet.getlayer('VXLAN').vni)
+            vnis.add(packet.vni)
 
         assert_that(vnis, only_contains(network['provider:segmentation_id']))
 
@@ -1514,8 +1742,7 @@ class OsFaultsSteps(base.BaseSteps):
             AssertionError: if check failed
         """
         def lfilter(packet):
-            return (packet.haslayer('ARP') and
-                    packet.getlayer('ARP').psrc == psrc)
+            return packet.arp_psrc == psrc
 
         packets = list(tcpdump.read_pcap(pcap_path, lfilter))
         matcher = is_not(empty()) if must_present else is_(empty())
@@ -1533,16 +1760,14 @@ class OsFaultsSteps(base.BaseSteps):
             AssertionError: if check failed
         """
         def lfilter(packet):
-            vxlan = packet.getlayer('VXLAN')
-            if vxlan is None:
-                return False
-            return vxlan.haslayer('ICMP') and vxlan.getlayer('IP').src == src
+            return (tcpdump.filter_vxlan(packet) and
+                    tcpdump.filter_icmp(packet) and packet.src == src)
 
         packets = list(tcpdump.read_pcap(pcap_path, lfilter))
         assert_that(packets, is_not(empty()))
 
     @steps_checker.step
-    def get_nodes_ips(self, nodes=None, ipv6=False, check=True):
+    def get_nodes_ips(self, nodes=None, ipv6=False, facts=None, check=True):
         """Step to retrieve nodes IP addresses.
 
         Args:
@@ -1550,6 +1775,8 @@ class OsFaultsSteps(base.BaseSteps):
                 for. By default IP addresses will be retrieved from all nodes.
             ipv6 (bool, optional): flag whether to filter ipv6 ip addresses.
                 By default only ipv4 addreses will be filtered.
+            facts (FactsCache, optional): cache of nodes facts. By default
+                facts are cached in nodes inventory.
             check (bool, optional): flag whether to check this step or not
 
         Returns:
@@ -1559,19 +1786,17 @@ class OsFaultsSteps(base.BaseSteps):
             AssertionError: if check failed
         """
         nodes = nodes or self.get_nodes()
-        cmd = "ip -o a | grep -v ' lo '"
-        if ipv6:
-            cmd += "| awk '/inet6 /{split($4,ip,\"/\"); print ip[1]}'"
-        else:
-            cmd += "| awk '/inet /{split($4,ip,\"/\"); print ip[1]}'"
-        result = self.execute_cmd(nodes, cmd, check=check)
+        if facts is None:
+            facts = self._get_inventory().facts
+        family = 'inet6' if ipv6 else 'inet'
+        nodes_facts = self.get_nodes_facts(
+            nodes, sections=['ip'], facts=facts, check=check)
 
         ips = {}
-        for node_result in result:
-            for node in nodes:
-                if node.ip == node_result.host:
-                    ips[node.fqdn] = node_result.payload['stdout_lines']
-                    break
+        for fqdn, node_facts in nodes_facts.items():
+            ips[fqdn] = [address['address'] for address in node_facts['ip']
+                         if address['family'] == family and
+                         address['interface'] != 'lo']
         if check:
             assert_that(ips.values(), only_contains(is_not(empty())))
         return ips
@@ -1592,11 +1817,11 @@ class OsFaultsSteps(base.BaseSteps):
         """
         cmd = "ovs-vsctl show"
         result = self.execute_cmd(from_nodes, cmd)
+        to_nodes_ips = self.get_nodes_ips(nodes=to_nodes)
         for node_result in result:
             stdout = node_result.payload['stdout']
             tunnels_remotes = re.findall(
                 r'remote_ip="(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"', stdout)
-            to_nodes_ips = self.get_nodes_ips(nodes=to_nodes)
             for node in to_nodes:
                 matchers = [has_item(ip) for ip in to_nodes_ips[node.fqdn]]
                 if must_established:
@@ -1749,7 +1974,8 @@ class OsFaultsSteps(base.BaseSteps):
         """
         cmd = ("awk '/^password=/{split($1,val,\"=\"); print val[2]}' " +
                config.GLANCE_API_CONFIG_PATH)
-        glance_nodes = self._client.get_service(config.GLANCE_API).get_nodes()
+        glance_nodes = self._get_inventory().get_service_nodes(
+            config.GLANCE_API)
         return self.execute_cmd(glance_nodes.pick(), cmd)[0].payload['stdout']
 
     @steps_checker.step
@@ -1794,9 +2020,7 @@ class OsFaultsSteps(base.BaseSteps):
         Returns:
             str: FQDN
         """
-        nodes = self._client.get_nodes()
-        fqdns = [node.fqdn for node in nodes
-                 if node.fqdn.startswith(host_name)]
+        fqdns = self._get_inventory().get_fqdns(host_name)
         if check:
             assert_that(fqdns, has_length(1))
         return fqdns[0]
@@ -2206,6 +2430,63 @@ class OsFaultsSteps(base.BaseSteps):
             assert_that(present, is_(expected),
                         "expected alarms didn't appear")
 
+    @steps_checker.step
+    def get_nodes_facts(self, nodes, sections=None, facts=None, check=True):
+        """Step to collect facts of nodes with one remote command per node.
+
+        Args:
+            nodes (NodeCollection): nodes to collect facts from
+            sections (list, optional): names of facts sections, see
+                :data:`stepler.third_party.node_probe.SECTIONS`. By default
+                all sections are collected.
+            facts (FactsCache, optional): cache to store nodes facts in. If
+                passed, all sections are collected and nodes with cached
+                facts aren't probed again.
+            check (bool): flag whether check step or not
+
+        Returns:
+            dict: node's fqdn -> dict of facts sections
+
+        Raises:
+            AssertionError: if facts of some nodes aren't collected
+        """
+        if facts is not None:
+            sections = None
+
+        nodes_facts = {}
+        fqdns_to_probe = []
+        for node in nodes:
+            key = 'node_facts:{}'.format(node.fqdn)
+            if facts is not None and key in facts:
+                nodes_facts[node.fqdn] = facts.get(key, dict)
+            else:
+                fqdns_to_probe.append(node.fqdn)
+
+        if fqdns_to_probe:
+            if len(fqdns_to_probe) < len(nodes):
+                nodes_to_probe = self.get_nodes(fqdns=fqdns_to_probe)
+            else:
+                nodes_to_probe = nodes
+            fqdns = {node.ip: node.fqdn for node in nodes_to_probe}
+
+            cmd = node_probe.build_command(sections)
+            results = self.execute_cmd(nodes_to_probe, cmd, check=False)
+            for result in results:
+                if result.status != config.STATUS_OK:
+                    continue
+                fqdn = fqdns[result.host]
+                nodes_facts[fqdn] = node_probe.parse_output(
+                    result.payload['stdout'])
+                if facts is not None:
+                    facts.set('node_facts:{}'.format(fqdn), nodes_facts[fqdn])
+
+        if check:
+            assert_that(sorted(nodes_facts),
+                        equal_to(sorted(node.fqdn for node in nodes)),
+                        'facts of some nodes are not collected')
+
+        return nodes_facts
+
     @steps_checker.step
     def get_cpu_pinning_computes(self, check=True):
         """Step to retrieve compute nodes with the CPU pinning.
@@ -2217,103 +2498,87 @@ class OsFaultsSteps(base.BaseSteps):
             AssertionError: if no nodes with CPU pinning are found
         """
         nodes = self.get_compute_nodes()
-        results = self.execute_cmd(nodes, config.CPU_PINNING_CMD_1,
-                                   check=False)
-        numa_hosts_ips = []
-        for result in results:
-            if result.status == config.STATUS_OK:
-                stdout = result.payload['stdout']
-                # ex: NUMA node(s):          2
-                if 'NUMA node' in stdout and int(stdout.split()[-1]) > 1:
-                    numa_hosts_ips.append(result.host)
+        nodes_facts = self.get_nodes_facts(
+            nodes, sections=['cmdline', 'lscpu'], check=False)
+
+        fqdns = []
+        for fqdn, node_facts in nodes_facts.items():
+            # ex: NUMA node(s):          2
+            numa_count = int(node_facts['lscpu'].get('NUMA node(s)', 0))
+            if 'isolcpus=' in node_facts['cmdline'] and numa_count > 1:
+                fqdns.append(fqdn)
 
         if check:
-            assert_that(numa_hosts_ips, is_not(empty()),
+            assert_that(fqdns, is_not(empty()),
                         'no computes with NUMA are found')
 
-        fqdns = []
-        for node in nodes:
-            if node.ip in numa_hosts_ips:
-                fqdns.append(node.fqdn)
         if not fqdns:
             return NodeCollection(hosts=[])
         return self.get_nodes(fqdns=fqdns)
 
     @steps_checker.step
-    def get_cpu_distribition_per_numa_node(self, node):
+    def get_cpu_distribition_per_numa_node(self, node, facts=None):
         """Step to get CPU distribution on compute.
 
         Args:
             node (NodeCollection): compute node
+            facts (FactsCache, optional): cache of nodes facts
 
         Returns:
             dict: cpu values, ex: {'numa0': [0, 1, 2], 'numa1': [3]}
 
         Raises:
-            AnsibleExecutionException: if command execution failed
-            AssertionError: if inconsistent results of commands
-        """
-        def convert_vcpu(s):
-            result = []
-            for item in s.split(','):
-                bounds = item.split('-')
-                if len(bounds) == 2:
-                    result.extend(range(int(bounds[0]), int(bounds[1]) + 1))
-                else:
-                    result.append(int(bounds[0]))
-            return result
+            AssertionError: if facts aren't collected or inconsistent
+        """
+        node_facts = self.get_nodes_facts(
+            node, sections=['cmdline', 'lscpu'], facts=facts)
+        node_facts = list(node_facts.values())[0]
+
+        # BOOT_IMAGE=/boot/vmlinuz-4.4.0-47-generic ... isolcpus=0,1
+        values = re.findall("isolcpus=(\S+)", node_facts['cmdline'])
+        assert_that(values, is_not(empty()), 'no isolated CPUs on node')
+        # ex: '0,1' or '0-3'
+        isol_cpus = node_probe.parse_cpu_list(values[0])
+        # ex: [0, 1, 2, 3]
 
-        result = self.execute_cmd(node, config.CPU_PINNING_CMD_2)[0]
+        lscpu = node_facts['lscpu']
+        numa_count = int(lscpu.get('NUMA node(s)', 0))
         cpus = {}
-        for line in result.payload['stdout_lines']:
-            # BOOT_IMAGE=/boot/vmlinuz-4.4.0-47-generic ... isolcpus=0,1
-            # NUMA node(s):          1
+        for key, value in lscpu.items():
             # NUMA node0 CPU(s):     0-3
-            if 'isolcpus' in line:
-                values = re.findall("isolcpus=(\S+)", line)
-                assert_that(values, is_not(empty()))
-                # ex: '0,1' or '0-3'
-                isol_cpus = convert_vcpu(values[0])
-                # ex: [0, 1, 2, 3]
-            elif 'NUMA node(s)' in line:
-                numa_count = int(line.split()[-1])
-            else:
-                values = re.findall("NUMA node(\d+) .+:\s+(\S+)", line)
-                assert_that(values, is_not(empty()))
-                values = values[0]
-                numa_id = values[0]
-                numa_cpus = convert_vcpu(values[1])
-                vcpus = list(set(numa_cpus) & set(isol_cpus))
-                assert_that(vcpus, is_not(empty()))
-                cpus["numa{}".format(numa_id)] = vcpus
+            numa_ids = re.findall("NUMA node(\d+) ", key)
+            if not numa_ids:
+                continue
+            numa_cpus = node_probe.parse_cpu_list(value)
+            vcpus = list(set(numa_cpus) & set(isol_cpus))
+            assert_that(vcpus, is_not(empty()))
+            cpus["numa{}".format(numa_ids[0])] = vcpus
         assert_that(cpus, has_length(numa_count))
         return cpus
 
     @steps_checker.step
-    def get_memory_distribition_per_numa_node(self, node):
+    def get_memory_distribition_per_numa_node(self, node, facts=None):
         """Step to get memory distribution on compute node.
 
         Args:
             node (NodeCollection): compute node
+            facts (FactsCache, optional): cache of nodes facts
 
         Returns:
             dict: memory values, ex: {'numa0': 32847336, 'numa1': 33011796}
 
         Raises:
-            AnsibleExecutionException: if command execution failed
-            AssertionError: if inconsistent results of commands
+            AssertionError: if facts aren't collected or inconsistent
         """
-        result = self.execute_cmd(node, config.CPU_PINNING_CMD_3)[0]
+        node_facts = self.get_nodes_facts(
+            node, sections=['numa_meminfo'], facts=facts)
+        node_facts = list(node_facts.values())[0]
+
         memories = {}
-        for line in result.payload['stdout_lines']:
-            # /sys/devices/system/node/node0/meminfo:Node 0 MemTotal: 328473 kB
-            # /sys/devices/system/node/node1/meminfo:Node 1 MemTotal: 330116 kB
-            # or
+        for numa, meminfo in node_facts['numa_meminfo'].items():
             # Node 0 MemTotal:        4046280 kB
-            values = re.findall("Node (\d+) .*:\s+(\d+)", line)
-            assert_that(values, is_not(empty()))
-            values = values[0]
-            memories["numa{}".format(values[0])] = int(values[1])
+            if 'MemTotal' in meminfo:
+                memories[numa] = meminfo['MemTotal']
         assert_that(memories, is_not(empty()))
         return memories
 
@@ -2336,7 +2601,7 @@ class OsFaultsSteps(base.BaseSteps):
         return stdout
 
     @steps_checker.step
-    def get_hugepages_data(self, fqdns=None, sizes=None):
+    def get_hugepages_data(self, fqdns=None, sizes=None, facts=None):
         """Step to get hugepage configuration data on computes.
 
         Args:
@@ -2344,6 +2609,7 @@ class OsFaultsSteps(base.BaseSteps):
                 are got from all compute nodes.
             sizes (list, optional): list of page sizes, ex: [2048]. If not set,
                 data are got for all pages (2Mb, 1Gb)
+            facts (FactsCache, optional): cache of nodes facts
 
         Returns:
             list: [[fqdn1, hp_data1], [fqdn2, hp_data2] ...], where
@@ -2351,8 +2617,7 @@ class OsFaultsSteps(base.BaseSteps):
                                      1048576: {'nr': 0, 'free': 0}}
 
         Raises:
-            AnsibleExecutionException: if command execution failed
-            ValueError: wrong output of command (not single integer)
+            AssertionError: if facts of some nodes aren't collected
         """
         if fqdns:
             nodes = self.get_nodes(fqdns=fqdns)
@@ -2360,29 +2625,22 @@ class OsFaultsSteps(base.BaseSteps):
             nodes = self.get_compute_nodes()
 
         sizes = sizes or [config.page_2mb, config.page_1gb]
-        hp_data = {}
-        for node in nodes:
-            hp_data[node.ip] = {size: {type: None for type in ['nr', 'free']}
-                                for size in sizes}
-
-        for size in sizes:
-            for type in ['nr', 'free']:
-                cmd = config.HP_GET_DATA_CMD_1.format(size=size, type=type)
-                results = self.execute_cmd(nodes, cmd)
-                for result in results:
-                    value = int(result.payload['stdout'])
-                    hp_data[result.host][size][type] = value
+        nodes_facts = self.get_nodes_facts(
+            nodes, sections=['hugepages'], facts=facts)
 
         hp_config_data = []
         for node in nodes:
-            if node.ip in hp_data:
-                hp_config_data.append([node.fqdn, hp_data[node.ip]])
+            hugepages = nodes_facts[node.fqdn]['hugepages']
+            hp_data = {size: {type: hugepages.get(size, {}).get(type, 0)
+                              for type in ['nr', 'free']}
+                       for size in sizes}
+            hp_config_data.append([node.fqdn, hp_data])
 
         return hp_config_data
 
     @steps_checker.step
     def get_hugepage_distribition_per_numa_node(self, node, numa_count,
-                                                sizes=None):
+                                                sizes=None, facts=None):
         """Step to get hugepage distribution for numa on compute node.
 
         Args:
@@ -2390,24 +2648,27 @@ class OsFaultsSteps(base.BaseSteps):
             numa_count (int): numa count
             sizes (list, optional): list of page sizes, ex: [2048]. If not set,
                 data are got for all pages (2Mb, 1Gb)
+            facts (FactsCache, optional): cache of nodes facts
 
         Returns:
             dict: "numa<i>" -> dict like {2048: {'nr': 1024, 'free': 512},
                                      1048576: {'nr': 0, 'free': 0}}
 
         Raises:
-            AnsibleExecutionException: if command execution failed
-            ValueError: wrong output of command (not single integer)
+            AssertionError: if facts aren't collected
         """
         sizes = sizes or [config.page_2mb, config.page_1gb]
+        node_facts = self.get_nodes_facts(
+            node, sections=['numa_hugepages'], facts=facts)
+        numa_hugepages = list(node_facts.values())[0]['numa_hugepages']
+
         hp_data = collections.defaultdict(
             lambda: collections.defaultdict(dict))
         for numa_id in range(numa_count):
+            numa = "numa{}".format(numa_id)
+            hugepages = numa_hugepages.get(numa, {})
             for size in sizes:
                 for type in ['nr', 'free']:
-                    cmd = config.HP_GET_DATA_CMD_2.format(
-                        numa_id=numa_id, size=size, type=type)
-                    results = self.execute_cmd(node, cmd)
-                    value = int(results[0].payload['stdout'])
-                    hp_data["numa{}".format(numa_id)][size][type] = value
+                    value = hugepages.get(size, {}).get(type, 0)
+                    hp_data[numa][size][type] = value
         return hp_data
@@ -6,6 +6,10 @@ Pytest plugin to dispatch destructive scenarios
 In destructive scenarios we skip all fixture finalizations because we revert
 environment to original state.
 Destructive scenarios are marked via decorator ``@pytest.mark.destructive``.
+
+After revert readiness probes (see :mod:`stepler.third_party.readiness_probes`)
+are waited for ``--revert-timeout`` minutes at most, so next test starts as
+soon as cloud is operable.
 """
 
 # Licensed under the Apache License, Version 2.0 (the "License");
@@ -27,19 +31,25 @@ import time
 from os_faults.ansible import executor
 import pytest
 import six
+from six import moves
 
 from stepler import config
+from stepler.third_party import facts_cache
+from stepler.third_party import readiness_probes
 from stepler.third_party import waiter
 
 __all__ = [
+    'get_services_states',
     'pytest_runtest_teardown',
     'revert_environment',
+    'wait_cloud_ready',
 ]
 
 LOG = logging.getLogger(__name__)
 DESTRUCTIVE = 'destructive'
 INDESTRUCTIBLE = 'indestructible'
 SKIPPED = 'skipped'
+SERVICES_STATES = 'services_states'
 
 
 def pytest_addoption(parser):
@@ -51,7 +61,8 @@ def pytest_addoption(parser):
                           "`--snapshot-name` passed")
     parser.addoption("--revert-timeout", '-R', action="store", type=int,
                      default=2,
-                     help="Time to wait for cloud to be operable after revert")
+                     help="Max time in minutes to wait for cloud to be "
+                          "operable after revert")
 
 
 @pytest.hookimpl(trylast=True)
@@ -79,7 +90,10 @@ def pytest_runtest_makereport(item, call):
 def pytest_runtest_setup(item):
     # Cache os_faults client before test
     if item.get_marker(DESTRUCTIVE):
-        item._request.getfixturevalue('os_faults_client')
+        destructor = item._request.getfixturevalue('os_faults_client')
+        # Remember services which are up to wait them after revert
+        if item.session.config.option.snapshot_name is not None:
+            setattr(item, SERVICES_STATES, get_services_states(destructor))
 
 
 @pytest.hookimpl(hookwrapper=True)
@@ -136,11 +150,18 @@ def pytest_runtest_teardown(item, nextitem):
 
     if do_revert and destructor:
         revert_environment(destructor, snapshot_name)
-        time.sleep(item.session.config.option.revert_timeout * 60)
+        wait_cloud_ready(destructor,
+                         item.session.config.option.revert_timeout * 60,
+                         states=getattr(item, SERVICES_STATES, None))
 
 
 def revert_environment(destructor, snapshot_name):
-    """Revert environment to original state."""
+    """Revert environment to original state.
+
+    Cached cloud facts are invalidated because reverted cloud may differ from
+    the cloud before test.
+    """
+    facts_cache.CLOUD_FACTS.invalidate()
     nodes = destructor.get_nodes()
     # Sometimes revert fails with
     # internal error: process exited while connecting to monitor
@@ -154,8 +175,6 @@ def revert_environment(destructor, snapshot_name):
             time.sleep(5)
     else:
         raise Exception("Can't revert snapshot {}".format(snapshot_name))
-    # Wait some time for preventing ansible freezes on time synchronization.
-    time.sleep(10)
     waiter.wait(
         nodes.run_task,
         args=({
@@ -173,3 +192,63 @@ def revert_environment(destructor, snapshot_name):
                    raise_on_error=False)
     nodes.run_task({'command': 'systemctl restart radosgw.service'},
                    raise_on_error=False)
+
+
+def get_services_states(destructor):
+    """Get states of nova, neutron and cinder services which are up.
+
+    Args:
+        destructor (object): os-faults client
+
+    Returns:
+        dict: probe name -> list of states of services which are up; probes
+            which states aren't got are absent
+    """
+    node = destructor.get_service(config.NOVA_API).get_nodes().pick()
+    cmd = readiness_probes.build_states_command(
+        openrc_cmd=config.OPENRC_ACTIVATE_CMD)
+    cmd = 'bash -c {}'.format(moves.shlex_quote(cmd))
+
+    result = node.run_task({'shell': cmd}, raise_on_error=False)
+    return readiness_probes.parse_states(
+        result[0].payload.get('stdout', ''))
+
+
+def wait_cloud_ready(destructor, timeout, states=None):
+    """Wait until cloud is operable.
+
+    All readiness probes are polled concurrently on controller. Probes which
+    aren't passed in time are logged, but don't fail test.
+
+    Args:
+        destructor (object): os-faults client
+        timeout (int): seconds to wait probes passed
+        states (dict, optional): states of services before test, returned by
+            :func:`get_services_states`. Without them all services are
+            waited to be up.
+
+    Returns:
+        collections.OrderedDict: passed probe name -> seconds to pass
+    """
+    node = destructor.get_service(config.NOVA_API).get_nodes().pick()
+    cmd = readiness_probes.build_command(
+        openrc_cmd=config.OPENRC_ACTIVATE_CMD, states=states)
+    cmd = 'timeout {} bash -c {}'.format(timeout, moves.shlex_quote(cmd))
+
+    start = time.time()
+    result = node.run_task({'shell': cmd}, raise_on_error=False)
+    timings = readiness_probes.parse_output(
+        result[0].payload.get('stdout', ''))
+
+    for name, seconds in timings.items():
+        LOG.info('Probe {!r} is passed in {:.1f} seconds'.format(
+            name, seconds))
+    not_passed = [name for name in readiness_probes.PROBES_NAMES
+                  if name not in timings]
+    if not_passed:
+        LOG.error("Cloud isn't operable after {} seconds, probes {} aren't "
+                  "passed".format(timeout, ', '.join(not_passed)))
+    else:
+        LOG.info('Cloud is operable in {:.1f} seconds'.format(
+            time.time() - start))
+    return timings
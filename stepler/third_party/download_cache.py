@@ -0,0 +1,308 @@
+"""
+--------------
+Download cache
+--------------
+
+Local cache of files downloaded by URL, safe for concurrent processes (ex:
+pytest-xdist workers).
+
+Each cached file has sidecar manifest with URL, ETag, size and sha256 of
+content. File is downloaded to temporary ``.part`` file and renamed to final
+path after its hash is calculated, so partial file is never used as valid.
+Interrupted download is resumed with HTTP ``Range`` request; if range isn't
+satisfiable, file is downloaded from scratch. Cached file is
+verified with hash once per process and revalidated with ``ETag`` or
+``Last-Modified``. Least recently used files are evicted if total size of
+cache exceeds limit.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import download_cache
+
+       cache = download_cache.DownloadCache('~/images',
+                                            max_size=10 * 1024 ** 3)
+       file_path = cache.get('http://example.com/cirros.img')
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from stepler.third_party import process_mutex
+
+__all__ = [
+    'DownloadCache',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_SUFFIX = '.manifest'
+PART_SUFFIX = '.part'
+LOCK_SUFFIX = '.lock'
+
+
+def _get_sha256(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _get_file_name(url):
+    keepcharacters = (' ', '.', '_', '-')
+    filename = url.rsplit('/')[-1]
+    return "".join(c for c in filename
+                   if c.isalnum() or c in keepcharacters).rstrip()
+
+
+class DownloadCache(object):
+    """Cache of files downloaded by URL."""
+
+    def __init__(self, path, max_size=None):
+        """Constructor.
+
+        Args:
+            path (str): cache directory
+            max_size (int, optional): max total size of cached files in
+                bytes. By default size isn't limited.
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        # files verified by current process: file path -> manifest
+        self._verified = {}
+        # threads wait each other only if they get the same file
+        self._locks = collections.defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+
+    def get(self, url, name=None):
+        """Get path of cached file, download it if it's absent or outdated.
+
+        Args:
+            url (str): file URL
+            name (str, optional): file name inside cache. By default it's
+                calculated from URL.
+
+        Returns:
+            str: path of cached file
+
+        Raises:
+            requests.RequestException: if file can't be downloaded and there
+                is no valid cached file
+        """
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                if not os.path.isdir(self.path):  # not created concurrently
+                    raise
+
+        file_path = os.path.join(self.path, name or _get_file_name(url))
+
+        with self._locks_lock:
+            lock = self._locks[file_path]
+
+        with lock, process_mutex.Lock(file_path + LOCK_SUFFIX):
+            manifest = self._verified.get(file_path)
+            if not (manifest and manifest['url'] == url and
+                    os.path.isfile(file_path)):
+                manifest = self._fetch(url, file_path)
+                self._verified[file_path] = manifest
+
+            manifest['last_used'] = time.time()
+            self._write_manifest(file_path, manifest)
+
+        if self.max_size:
+            self._evict(keep=file_path)
+
+        return file_path
+
+    def _fetch(self, url, file_path):
+        """Revalidate cached file or download it."""
+        manifest = self._read_manifest(file_path)
+
+        if manifest.get('url') != url:
+            manifest = {'url': url}
+
+        elif manifest.get('complete') and self._is_valid(file_path, manifest):
+            headers = {}
+            if manifest.get('etag'):
+                headers['If-None-Match'] = manifest['etag']
+            if manifest.get('last_modified'):
+                headers['If-Modified-Since'] = manifest['last_modified']
+
+            try:
+                response = requests.head(url, headers=headers,
+                                         allow_redirects=True)
+            except requests.RequestException as e:
+                LOGGER.warning("Can't revalidate file {!r}, cached one is "
+                               "used: {}".format(file_path, e))
+                return manifest
+
+            if response.status_code == 304 or (
+                    response.ok and
+                    response.headers.get('ETag') == manifest.get('etag') and
+                    response.headers.get('Last-Modified') ==
+                    manifest.get('last_modified')):
+                LOGGER.info("File {!r} is up to date".format(file_path))
+                return manifest
+
+            if not response.ok:
+                LOGGER.warning("Can't revalidate file {!r}, cached one is "
+                               "used. HTTP status code is {}".format(
+                                   file_path, response.status_code))
+                return manifest
+
+            manifest = {'url': url}
+
+        return self._download(url, file_path, manifest)
+
+    def _is_valid(self, file_path, manifest):
+        """Check that cached file has content described in manifest."""
+        if not os.path.isfile(file_path):
+            return False
+        if os.path.getsize(file_path) != manifest.get('size'):
+            return False
+        return _get_sha256(file_path) == manifest.get('sha256')
+
+    def _download(self, url, file_path, manifest):
+        """Download file to temporary file and rename it to final path."""
+        part_path = file_path + PART_SUFFIX
+        headers = {}
+        offset = 0
+
+        # partial file can be resumed only if it's the same remote file
+        if (os.path.isfile(part_path) and not manifest.get('complete') and
+                manifest.get('etag')):
+            offset = os.path.getsize(part_path)
+            headers['Range'] = 'bytes={}-'.format(offset)
+            headers['If-Range'] = manifest['etag']
+
+        response = requests.get(url, stream=True, headers=headers)
+        if offset and response.status_code == 416:
+            # partial file can't be resumed, ex: it's already complete
+            LOGGER.info("Can't resume downloading {!r} from byte {}, start "
+                        "it again".format(url, offset))
+            response.close()
+            os.remove(part_path)
+            offset = 0
+            response = requests.get(url, stream=True)
+
+        try:
+            response.raise_for_status()
+
+            if response.status_code != 206:
+                offset = 0
+
+            manifest = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'complete': False,
+            }
+            self._write_manifest(file_path, manifest)
+
+            sha256 = hashlib.sha256()
+            if offset:
+                LOGGER.info("Resume downloading {!r} from byte {}".format(
+                    url, offset))
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        sha256.update(chunk)
+            else:
+                LOGGER.info("Start downloading {!r}".format(url))
+
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    sha256.update(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            response.close()
+
+        size = os.path.getsize(part_path)
+        content_length = response.headers.get('Content-Length')
+        # decoded content length differs from header for compressed body
+        if content_length is not None and \
+                'Content-Encoding' not in response.headers and \
+                size != offset + int(content_length):
+            raise requests.RequestException(
+                "Download of {!r} is incomplete: {} bytes of {}".format(
+                    url, size, offset + int(content_length)))
+
+        os.rename(part_path, file_path)
+        manifest.update(size=size, sha256=sha256.hexdigest(), complete=True)
+        LOGGER.info("File {!r} is downloaded".format(file_path))
+        return manifest
+
+    def _read_manifest(self, file_path):
+        try:
+            with open(file_path + MANIFEST_SUFFIX) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _write_manifest(self, file_path, manifest):
+        manifest_path = file_path + MANIFEST_SUFFIX
+        tmp_path = '{}.{}'.format(manifest_path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.rename(tmp_path, manifest_path)
+
+    def _evict(self, keep):
+        """Delete least recently used files if cache is too big."""
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.path):
+            if not name.endswith(MANIFEST_SUFFIX):
+                continue
+
+            file_path = os.path.join(self.path, name[:-len(MANIFEST_SUFFIX)])
+            manifest = self._read_manifest(file_path)
+            if not (manifest.get('complete') and os.path.isfile(file_path)):
+                continue
+
+            size = os.path.getsize(file_path)
+            total_size += size
+            entries.append((manifest.get('last_used', 0), size, file_path))
+
+        for _, size, file_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if file_path == keep:
+                continue
+
+            # file used by another process right now isn't evicted
+            lock = process_mutex.Lock(file_path + LOCK_SUFFIX)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                LOGGER.info("Evict file {!r} from cache".format(file_path))
+                os.remove(file_path + MANIFEST_SUFFIX)
+                os.remove(file_path)
+                self._verified.pop(file_path, None)
+                total_size -= size
+            finally:
+                lock.release()
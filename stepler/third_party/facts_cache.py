@@ -0,0 +1,107 @@
+"""
+-----------
+Facts cache
+-----------
+
+Process-wide memoizing storage for facts which are expensive to calculate
+but rarely changed, like cloud configuration options or nodes count.
+
+Cached facts aren't updated automatically. Code which changes environment
+(reverts it, patches configuration files, restarts services) must call
+:meth:`FactsCache.invalidate`.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import facts_cache
+
+       network_type = facts_cache.CLOUD_FACTS.get(
+           'network_type', os_faults_steps.get_network_type)
+
+       # after cloud reverting
+       facts_cache.CLOUD_FACTS.invalidate()
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+
+__all__ = [
+    'CLOUD_FACTS',
+    'FactsCache',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FactsCache(object):
+    """Thread-safe memoizing storage of facts."""
+
+    def __init__(self):
+        """Constructor."""
+        self._facts = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, name):
+        """Check whether fact is calculated already."""
+        with self._lock:
+            return name in self._facts
+
+    def get(self, name, getter, *args, **kwargs):
+        """Get fact value, calculate it with getter if it's not cached yet.
+
+        Args:
+            name (str): fact name
+            getter (function): function to calculate fact value
+            *args: getter args
+            **kwargs: getter kwargs
+
+        Returns:
+            object: fact value
+        """
+        with self._lock:
+            if name not in self._facts:
+                self._facts[name] = getter(*args, **kwargs)
+            return self._facts[name]
+
+    def set(self, name, value):
+        """Store fact value.
+
+        Args:
+            name (str): fact name
+            value (object): fact value
+        """
+        with self._lock:
+            self._facts[name] = value
+
+    def invalidate(self, *names):
+        """Drop cached facts.
+
+        Args:
+            *names: names of facts to drop. All facts are dropped if names
+                aren't passed.
+        """
+        with self._lock:
+            if not names:
+                LOGGER.debug('Invalidate all cached facts')
+                self._facts.clear()
+                return
+
+            for name in names:
+                LOGGER.debug('Invalidate cached fact {!r}'.format(name))
+                self._facts.pop(name, None)
+
+
+CLOUD_FACTS = FactsCache()
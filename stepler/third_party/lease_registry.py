@@ -0,0 +1,205 @@
+"""
+--------------
+Lease registry
+--------------
+
+On-disk registry of resources shared between processes (ex: pytest-xdist
+workers) with reference counting.
+
+Each process takes lease of resource and releases it when resource isn't
+needed anymore. Resource is created by first process and is deleted by
+process which releases last lease. Leases of dead processes on the same host
+are dropped, so crashed worker doesn't prevent resource deletion; resources
+left without leases are finalized by the next process with
+:meth:`LeaseRegistry.finalize_orphans`.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import lease_registry
+
+       registry = lease_registry.LeaseRegistry('/tmp/leases.json')
+       registry.finalize_orphans(delete_image)
+       image_id, lease = registry.acquire('cirros', get_or_create_image)
+       # use image
+       registry.release('cirros', lease, delete_image)
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import errno
+import json
+import logging
+import os
+import socket
+import uuid
+
+from stepler.third_party import process_mutex
+
+__all__ = [
+    'LeaseRegistry',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+class LeaseRegistry(object):
+    """Registry of shared resources leases.
+
+    Attributes:
+        scope (str): host and absolute path of registry file; processes
+            share resources only inside the same scope, so names of shared
+            resources should include it
+    """
+
+    def __init__(self, path):
+        """Constructor.
+
+        Args:
+            path (str): path to registry file; lock file is placed near it
+        """
+        self.path = path
+        self.host = socket.gethostname()
+        self.scope = '{}:{}'.format(self.host, os.path.abspath(path))
+
+    def acquire(self, key, factory):
+        """Take lease of resource.
+
+        Factory is called under inter-process lock, so only one process at
+        time gets or creates resource.
+
+        Args:
+            key (str): resource key
+            factory (function): function to get or create resource; it takes
+                value registered by another process (or None) and returns
+                JSON serializable value of resource
+
+        Returns:
+            tuple: resource value and lease ID
+        """
+        lease = '{}:{}:{}'.format(self.host, os.getpid(), uuid.uuid4().hex)
+
+        with self._data() as data:
+            entry = data.get(key, {'value': None, 'leases': {}})
+            entry['value'] = factory(entry['value'])
+            entry['leases'][lease] = {'host': self.host, 'pid': os.getpid()}
+            data[key] = entry
+
+        LOGGER.debug("Lease {!r} of {!r} is taken".format(lease, key))
+        return entry['value'], lease
+
+    def release(self, key, lease, finalizer):
+        """Release lease of resource.
+
+        Args:
+            key (str): resource key
+            lease (str): lease ID returned by :meth:`acquire`
+            finalizer (function): function to delete resource; it takes
+                resource value and is called if released lease is last one
+
+        Returns:
+            bool: whether resource is finalized
+        """
+        with self._data() as data:
+            entry = data.get(key)
+            if entry is None:
+                return False
+
+            entry['leases'].pop(lease, None)
+            LOGGER.debug("Lease {!r} of {!r} is released".format(lease, key))
+            if entry['leases']:
+                return False
+
+            del data[key]
+            finalizer(entry['value'])
+            return True
+
+    def release_process_leases(self, finalizer):
+        """Release all leases taken by current process.
+
+        It's used when leases returned by :meth:`acquire` are lost, ex:
+        process's fixtures are rebuilt without their finalization.
+
+        Args:
+            finalizer (function): function to delete resource; it takes
+                resource value and is called if released lease is last one
+        """
+        owner = {'host': self.host, 'pid': os.getpid()}
+        with self._data() as data:
+            for key, entry in list(data.items()):
+                leases = [lease for lease, lease_owner
+                          in entry['leases'].items() if lease_owner == owner]
+                if not leases:
+                    continue
+
+                for lease in leases:
+                    del entry['leases'][lease]
+                    LOGGER.debug("Lease {!r} of {!r} is released".format(
+                        lease, key))
+                if not entry['leases']:
+                    del data[key]
+                    finalizer(entry['value'])
+
+    def finalize_orphans(self, finalizer):
+        """Finalize resources which leases are dropped with dead processes.
+
+        Args:
+            finalizer (function): function to delete resource; it takes
+                resource value
+        """
+        with self._data() as data:
+            for key, entry in list(data.items()):
+                if entry['leases']:
+                    continue
+
+                LOGGER.debug("Resource {!r} without leases is "
+                             "finalized".format(key))
+                del data[key]
+                finalizer(entry['value'])
+
+    @contextlib.contextmanager
+    def _data(self):
+        """Read registry data and write it back under lock."""
+        with process_mutex.Lock(self.path + '.lock'):
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (IOError, ValueError):
+                data = {}
+
+            for entry in data.values():
+                for lease, owner in list(entry['leases'].items()):
+                    if (owner['host'] == self.host and
+                            not _is_process_alive(owner['pid'])):
+                        LOGGER.debug(
+                            "Lease {!r} of dead process is dropped".format(
+                                lease))
+                        del entry['leases'][lease]
+
+            try:
+                yield data
+            finally:
+                tmp_path = '{}.{}'.format(self.path, os.getpid())
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.rename(tmp_path, self.path)
@@ -0,0 +1,216 @@
+"""
+----------
+Log cursor
+----------
+
+Helpers to search new lines of big remote logs without reading them from the
+beginning.
+
+Cursor is inode and byte size of log file at the moment it's marked. Later
+only bytes after cursor offset are read with ``tail -c``. If log is rotated
+(its inode is changed or it's truncated), the rest of rotated file is read if
+it's found in the same directory, followed by the whole new file.
+
+All keywords and regexes are searched in one pass with ``awk``, each matched
+line is returned with its pattern and timestamp.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import log_cursor
+
+       # execute command on node and get its stdout
+       cmd = log_cursor.build_mark_command('/var/log/nova/nova-api.log')
+       cursor = log_cursor.parse_mark_output('/var/log/nova/nova-api.log',
+                                             stdout)
+       ...
+       patterns = log_cursor.get_patterns(keywords=['ERROR'],
+                                          regexes=['Instance .* spawned'])
+       cmd = log_cursor.build_read_command(cursor, keywords=['ERROR'],
+                                           regexes=['Instance .* spawned'])
+       # execute command on node and get its stdout
+       matches = log_cursor.parse_read_output(stdout, patterns)
+       matches['ERROR']  # [LogMatch('ERROR', '2017-03-28 ...', datetime)]
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import datetime
+import re
+
+from six import moves
+
+__all__ = [
+    'LogCursor',
+    'LogMatch',
+    'build_mark_command',
+    'build_read_command',
+    'get_patterns',
+    'parse_mark_output',
+    'parse_read_output',
+    'parse_timestamp',
+]
+
+LogCursor = collections.namedtuple('LogCursor',
+                                   ['file_name', 'inode', 'offset'])
+LogMatch = collections.namedtuple('LogMatch', ['pattern', 'line', 'timestamp'])
+
+TIMESTAMP_RE = re.compile(
+    r'^(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})(?:[.,](\d+))?')
+
+READ_TEMPLATE = u"""\
+f={file_name}
+test -e "$f" || {{ echo "$f doesn't exist" >&2; exit 2; }}
+inode={inode}
+offset={offset}
+{{
+if [ "$(stat -c %i "$f")" = "$inode" ] && \
+[ "$(stat -c %s "$f")" -ge "$offset" ]; then
+    tail -c +$((offset + 1)) "$f"
+else
+    old=$(find "$(dirname "$f")" -maxdepth 1 -inum "$inode" \
+-name "$(basename "$f")*" ! -name '*.gz' | head -n 1)
+    [ -z "$old" ] || tail -c +$((offset + 1)) "$old"
+    cat "$f"
+fi
+}} | {env} LC_ALL=C awk {program}
+"""
+
+
+def build_mark_command(file_name):
+    """Build command to get cursor at the end of log file.
+
+    Args:
+        file_name (str): path to log file
+
+    Returns:
+        str: bash command
+    """
+    return u"stat -c '%i %s' {}".format(moves.shlex_quote(file_name))
+
+
+def parse_mark_output(file_name, stdout):
+    """Parse output of command built with :func:`build_mark_command`.
+
+    Args:
+        file_name (str): path to log file
+        stdout (str): command output
+
+    Returns:
+        LogCursor: cursor at the end of log file
+    """
+    inode, offset = stdout.split()
+    return LogCursor(file_name, int(inode), int(offset))
+
+
+def get_patterns(keywords=None, regexes=None):
+    """Get searched patterns in order of their indexes in command output.
+
+    Args:
+        keywords (list, optional): strings to search
+        regexes (list, optional): extended regular expressions to search
+
+    Returns:
+        list: patterns, keywords are followed by regexes
+    """
+    return list(keywords or []) + list(regexes or [])
+
+
+def build_read_command(cursor, keywords=None, regexes=None,
+                       non_matching=None):
+    """Build command to search log lines written after cursor.
+
+    Each line matched to pattern is printed with pattern index, so line
+    matched to several patterns is printed several times.
+
+    Args:
+        cursor (LogCursor): cursor to read from. Log is read from its
+            beginning if cursor's inode is ``None``.
+        keywords (list, optional): strings to search
+        regexes (list, optional): extended regular expressions to search
+        non_matching (str, optional): string, lines with which are skipped
+
+    Returns:
+        str: bash command
+    """
+    keywords = list(keywords or [])
+    regexes = list(regexes or [])
+
+    env = []
+    program = []
+    if non_matching:
+        env.append(u'STEPLER_SKIP={}'.format(moves.shlex_quote(non_matching)))
+        program.append(u'index($0, ENVIRON["STEPLER_SKIP"]) {next}')
+
+    for i, pattern in enumerate(keywords + regexes):
+        env.append(u'STEPLER_P{}={}'.format(i, moves.shlex_quote(pattern)))
+        if i < len(keywords):
+            condition = u'index($0, ENVIRON["STEPLER_P{}"])'.format(i)
+        else:
+            condition = u'$0 ~ ENVIRON["STEPLER_P{}"]'.format(i)
+        program.append(u'{} {{print "{} " $0}}'.format(condition, i))
+
+    inode, offset = cursor.inode, cursor.offset
+    if inode is None:
+        inode, offset = u'$(stat -c %i "$f")', 0
+
+    return READ_TEMPLATE.format(
+        file_name=moves.shlex_quote(cursor.file_name),
+        inode=inode,
+        offset=offset,
+        env=u' '.join(env),
+        program=moves.shlex_quote(u'\n'.join(program)))
+
+
+def parse_read_output(stdout, patterns):
+    """Parse output of command built with :func:`build_read_command`.
+
+    Args:
+        stdout (str): command output
+        patterns (list): searched patterns, as :func:`get_patterns` returns
+
+    Returns:
+        collections.OrderedDict: pattern -> list of LogMatch(es) in order of
+            lines in log
+    """
+    matches = collections.OrderedDict((pattern, []) for pattern in patterns)
+    for line in stdout.splitlines():
+        index, _, line = line.partition(' ')
+        pattern = patterns[int(index)]
+        matches[pattern].append(
+            LogMatch(pattern, line, parse_timestamp(line)))
+    return matches
+
+
+def parse_timestamp(line):
+    """Parse timestamp at the beginning of OpenStack log line.
+
+    Args:
+        line (str): log line, ex: ``2017-03-28 10:47:40.123 1234 INFO ...``
+
+    Returns:
+        datetime.datetime|None: timestamp or None if line doesn't start with
+            timestamp
+    """
+    match = TIMESTAMP_RE.match(line)
+    if not match:
+        return None
+    date, time, fraction = match.groups()
+    timestamp = datetime.datetime.strptime(date + ' ' + time,
+                                           '%Y-%m-%d %H:%M:%S')
+    if fraction:
+        microseconds = int(fraction[:6].ljust(6, '0'))
+        timestamp = timestamp.replace(microsecond=microseconds)
+    return timestamp
@@ -17,34 +17,200 @@ Logger for steps
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import functools
+import json
 import logging
+import os
+import threading
 import time
 
 import six
+from six.moves import reprlib
+
+__all__ = [
+    'TRACER',
+    'StepTracer',
+    'log',
+]
 
 LOGGER = logging.getLogger('stepler.func_logger')
 
+if six.PY3:
+    _monotonic = time.monotonic
+else:
+    _monotonic = time.time
+
+# truncated repr, because args can be big: resources lists, files content
+_REPR = reprlib.Repr()
+_REPR.maxstring = _REPR.maxother = 200
+_REPR.maxlist = _REPR.maxtuple = _REPR.maxset = _REPR.maxdict = 20
+_REPR.maxlevel = 4
+
+
+class _LazyRepr(object):
+    """Repr of object which is calculated only if log record is emitted."""
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return _REPR.repr(self.obj)
+
+
+class StepTracer(object):
+    """Collector of steps timings.
+
+    Steps are recorded only if tracer is enabled. Each record contains step
+    name, parent step name, test node ID, monotonic start and end timestamps
+    and outcome (``passed`` or exception class name).
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.enabled = False
+        self.test = None
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @property
+    def current(self):
+        """Record of current thread step or None."""
+        stack = self._stack
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def bind(self, parent):
+        """Context manager to record steps of current thread as children.
+
+        It's used in worker threads, which execute steps on behalf of step
+        of another thread.
+
+        Args:
+            parent (dict|None): parent step record, see :attr:`current`
+        """
+        stack = self._stack
+        saved_stack = stack[:]
+        stack[:] = [] if parent is None else [parent]
+        try:
+            yield
+        finally:
+            stack[:] = saved_stack
+
+    def start(self, name):
+        """Start step recording.
+
+        Args:
+            name (str): step name
+
+        Returns:
+            dict: step record to pass to :meth:`end`
+        """
+        stack = self._stack
+        event = {
+            'name': name,
+            'parent': stack[-1]['name'] if stack else self.test,
+            'test': self.test,
+            'thread': threading.current_thread().name,
+            'start': _monotonic(),
+        }
+        stack.append(event)
+        return event
+
+    def end(self, event, outcome='passed'):
+        """End step recording.
+
+        Args:
+            event (dict): step record returned by :meth:`start`
+            outcome (str): step outcome
+        """
+        event['end'] = _monotonic()
+        event['outcome'] = outcome
+        stack = self._stack
+        if stack and stack[-1] is event:
+            stack.pop()
+        with self._lock:
+            self.events.append(event)
+
+    def dump(self, path):
+        """Write recorded steps to file.
+
+        Format depends on file extension: JSON lines for ``.jsonl``, Chrome
+        trace events (can be opened with chrome://tracing or speedscope)
+        otherwise.
+
+        Args:
+            path (str): file path
+        """
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event['start'])
+
+        with open(path, 'w') as f:
+            if path.endswith('.jsonl'):
+                for event in events:
+                    f.write(json.dumps(event) + '\n')
+                return
+
+            pid = os.getpid()
+            json.dump({'traceEvents': [{
+                'name': event['name'],
+                'cat': 'test' if event['parent'] is None else 'step',
+                'ph': 'X',
+                'ts': int(event['start'] * 1e6),
+                'dur': int((event['end'] - event['start']) * 1e6),
+                'pid': pid,
+                'tid': event['thread'],
+                'args': {'parent': event['parent'],
+                         'test': event['test'],
+                         'outcome': event['outcome']},
+            } for event in events]}, f)
+
+
+TRACER = StepTracer()
+
 
 def log(func):
-    """Decorator to log function with arguments and execution time."""
+    """Decorator to log function with arguments and execution time.
+
+    Arguments are formatted only if debug logging is enabled. Execution is
+    recorded to :data:`TRACER` if it's enabled.
+    """
+    func_name = getattr(func, '__name__', str(func))
+
     @functools.wraps(func)
     def wrapper(*args, **kwgs):
-        # reject self from log args if it is present
         __tracebackhide__ = True
-        log_args = _reject_self_from_args(func, args)
+        is_logged = LOGGER.isEnabledFor(logging.DEBUG)
+        if is_logged:
+            # reject self from log args if it is present
+            log_args = _reject_self_from_args(func, args)
+            LOGGER.debug('Function %r starts with args %s and kwgs %s',
+                         func_name, _LazyRepr(log_args), _LazyRepr(kwgs))
 
-        func_name = getattr(func, '__name__', str(func))
-        LOGGER.debug(
-            'Function {!r} starts with args {!r} and kwgs {!r}'.format(
-                func_name, log_args, kwgs))
+        event = TRACER.start(func_name) if TRACER.enabled else None
+        outcome = 'passed'
         start = time.time()
         try:
-            result = func(*args, **kwgs)
+            return func(*args, **kwgs)
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
         finally:
-            LOGGER.debug('Function {!r} ended in {:.4f} sec'.format(
-                func_name, time.time() - start))
-        return result
+            if event is not None:
+                TRACER.end(event, outcome)
+            if is_logged:
+                LOGGER.debug('Function %r ended in %.4f sec', func_name,
+                             time.time() - start)
 
     return wrapper
 
@@ -0,0 +1,211 @@
+"""
+----------
+Node probe
+----------
+
+Helpers to collect many facts of node with single remote command.
+
+Command prints output of each section after marker line, so output of all
+sections is transferred with one round trip and parsed locally to structured
+data.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import node_probe
+
+       cmd = node_probe.build_command(['lscpu', 'numa_hugepages'])
+       # execute cmd on node and get its stdout
+       facts = node_probe.parse_output(stdout)
+       facts['lscpu']['NUMA node(s)']  # '2'
+       facts['numa_hugepages']['numa0'][2048]['free']  # 512
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import re
+
+__all__ = [
+    'SECTIONS',
+    'build_command',
+    'parse_cpu_list',
+    'parse_output',
+]
+
+SECTION_MARKER = '### stepler-probe '
+
+SECTIONS = collections.OrderedDict([
+    ('cmdline', "cat /proc/cmdline"),
+    ('lscpu', "lscpu"),
+    ('hugepages',
+     "grep -H '' /sys/kernel/mm/hugepages/hugepages-*/*_hugepages"),
+    ('numa_hugepages',
+     "grep -H '' /sys/devices/system/node/node*/hugepages/"
+     "hugepages-*/*_hugepages"),
+    ('numa_meminfo', "cat /sys/devices/system/node/node*/meminfo"),
+    ('ip', "ip -o a"),
+    ('processes', "ps -eo pid=,args="),
+])
+
+
+def build_command(sections=None):
+    """Build command to collect facts sections.
+
+    Command doesn't fail if some facts are absent on node (ex: no hugepages
+    or NUMA support), such sections are empty.
+
+    Args:
+        sections (list, optional): names of sections to collect. All sections
+            are collected by default.
+
+    Returns:
+        str: bash command
+
+    Raises:
+        KeyError: if unknown section is requested
+    """
+    cmds = []
+    for name in sections or SECTIONS:
+        cmds.append("echo '{marker}{name}'; {cmd} 2>/dev/null".format(
+            marker=SECTION_MARKER, name=name, cmd=SECTIONS[name]))
+    cmds.append('true')
+    return '; '.join(cmds)
+
+
+def parse_output(stdout):
+    """Parse output of command built with :func:`build_command`.
+
+    Args:
+        stdout (str): command output
+
+    Returns:
+        dict: section name -> parsed section value
+    """
+    lines = collections.OrderedDict()
+    name = None
+    for line in stdout.splitlines():
+        if line.startswith(SECTION_MARKER):
+            name = line[len(SECTION_MARKER):].strip()
+            lines[name] = []
+        elif name is not None:
+            lines[name].append(line)
+
+    return {name: _PARSERS[name](section_lines)
+            for name, section_lines in lines.items()}
+
+
+def parse_cpu_list(value):
+    """Parse kernel CPU list format.
+
+    Args:
+        value (str): CPU list, ex: '0,1' or '0-3,8'
+
+    Returns:
+        list: CPU numbers, ex: [0, 1, 2, 3, 8]
+    """
+    result = []
+    for item in value.split(','):
+        bounds = item.split('-')
+        if len(bounds) == 2:
+            result.extend(range(int(bounds[0]), int(bounds[1]) + 1))
+        else:
+            result.append(int(bounds[0]))
+    return result
+
+
+def _parse_cmdline(lines):
+    # BOOT_IMAGE=/boot/vmlinuz-4.4.0-47-generic ... isolcpus=0,1
+    return ' '.join(lines).strip()
+
+
+def _parse_lscpu(lines):
+    # NUMA node0 CPU(s):     0-3
+    result = collections.OrderedDict()
+    for line in lines:
+        key, sep, value = line.partition(':')
+        if sep:
+            result[key.strip()] = value.strip()
+    return result
+
+
+def _parse_hugepages(lines):
+    # /sys/kernel/mm/hugepages/hugepages-2048kB/free_hugepages:512
+    result = collections.defaultdict(dict)
+    for line in lines:
+        values = re.findall(r"hugepages-(\d+)kB/(\w+)_hugepages:(\d+)", line)
+        if values:
+            size, type, value = values[0]
+            result[int(size)][type] = int(value)
+    return dict(result)
+
+
+def _parse_numa_hugepages(lines):
+    # /sys/devices/system/node/node0/hugepages/hugepages-2048kB/
+    # free_hugepages:512
+    result = collections.defaultdict(lambda: collections.defaultdict(dict))
+    for line in lines:
+        values = re.findall(
+            r"node(\d+)/hugepages/hugepages-(\d+)kB/(\w+)_hugepages:(\d+)",
+            line)
+        if values:
+            numa_id, size, type, value = values[0]
+            result["numa{}".format(numa_id)][int(size)][type] = int(value)
+    return {numa: dict(sizes) for numa, sizes in result.items()}
+
+
+def _parse_numa_meminfo(lines):
+    # Node 0 MemTotal:        4046280 kB
+    result = collections.defaultdict(dict)
+    for line in lines:
+        values = re.findall(r"Node (\d+) (\S+):\s+(\d+)", line)
+        if values:
+            numa_id, key, value = values[0]
+            result["numa{}".format(numa_id)][key] = int(value)
+    return dict(result)
+
+
+def _parse_ip(lines):
+    # 2: eth0    inet 10.109.1.4/24 brd 10.109.1.255 scope global eth0\ ...
+    result = []
+    for line in lines:
+        values = re.findall(r"^\d+:\s+(\S+)\s+(inet6?)\s+([^/\s]+)", line)
+        if values:
+            interface, family, address = values[0]
+            result.append({'interface': interface,
+                           'family': family,
+                           'address': address})
+    return result
+
+
+def _parse_processes(lines):
+    #  1234 /usr/bin/python /usr/bin/nova-compute
+    result = []
+    for line in lines:
+        values = re.findall(r"^\s*(\d+)\s+(.*)$", line)
+        if values:
+            pid, args = values[0]
+            result.append({'pid': int(pid), 'args': args})
+    return result
+
+
+_PARSERS = {
+    'cmdline': _parse_cmdline,
+    'lscpu': _parse_lscpu,
+    'hugepages': _parse_hugepages,
+    'numa_hugepages': _parse_numa_hugepages,
+    'numa_meminfo': _parse_numa_meminfo,
+    'ip': _parse_ip,
+    'processes': _parse_processes,
+}
@@ -18,10 +18,24 @@ Collection of utilities for parsing CLI clients output
 import re
 
 import prettytable
+import six
+
+__all__ = [
+    'iter_listing',
+    'iter_table_rows',
+    'listing',
+    'table',
+    'tables',
+]
 
 delimiter_line = re.compile('^\+\-[\+\-]+\-\+$')
 
 
+def _is_delimiter(line):
+    """Check whether line is table delimiter, like '+----+----+'."""
+    return line.startswith('+-') and delimiter_line.match(line) is not None
+
+
 # TODO(gdyuldin): refactor after coping from tempest
 def tables(output_lines):
     """Find all ascii-tables in output and parse them.
@@ -43,7 +57,7 @@ def tables(output_lines):
         output_lines = output_lines.split('\n')
 
     for line in output_lines:
-        if delimiter_line.match(line):
+        if _is_delimiter(line):
             if not start:
                 start = True
             elif not header:
@@ -70,70 +84,84 @@ def tables(output_lines):
     return tables_
 
 
-# TODO(gdyuldin): refactor after coping from tempest
 def table(output_lines):
     """Parse single table from cli output.
     Return dict with list of column names in 'headers' key and
     rows in 'values' key.
     """
-    table_ = {'headers': [], 'values': []}
-    columns = None
+    rows = iter_table_rows(output_lines)
+    return {'headers': next(rows, []), 'values': list(rows)}
 
-    if not isinstance(output_lines, list):
-        output_lines = output_lines.split('\n')
 
-    if not output_lines[-1]:
-        # skip last line if empty (just newline at the end)
-        output_lines = output_lines[:-1]
+def iter_table_rows(output_lines):
+    """Parse table rows from cli output one by one.
+
+    Column offsets are calculated once from delimiter line, and cells are
+    sliced from row lines. Multiline cells of 2-columns tables (like in
+    ``show`` commands output) are combined.
+
+    Args:
+        output_lines (str|iterable): cli output or iterable of its lines,
+            for ex: file object of big output
 
-    rows = []
+    Yields:
+        list: header row at first, then value rows
+    """
+    if isinstance(output_lines, six.string_types):
+        output_lines = output_lines.split('\n')
+
+    columns = None
+    row = None
     for line in output_lines:
-        if delimiter_line.match(line):
+        line = line.rstrip('\r\n')
+        if _is_delimiter(line):
             columns = _table_columns(line)
             continue
-        if '|' not in line:
+        if '|' not in line or columns is None:
             continue
-        row = []
-        for col in columns:
-            row.append(_get_cell(line, *col).strip())
-        rows.append(row)
 
-    # Combine multiline cells
-    if len(rows[0]) == 2:
-        for i in reversed(range(len(rows))):
-            if not rows[i][0]:
-                rows[i - 1][1] += rows[i][1]
-                rows.pop(i)
+        next_row = _get_cells(line, columns)
+        if row is not None:
+            if len(next_row) == 2 and not next_row[0]:
+                row[1] += next_row[1]
+                continue
+            yield row
+        row = next_row
+
+    if row is not None:
+        yield row
 
-    table_['headers'] = rows[0]
-    table_['values'] = rows[1:]
 
-    return table_
+def _is_ascii(line):
+    try:
+        line.encode('ascii')
+    except UnicodeError:
+        return False
+    return True
 
 
-def _get_cell(line, start, end):
-    """Returns part of line from `start` to `end` considering char block width.
+def _get_cells(line, columns):
+    """Get stripped cells of row line.
 
     Args:
-        line (str): unicode line
-        start (int): start of desired part of line
-        end (int): end of desired part of line
+        line (str): table row line
+        columns (list): (start, end) display positions of columns
 
     Returns:
-        str: part of string
+        list: cells values
     """
-    pos = 0
-    output = []
+    if _is_ascii(line):
+        return [line[start:end].strip() for start, end in columns]
 
-    for char in line:
-        char_width = prettytable._char_block_width(ord(char))
-        if pos >= end:
-            break
-        if pos >= start:
-            output.append(char)
-        pos += char_width
+    # wide chars (ex: CJK) take 2 positions, so map positions to indexes
+    indexes = []
+    for i, char in enumerate(line):
+        indexes.extend([i] * prettytable._char_block_width(ord(char)))
+    indexes.append(len(line))
 
-    return u''.join(output)
+    last = len(indexes) - 1
+    return [line[indexes[min(start, last)]:indexes[min(end, last)]].strip()
+            for start, end in columns]
 
 
 # TODO(gdyuldin): refactor after coping from tempest
@@ -153,15 +181,21 @@ def _table_columns(first_table_row):
     return positions
 
 
-# TODO(gdyuldin): refactor after coping from tempest
 def listing(output_lines):
     """Return list of dicts with basic item info parsed from cli output."""
+    return list(iter_listing(output_lines))
 
-    items = []
-    table_ = table(output_lines)
-    for row in table_['values']:
-        item = {}
-        for col_idx, col_key in enumerate(table_['headers']):
-            item[col_key] = row[col_idx]
-        items.append(item)
-    return items
+
+def iter_listing(output_lines):
+    """Parse listing items from cli output one by one.
+
+    Args:
+        output_lines (str|iterable): cli output or iterable of its lines
+
+    Yields:
+        dict: item info, column name -> cell value
+    """
+    rows = iter_table_rows(output_lines)
+    headers = next(rows, None)
+    for row in rows:
+        yield dict(zip(headers, row))
@@ -17,6 +17,7 @@ Pings checking helpers
 # See the License for the specific language governing permissions and
 # limitations under the License.from functools import wraps
 
+import collections
 import contextlib
 import os
 import re
@@ -33,6 +34,9 @@ else:
     import subprocess
 
 
+PING_RESULT_MARKER = 'stepler-ping-result'
+
+
 class PingResult(object):
     """Ping result class.
 
@@ -195,3 +199,46 @@ class FixedIDPinger(Pinger):
 
     def _prepare_cmd(self, count=None):
         return [self.command_path, self.ip_to_ping, self.icmp_id]
+
+
+def ping_many(remote, ips, count=3):
+    """Ping several ips concurrently from remote host with one command.
+
+    All pings are started in background on remote host, their outputs are
+    prefixed with markers and returned with one command result.
+
+    Example:
+        >>> results = ping_many(remote, ['10.0.0.3', '8.8.8.8'])
+        >>> print({ip: result.loss for ip, result in results.items()})
+        {'10.0.0.3': 0, '8.8.8.8': 3}
+
+    Args:
+        remote (object): instance of stepler.third_party.ssh.SshClient
+        ips (list): ip addresses to ping
+        count (int): count of pings to send to each ip
+
+    Returns:
+        collections.OrderedDict: ping results by ips
+    """
+    results = collections.OrderedDict((ip, PingResult()) for ip in ips)
+    if not results:
+        return results
+
+    cmd = ' '.join(
+        '(out=$(ping -c{count} {ip} 2>&1); '
+        'printf "%s\\n%s\\n" "{marker} {ip}" "$out") &'.format(
+            count=count, ip=ip, marker=PING_RESULT_MARKER)
+        for ip in results) + ' wait'
+    output = remote.execute(cmd, timeout=count * 10).stdout
+
+    outputs = collections.defaultdict(list)
+    ip = None
+    for line in output.splitlines():
+        if line.startswith(PING_RESULT_MARKER):
+            ip = line[len(PING_RESULT_MARKER):].strip()
+        elif ip is not None:
+            outputs[ip].append(line)
+
+    for ip, result in results.items():
+        result.stdout = '\n'.join(outputs[ip])
+    return results
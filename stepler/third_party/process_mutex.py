@@ -17,6 +17,7 @@ Interprocess locker
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import errno
 import fcntl
 
 
@@ -29,10 +30,27 @@ class Lock(object):
         # This will create it if it does not exist already
         self.handle = open(self.filename, 'w')
 
-    # Bitwise OR fcntl.LOCK_NB if you need a non-blocking lock
-    def acquire(self):
-        """Acquire lock."""
-        fcntl.flock(self.handle, fcntl.LOCK_EX)
+    def acquire(self, blocking=True):
+        """Acquire lock.
+
+        Args:
+            blocking (bool): flag whether to wait until lock is released by
+                another process
+
+        Returns:
+            bool: whether lock is acquired
+        """
+        flags = fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+
+        try:
+            fcntl.flock(self.handle, flags)
+        except IOError as e:
+            if blocking or e.errno not in (errno.EACCES, errno.EAGAIN):
+                raise
+            return False
+        return True
 
     def release(self):
         """Release lock."""
@@ -0,0 +1,193 @@
+"""
+----------------
+Readiness probes
+----------------
+
+Helpers to wait until cloud is operable with single remote command.
+
+Command polls all probes concurrently on controller and prints marker line
+with elapsed milliseconds as soon as probe passes, so command is done when the
+slowest probe passes. Probes of services which aren't installed on node (ex:
+rabbitmq or galera on dedicated nodes) pass immediately.
+
+Probes of nova, neutron and cinder services pass when services which were up
+before test are up again, so services which are down by design (ex: compute
+of removed node) don't block probes. States of services are recorded before
+test with command built by :func:`build_states_command`.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import readiness_probes
+
+       cmd = readiness_probes.build_states_command(
+           openrc_cmd='source /root/openrc')
+       # execute `bash -c cmd` on controller before test and get its stdout
+       states = readiness_probes.parse_states(stdout)
+
+       cmd = readiness_probes.build_command(openrc_cmd='source /root/openrc',
+                                            states=states)
+       # execute `timeout 600 bash -c cmd` on controller and get its stdout
+       timings = readiness_probes.parse_output(stdout)
+       timings['keystone']  # 12.5
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from six import moves
+
+__all__ = [
+    'PROBES',
+    'PROBES_NAMES',
+    'SERVICES_PROBES',
+    'build_command',
+    'build_states_command',
+    'parse_output',
+    'parse_states',
+]
+
+PROBE_MARKER = '### stepler-ready '
+STATE_MARKER = '### stepler-up '
+POLL_INTERVAL = 2
+
+# commands print line per service with its state, line of service which is up
+# matches UP_PATTERN
+SERVICES_PROBES = collections.OrderedDict([
+    ('nova',
+     "openstack compute service list -f value -c Binary -c Host -c State"),
+    ('neutron',
+     "openstack network agent list -f value -c Binary -c Host -c Alive"),
+    ('cinder',
+     "openstack volume service list -f value -c Binary -c Host -c State"),
+])
+UP_PATTERN = '(^| )(up|True|:-\\))( |$)'
+
+PROBES = collections.OrderedDict([
+    ('keystone', "openstack token issue"),
+    ('glance', "openstack image list --limit 1"),
+    ('rabbitmq',
+     "! command -v rabbitmqctl || rabbitmqctl -q status"),
+    ('galera',
+     "! [ -e ~/.my.cnf ] || "
+     "mysql -N -e \"SHOW STATUS LIKE 'wsrep_ready'\" | grep -q ON"),
+])
+
+PROBES_NAMES = list(PROBES) + list(SERVICES_PROBES)
+
+
+def _get_services_probe(name, states=None):
+    cmd = 's=$({}) && [ -n "$s" ]'.format(SERVICES_PROBES[name])
+    if states is None:
+        # state before test is unknown, so all services should be up
+        return '{} && ! echo "$s" | grep -qvE {}'.format(
+            cmd, moves.shlex_quote(UP_PATTERN))
+
+    for state in states:
+        cmd += ' && echo "$s" | grep -qxF -- {}'.format(
+            moves.shlex_quote(state))
+    return cmd
+
+
+def build_states_command(openrc_cmd=None):
+    """Build command to get states of services which are up.
+
+    Args:
+        openrc_cmd (str, optional): command to activate openrc before probes
+
+    Returns:
+        str: bash command
+    """
+    cmds = []
+    if openrc_cmd:
+        cmds.append(openrc_cmd)
+    for name, cmd in SERVICES_PROBES.items():
+        cmds.append('{cmd} | grep -E {pattern} | sed "s/^/{marker}{name} /"'
+                    .format(cmd=cmd, pattern=moves.shlex_quote(UP_PATTERN),
+                            marker=STATE_MARKER, name=name))
+    return '\n'.join(cmds)
+
+
+def parse_states(stdout):
+    """Parse output of command built with :func:`build_states_command`.
+
+    Args:
+        stdout (str): command output
+
+    Returns:
+        dict: probe name -> list of lines of services which are up
+    """
+    states = {}
+    for line in stdout.splitlines():
+        if line.startswith(STATE_MARKER):
+            name, state = line[len(STATE_MARKER):].split(' ', 1)
+            states.setdefault(name, []).append(state)
+    return states
+
+
+def build_command(probes=None, openrc_cmd=None, states=None):
+    """Build command to wait until probes are passed.
+
+    Command isn't limited in time, it should be executed with ``timeout``.
+
+    Args:
+        probes (list, optional): names of probes to wait. All probes are
+            waited by default.
+        openrc_cmd (str, optional): command to activate openrc before probes
+        states (dict, optional): states of services recorded before test,
+            returned by :func:`parse_states`. Services probe without states
+            waits all services are up.
+
+    Returns:
+        str: bash command
+
+    Raises:
+        KeyError: if unknown probe is requested
+    """
+    cmds = []
+    if openrc_cmd:
+        cmds.append(openrc_cmd)
+    cmds.append('start=$(date +%s%N)')
+    cmds.append(
+        '_probe() {{ until bash -c "$2" >/dev/null 2>&1; do sleep {interval}; '
+        'done; echo "{marker}$1 $(( ($(date +%s%N) - start) / 1000000 ))"; '
+        '}}'.format(interval=POLL_INTERVAL, marker=PROBE_MARKER))
+    for name in probes or PROBES_NAMES:
+        if name in SERVICES_PROBES:
+            cmd = _get_services_probe(name, (states or {}).get(name))
+        else:
+            cmd = PROBES[name]
+        cmds.append('_probe {name} {cmd} &'.format(
+            name=name, cmd=moves.shlex_quote(cmd)))
+    cmds.append('wait')
+    return '\n'.join(cmds)
+
+
+def parse_output(stdout):
+    """Parse output of command built with :func:`build_command`.
+
+    Args:
+        stdout (str): command output
+
+    Returns:
+        collections.OrderedDict: passed probe name -> seconds to pass, in
+            order of passing
+    """
+    timings = collections.OrderedDict()
+    for line in stdout.splitlines():
+        if line.startswith(PROBE_MARKER):
+            name, milliseconds = line[len(PROBE_MARKER):].split()
+            timings[name] = int(milliseconds) / 1000.
+    return timings
@@ -0,0 +1,221 @@
+"""
+------------
+Remote shell
+------------
+
+Long-lived ``bash`` process on remote host to execute many commands over one
+SSH channel.
+
+Environment (ex: sourced openrc) is prepared once when shell is opened. Each
+command is executed in subshell, so it doesn't change shell environment, and
+is followed by unique marker printed to stdout with exit code and to stderr,
+which separate output of one command from another. If shell is broken it's
+reopened before next command.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import remote_shell
+       from stepler.third_party import ssh
+
+       client = ssh.SshClient('10.0.0.2', username='root', pkey=pkey)
+       with remote_shell.RemoteShell(client, 'source /root/openrc') as shell:
+           exit_code, stdout, stderr = shell.execute('nova list', timeout=60)
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import re
+import select
+import socket
+import time
+import uuid
+
+import paramiko
+from six import moves
+
+from stepler.third_party import ssh
+
+__all__ = [
+    'RemoteShell',
+    'RemoteShellError',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+SHELL_CMD = 'bash --noprofile --norc'
+SELECT_TIMEOUT = 1
+# extra time to get command result after it's killed by `timeout`
+TIMEOUT_GRACE = 10
+
+MARKERS_TEMPLATE = (
+    u'printf "\\n{marker} %d\\n" $?; printf "\\n{marker}\\n" >&2\n')
+COMMAND_TEMPLATE = u'(\n{command}\n) < /dev/null\n' + MARKERS_TEMPLATE
+# init command isn't executed in subshell to keep its environment
+INIT_TEMPLATE = u'{{\n{command}\n}} < /dev/null\n' + MARKERS_TEMPLATE
+
+
+class RemoteShellError(Exception):
+    """Remote shell is closed while command is executed."""
+
+
+class _SendError(Exception):
+    """Command can't be sent to remote shell."""
+
+
+class RemoteShell(object):
+    """Persistent remote shell."""
+
+    def __init__(self, ssh_client, init_cmd=None, sudo=False):
+        """Constructor.
+
+        Args:
+            ssh_client (SshClient): client to open shell channel with
+            init_cmd (str, optional): command to prepare shell environment,
+                ex: to source openrc or export variables
+            sudo (bool, optional): flag whether to start shell with sudo
+        """
+        self._ssh = ssh_client
+        self._init_cmd = init_cmd
+        self._sudo = sudo
+        self._chan = None
+        self._stdout = b''
+        self._stderr = b''
+
+    @property
+    def closed(self):
+        return self._chan is None or self._chan.closed
+
+    def open(self):
+        """Start remote shell and prepare its environment."""
+        if self._ssh.closed:
+            self._ssh.connect()
+
+        if self._sudo:
+            with self._ssh.sudo():
+                self._chan = self._ssh.execute_async(SHELL_CMD)[0]
+        else:
+            self._chan = self._ssh.execute_async(SHELL_CMD)[0]
+        self._stdout = self._stderr = b''
+
+        if self._init_cmd:
+            exit_code, _, stderr = self._execute(self._init_cmd, timeout=None,
+                                                 template=INIT_TEMPLATE)
+            if exit_code != 0:
+                LOGGER.warning("Remote shell init command {!r} exit code is "
+                               "{}: {}".format(self._init_cmd, exit_code,
+                                               stderr))
+
+    def close(self):
+        """Stop remote shell and release SSH connection."""
+        if self._chan is not None:
+            self._chan.close()
+            self._chan = None
+        if not self._ssh.closed:
+            self._ssh.close()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def execute(self, command, timeout=None):
+        """Execute command in remote shell.
+
+        Shell is reopened if it's closed or broken before command is sent.
+
+        Args:
+            command (str): command to execute
+            timeout (int, optional): max command executing time in seconds.
+                By default it's unlimited.
+
+        Returns:
+            tuple: (exit_code, stdout, stderr) - result of command execution
+
+        Raises:
+            RemoteShellError: if shell is closed while command is executed
+            ExecutionTimeout: if result isn't got in time
+        """
+        if self.closed:
+            self._reopen()
+
+        try:
+            return self._execute(command, timeout)
+        except _SendError:
+            LOGGER.debug("Remote shell is broken, reopen it")
+            self._reopen()
+            return self._execute(command, timeout)
+
+    def _reopen(self):
+        self.close()
+        self.open()
+
+    def _execute(self, command, timeout, template=COMMAND_TEMPLATE):
+        marker = uuid.uuid4().hex
+        if timeout:
+            command = u'timeout {} bash -c {}'.format(
+                timeout, moves.shlex_quote(command))
+        script = template.format(command=command, marker=marker)
+
+        try:
+            self._chan.sendall(script.encode('utf-8'))
+        except (paramiko.SSHException, socket.error, EOFError) as e:
+            raise _SendError(e)
+
+        deadline = time.time() + timeout + TIMEOUT_GRACE if timeout else None
+        marker = marker.encode('ascii')
+        stdout_re = re.compile(b'\n' + marker + b' (\\d+)\n')
+        stderr_re = re.compile(b'\n' + marker + b'\n')
+        stdout_match = stderr_match = None
+
+        while True:
+            while self._chan.recv_ready():
+                self._stdout += self._chan.recv(ssh.READ_BUFFER_SIZE)
+            while self._chan.recv_stderr_ready():
+                self._stderr += self._chan.recv_stderr(ssh.READ_BUFFER_SIZE)
+
+            stdout_match = stdout_match or stdout_re.search(self._stdout)
+            stderr_match = stderr_match or stderr_re.search(self._stderr)
+            if stdout_match and stderr_match:
+                break
+
+            if self._chan.closed or self._chan.exit_status_ready():
+                self._chan.close()
+                raise RemoteShellError(
+                    "Remote shell is closed while executing "
+                    "`{}`".format(command))
+
+            select_timeout = SELECT_TIMEOUT
+            if deadline is not None:
+                select_timeout = min(deadline - time.time(), select_timeout)
+                if select_timeout <= 0:
+                    # shell is busy with command, so it can't be reused
+                    self._chan.close()
+                    raise ssh.ExecutionTimeout(
+                        'Executing `{cmd}` is too long (more than {timeout} '
+                        'seconds)'.format(cmd=command, timeout=timeout))
+
+            select.select([self._chan], [], [self._chan], select_timeout)
+
+        stdout = self._stdout[:stdout_match.start()]
+        stderr = self._stderr[:stderr_match.start()]
+        self._stdout = self._stdout[stdout_match.end():]
+        self._stderr = self._stderr[stderr_match.end():]
+
+        return (int(stdout_match.group(1)),
+                stdout.decode('utf-8', 'replace'),
+                stderr.decode('utf-8', 'replace'))
@@ -0,0 +1,259 @@
+"""
+-------------------------------------------
+Pytest plugin to register created resources
+-------------------------------------------
+
+Steps register resources right after creation with owner credentials alias
+and test node ID. Cleanup fixtures take their resources from registry instead
+of listing all resources of project before and after test.
+
+Cleanup fixtures set functions to delete resources of their services. Before
+resources of service are deleted, resources which can use them are deleted:
+servers first, then ports and volumes, then networks and routers. If
+``config.CLEANUP_UNEXPECTED_AFTER_ALL`` is set, resources left in registry
+are deleted at session end.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import resource_registry
+
+       # inside create step
+       resource_registry.REGISTRY.register('server', servers)
+
+       # inside cleanup fixture, before test
+       def _delete_servers(server_ids):
+           for owner, ids in server_ids.items():
+               with credentials.change(owner):
+                   delete_servers([server for server in get_servers()
+                                   if server.id in ids])
+
+       nodeid = resource_registry.REGISTRY.nodeid
+       resource_registry.REGISTRY.set_cleaner('server', _delete_servers)
+       ...
+       # inside cleanup fixture finalizer
+       resource_registry.REGISTRY.cleanup('server', nodeid=nodeid)
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import logging
+import threading
+
+import pytest
+
+from stepler import config
+
+__all__ = [
+    'DELETION_ORDER',
+    'REGISTRY',
+    'Record',
+    'ResourceRegistry',
+    'pytest_runtest_protocol',
+    'pytest_sessionfinish',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+# resources of each stage can be used by resources of previous stages only,
+# so stages are deleted one by one; services not listed are deleted last
+DELETION_ORDER = (
+    ('server',),
+    ('port', 'volume'),
+    ('network', 'router'),
+)
+
+Record = collections.namedtuple(
+    'Record', ['service', 'resource_id', 'resource', 'owner', 'nodeid'])
+
+
+def _get_resource_id(resource):
+    if isinstance(resource, dict):
+        return resource['id']
+    return resource.id
+
+
+def _get_stage_index(service):
+    for index, stage in enumerate(DELETION_ORDER):
+        if service in stage:
+            return index
+    return len(DELETION_ORDER)
+
+
+class ResourceRegistry(object):
+    """Thread-safe registry of created resources.
+
+    Attributes:
+        owner (str): alias of current credentials; resources are registered
+            with it
+        nodeid (str): ID of running test; resources are registered with it
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._records = collections.OrderedDict()
+        self._cleaners = {}
+        self._lock = threading.Lock()
+        self.owner = None
+        self.nodeid = None
+
+    def __len__(self):
+        """Get count of registered resources."""
+        with self._lock:
+            return len(self._records)
+
+    def register(self, service, resources):
+        """Register created resources.
+
+        Args:
+            service (str): resources service name, ex: 'server', 'image'
+            resources (list): created resources (objects or dicts with id)
+        """
+        with self._lock:
+            for resource in resources:
+                resource_id = _get_resource_id(resource)
+                self._records[service, resource_id] = Record(
+                    service=service,
+                    resource_id=resource_id,
+                    resource=resource,
+                    owner=self.owner,
+                    nodeid=self.nodeid)
+
+    def pop(self, service, nodeid=None):
+        """Take registered resources off registry.
+
+        Args:
+            service (str): resources service name
+            nodeid (str, optional): test node ID. By default resources of all
+                tests are taken.
+
+        Returns:
+            OrderedDict: owner -> list of records in order of registration
+        """
+        records = collections.OrderedDict()
+        with self._lock:
+            for key, record in list(self._records.items()):
+                if record.service != service:
+                    continue
+                if nodeid is not None and record.nodeid != nodeid:
+                    continue
+
+                del self._records[key]
+                records.setdefault(record.owner, []).append(record)
+
+        return records
+
+    def pop_ids(self, service, nodeid=None):
+        """Take IDs of registered resources off registry.
+
+        Args:
+            service (str): resources service name
+            nodeid (str, optional): test node ID. By default resources of all
+                tests are taken.
+
+        Returns:
+            OrderedDict: owner -> set of resources IDs
+        """
+        return collections.OrderedDict(
+            (owner, {record.resource_id for record in records})
+            for owner, records in self.pop(service, nodeid=nodeid).items())
+
+    def unregister(self, service, resources):
+        """Take resources off registry without deletion.
+
+        Args:
+            service (str): resources service name
+            resources (list): resources (objects or dicts with id) which
+                life cycle is managed outside of cleanup fixtures
+        """
+        with self._lock:
+            for resource in resources:
+                self._records.pop((service, _get_resource_id(resource)), None)
+
+    def set_cleaner(self, service, cleaner):
+        """Set function to delete registered resources of service.
+
+        Args:
+            service (str): resources service name
+            cleaner (function): function which takes OrderedDict
+                owner -> set of resources IDs and deletes resources
+        """
+        with self._lock:
+            self._cleaners[service] = cleaner
+
+    def cleanup(self, service=None, nodeid=None):
+        """Delete registered resources in order of dependencies.
+
+        Resources of services of previous stages of ``DELETION_ORDER`` are
+        deleted before resources of ``service``. Each cleaner deletes all
+        resources of its service at once. Services without cleaner are
+        skipped and their resources are kept in registry.
+
+        Args:
+            service (str, optional): resources service name. By default
+                resources of all services are deleted.
+            nodeid (str, optional): test node ID. By default resources of all
+                tests are deleted.
+        """
+        with self._lock:
+            cleaners = sorted(self._cleaners.items(),
+                              key=lambda item: _get_stage_index(item[0]))
+
+        if service is not None:
+            stage_index = _get_stage_index(service)
+            cleaners = [
+                (cleaner_service, cleaner)
+                for cleaner_service, cleaner in cleaners
+                if (_get_stage_index(cleaner_service) < stage_index or
+                    cleaner_service == service)]
+
+        for cleaner_service, cleaner in cleaners:
+            resource_ids = self.pop_ids(cleaner_service, nodeid=nodeid)
+            if resource_ids:
+                cleaner(resource_ids)
+
+    def records(self):
+        """Get all registered resources.
+
+        Returns:
+            list: records in order of registration
+        """
+        with self._lock:
+            return list(self._records.values())
+
+
+REGISTRY = ResourceRegistry()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Hook to register resources with ID of running test."""
+    REGISTRY.nodeid = item.nodeid
+    yield
+    REGISTRY.nodeid = None
+
+
+def pytest_sessionfinish(session):
+    """Hook to sweep and report resources which weren't cleaned up."""
+    if config.CLEANUP_UNEXPECTED_AFTER_ALL:
+        try:
+            REGISTRY.cleanup()
+        except Exception:
+            LOGGER.exception("Can't delete resources left in registry")
+
+    for record in REGISTRY.records():
+        LOGGER.warning('{0.service} {0.resource_id!r} created by {0.nodeid!r} '
+                       'with credentials {0.owner!r} is not deleted by '
+                       'cleanup fixtures'.format(record))
@@ -0,0 +1,131 @@
+"""
+-------------------------------------------------
+Pytest plugin to skip tests by their requirements
+-------------------------------------------------
+
+Requirements are defined with marker ``requires``:
+
+.. code:: python
+
+   @pytest.mark.requires("ceph_enabled")
+   @pytest.mark.requires("computes_count > 4")
+   @pytest.mark.requires("computes_count > 4 and ceph_enabled")
+
+It supports any logical and arithmetical operations and their combinations.
+Names inside expressions are attributes of ``predicates`` fixture.
+
+Expressions are compiled once during tests collection. Fixture
+``skip_test``, which evaluates them, is moved to the front of test fixtures,
+so skipped test doesn't pay for expensive fixtures like images or browser.
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+
+import pytest
+
+try:
+    from functools import lru_cache
+except ImportError:
+    from functools32 import lru_cache
+
+__all__ = [
+    'check_requires',
+    'pytest_collection_modifyitems',
+]
+
+PREDICATES = 'predicates'
+REQUIRES = 'requires'
+SKIP_FIXTURE = 'skip_test'
+
+
+class RewritePredicates(ast.NodeTransformer):
+    """Class to rewrite requires to predicate instance attributes."""
+
+    def visit_Name(self, node):
+        return ast.copy_location(
+            ast.Attribute(
+                value=ast.Name(
+                    id=PREDICATES, ctx=ast.Load()),
+                attr=node.id,
+                ctx=node.ctx),
+            node)
+
+
+@lru_cache(maxsize=None)
+def compile_requires(requires):
+    """Compile requirement expression to code object.
+
+    Args:
+        requires (str): requirement expression
+
+    Returns:
+        code: compiled expression, which uses ``predicates`` global
+    """
+    tree = ast.parse(requires, mode='eval')
+    tree = RewritePredicates().visit(tree)
+    tree = ast.fix_missing_locations(tree)
+    return compile(tree, '<ast>', mode='eval')
+
+
+def check_requires(predicates, requires):
+    """Skip test if any of requirements isn't satisfied.
+
+    Args:
+        predicates (object): instance of predicates
+        requires (list): requirement expressions
+
+    Raises:
+        Skipped: if requirement isn't satisfied
+    """
+    for expression in requires:
+        code = compile_requires(expression)
+
+        if not eval(code, {PREDICATES: predicates}):
+            pytest.skip('Skipped due to a mismatch to condition: {!r}\n'
+                        'Calculated conditions: {}'.format(
+                            expression,
+                            predicates._get_calculated_conditions()))
+
+        predicates._clear_calls()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """Hook to compile requirements of collected tests.
+
+    Fixture checking requirements is moved to the front of fixtures of tests
+    with requirements to be set up before others.
+    """
+    errors = []
+    for item in items:
+        marker = item.get_marker(REQUIRES)
+        if not marker:
+            continue
+
+        if SKIP_FIXTURE in item.fixturenames:
+            item.fixturenames.remove(SKIP_FIXTURE)
+            item.fixturenames.insert(0, SKIP_FIXTURE)
+
+        for requires in marker.args:
+            try:
+                compile_requires(requires)
+            except SyntaxError as e:
+                errors.append('Invalid requirement {!r} of test {!r}: '
+                              '{}'.format(requires, item.nodeid, e))
+
+    if errors:
+        pytest.exit('Some tests requirements are invalid!\n' +
+                    '\n'.join(errors))
@@ -17,10 +17,12 @@ SSH client
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import contextlib
 import logging
 import select
 import socket
+import threading
 import time
 
 import paramiko
@@ -29,16 +31,48 @@ from six import moves
 
 
 __all__ = [
-    'SshClient'
+    'SshClient',
+    'SshConnectionPool',
 ]
 
 LOGGER = logging.getLogger(__name__)
 
+# paramiko default channel window size
+READ_BUFFER_SIZE = 2 * 1024 * 1024
+SELECT_TIMEOUT = 60
+
 
 class ExecutionTimeout(Exception):
     """Command execution timeout exception."""
 
 
+class _Output(object):
+    """Command output accumulated by chunks and decoded once on demand."""
+
+    def __init__(self):
+        self._chunks = []
+        self._bytes = b''
+        self._text = None
+
+    def append(self, value):
+        self._chunks.append(value)
+        self._text = None
+
+    @property
+    def bytes(self):
+        if self._chunks:
+            self._chunks.insert(0, self._bytes)
+            self._bytes = b''.join(self._chunks)
+            self._chunks = []
+        return self._bytes
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.bytes.decode('utf-8').strip()
+        return self._text
+
+
 class CommandResult(object):
     """Remote command result."""
 
@@ -46,8 +80,8 @@ class CommandResult(object):
         super(CommandResult, self).__init__(*args, **kwargs)
         self.command = None
         self.exit_code = None
-        self.stdout_bytes = b''
-        self.stderr_bytes = b''
+        self._stdout = _Output()
+        self._stderr = _Output()
 
     def __repr__(self):
         return (u'`{0.command}` result:\n'
@@ -59,19 +93,27 @@ class CommandResult(object):
     def is_ok(self):
         return self.exit_code == 0
 
+    @property
+    def stdout_bytes(self):
+        return self._stdout.bytes
+
     @property
     def stdout(self):
-        return self.stdout_bytes.decode('utf-8').strip()
+        return self._stdout.text
 
     def append_stdout(self, value):
-        self.stdout_bytes += value
+        self._stdout.append(value)
+
+    @property
+    def stderr_bytes(self):
+        return self._stderr.bytes
 
     @property
     def stderr(self):
-        return self.stderr_bytes.decode('utf-8').strip()
+        return self._stderr.text
 
     def append_stderr(self, value):
-        self.stderr_bytes += value
+        self._stderr.append(value)
 
     def check_exit_code(self, expected=0):
         """Check that exit code is expected."""
@@ -89,8 +131,156 @@ class CommandResult(object):
                                'is not empty:\n{0.stderr}'.format(self))
 
 
+class _PoolEntry(object):
+    """Established SSH connection with its usage info."""
+
+    def __init__(self, client):
+        self.client = client
+        self.users = 0
+        self.last_used = time.time()
+        self.retired = False
+
+    @property
+    def is_alive(self):
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+
+class SshConnectionPool(object):
+    """Pool of established SSH connections.
+
+    Connections are keyed by host, port, username, credentials and proxy
+    command. SSH clients with the same key share one transport and open their
+    own channels on it, so key exchange and authentication are made once.
+
+    Connection is closed when nobody uses it longer than ``idle_timeout``
+    seconds or when pool has more than ``max_size`` connections and it's the
+    least recently used one.
+    """
+
+    def __init__(self, max_size=50, idle_timeout=5 * 60):
+        """Constructor.
+
+        Args:
+            max_size (int, optional): max count of idle connections in pool
+            idle_timeout (int, optional): seconds to keep idle connection
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def acquire(self, key):
+        """Get live pooled connection.
+
+        Args:
+            key (tuple): connection key
+
+        Returns:
+            object|None: pool entry or None if there is no live connection
+        """
+        with self._lock:
+            self._evict()
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+
+            if not entry.is_alive:
+                self._retire(entry)
+                return None
+
+            # move to the end as most recently used
+            self._entries[key] = entry
+            entry.users += 1
+            return entry
+
+    def put(self, key, client):
+        """Put new connection to pool and acquire it.
+
+        Previous connection with the same key is replaced. It will be closed
+        when its last user releases it.
+
+        Args:
+            key (tuple): connection key
+            client (paramiko.SSHClient): established connection
+
+        Returns:
+            object: pool entry
+        """
+        entry = _PoolEntry(client)
+        entry.users += 1
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._retire(old_entry)
+            self._entries[key] = entry
+            self._evict()
+        return entry
+
+    def release(self, entry):
+        """Release acquired connection.
+
+        Args:
+            entry (object): pool entry
+        """
+        with self._lock:
+            entry.users -= 1
+            entry.last_used = time.time()
+            if entry.retired and entry.users <= 0:
+                entry.client.close()
+
+    def discard(self, key, entry):
+        """Drop broken connection from pool.
+
+        Args:
+            key (tuple): connection key
+            entry (object): pool entry
+        """
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            self._retire(entry)
+
+    def clear(self):
+        """Close all idle connections and retire used ones."""
+        with self._lock:
+            for entry in self._entries.values():
+                self._retire(entry)
+            self._entries.clear()
+
+    def _retire(self, entry):
+        entry.retired = True
+        if entry.users <= 0:
+            entry.client.close()
+
+    def _evict(self):
+        now = time.time()
+        idle_keys = [key for key, entry in self._entries.items()
+                     if entry.users <= 0]
+        overflow = len(self._entries) - self.max_size
+
+        for key in idle_keys:  # keys are ordered from least recently used
+            entry = self._entries[key]
+            if overflow > 0 or now - entry.last_used > self.idle_timeout:
+                LOGGER.debug('Close idle SSH connection {}'.format(key[:2]))
+                del self._entries[key]
+                self._retire(entry)
+                overflow -= 1
+
+
+POOL = SshConnectionPool()
+
+
 class SshClient(object):
-    """SSH client."""
+    """SSH client.
+
+    By default established connections are stored in shared ``POOL`` and
+    reused by other clients with the same connection parameters.
+    """
 
     def __init__(self,
                  host,
@@ -99,7 +289,8 @@ class SshClient(object):
                  password=None,
                  pkey=None,
                  timeout=None,
-                 proxy_cmd=None):
+                 proxy_cmd=None,
+                 pool=POOL):
         """Constructor.
 
         Args:
@@ -110,6 +301,8 @@ class SshClient(object):
             pkey (str, optional): private key content
             timeout (int, optional): connection timeout
             proxy_cmd (str, optional): ssh proxy command
+            pool (SshConnectionPool, optional): pool of connections to reuse.
+                If None, connection is established and closed by each client.
         """
         self._host = host
         self._port = port
@@ -123,6 +316,9 @@ class SshClient(object):
         self._proxy_cmd = proxy_cmd
         self._sudo = False
         self._ssh = None
+        self._pool = pool
+        self._pool_entry = None
+        self._sftp = None
 
     def __repr__(self):
         """Representation."""
@@ -147,43 +343,111 @@ class SshClient(object):
     def closed(self):
         return self._ssh is None
 
-    def connect(self):
-        """Connect to ssh server."""
-        if not self.closed:
-            raise RuntimeError('SSH is already opened')
+    @property
+    def _pool_key(self):
+        pkey = self._pkey.get_fingerprint() if self._pkey else None
+        return (self._host, self._port, self._username, self._password, pkey,
+                self._proxy_cmd)
 
+    def _establish(self):
+        """Establish new SSH connection."""
         sock = paramiko.ProxyCommand(self._proxy_cmd) \
             if self._proxy_cmd else None
 
-        self._ssh = paramiko.SSHClient()
-        self._ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        self._ssh.connect(
-            self._host,
-            self._port,
-            pkey=self._pkey,
-            timeout=self._timeout,
-            banner_timeout=self._timeout,
-            username=self._username,
-            password=self._password,
-            sock=sock)
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(
+                self._host,
+                self._port,
+                pkey=self._pkey,
+                timeout=self._timeout,
+                banner_timeout=self._timeout,
+                username=self._username,
+                password=self._password,
+                sock=sock)
+        except Exception:
+            client.close()
+            raise
+        return client
+
+    def connect(self, reuse=True):
+        """Connect to ssh server.
+
+        Args:
+            reuse (bool, optional): flag whether to reuse pooled connection or
+                establish new one
+        """
+        if not self.closed:
+            raise RuntimeError('SSH is already opened')
+
+        if self._pool is None:
+            self._ssh = self._establish()
+            return
+
+        if reuse:
+            self._pool_entry = self._pool.acquire(self._pool_key)
+
+        if self._pool_entry is None:
+            self._pool_entry = self._pool.put(self._pool_key,
+                                              self._establish())
+
+        self._ssh = self._pool_entry.client
 
     def close(self):
-        """Close ssh connection."""
+        """Close ssh connection.
+
+        Pooled connection isn't closed, it's released to pool.
+        """
         if self.closed:
             raise RuntimeError('SSH is already closed')
-        self._ssh.close()
+
+        if self._sftp is not None:
+            self._sftp.close()
+            self._sftp = None
+
+        if self._pool_entry is not None:
+            self._pool.release(self._pool_entry)
+            self._pool_entry = None
+        else:
+            self._ssh.close()
         self._ssh = None
 
     def check(self):
-        """Check SSH connection."""
+        """Check SSH connection.
+
+        It always establishes new connection to check that server is really
+        reachable. Established connection is stored to pool to be reused.
+        """
         try:
-            self.connect()
+            self.connect(reuse=False)
             return True
         except (paramiko.SSHException, socket.error, EOFError) as e:
             LOGGER.debug(e)
             return False
         finally:
-            self.close()
+            if not self.closed:
+                self.close()
+
+    def _open_session(self):
+        """Open channel, reconnect once if pooled connection is broken."""
+        try:
+            return self._ssh.get_transport().open_session(
+                timeout=self._timeout)
+        except (paramiko.SSHException, socket.error, EOFError,
+                AttributeError):
+            if self._pool_entry is None:
+                raise
+
+        LOGGER.debug('Pooled SSH connection to {} is broken, '
+                     'reconnect'.format(self._host))
+        self._pool.discard(self._pool_key, self._pool_entry)
+        self._pool.release(self._pool_entry)
+        self._pool_entry = None
+        self._ssh = None
+        self._sftp = None
+        self.connect(reuse=False)
+        return self._ssh.get_transport().open_session(timeout=self._timeout)
 
     def __enter__(self):
         self.connect()
@@ -295,7 +559,7 @@ class SshClient(object):
                      'do sleep 1; done;'.format(pid=pid), timeout=timeout)
 
     def execute(self, command, merge_stderr=False, verbose=False,
-                timeout=None):
+                timeout=None, stdout_handler=None):
         """Execute command and returns CommandResult instance.
 
         Args:
@@ -303,6 +567,9 @@ class SshClient(object):
             merge_stderr (bool): merge stderr to stdout
             verbose (bool): make log records or not
             timeout (int, optional): maximum command executing time in seconds
+            stdout_handler (function, optional): function to pass stdout
+                chunks to instead of storing them in result. Useful for huge
+                outputs, for ex: ``file.write``.
 
         Returns:
             object: CommandResult instance
@@ -315,21 +582,27 @@ class SshClient(object):
 
         result = CommandResult()
         result.command = command
+        handle_stdout = stdout_handler or result.append_stdout
 
-        start = time.time()
+        deadline = time.time() + timeout if timeout else None
         while not chan.closed or chan.recv_ready() or chan.recv_stderr_ready():
-            select.select([chan], [], [chan], 60)
-
+            select_timeout = SELECT_TIMEOUT
+            if deadline is not None:
+                select_timeout = min(deadline - time.time(), select_timeout)
+                if select_timeout <= 0:
+                    chan.close()
+                    raise ExecutionTimeout(
+                        'Executing `{cmd}` is too long (more than {timeout} '
+                        'seconds)'.format(cmd=command, timeout=timeout))
+
+            select.select([chan], [], [chan], select_timeout)
+
+            # one buffer per stream is read, so deadline is checked even if
+            # command writes output continuously
             if chan.recv_ready():
-                result.append_stdout(chan.recv(1024))
+                handle_stdout(chan.recv(READ_BUFFER_SIZE))
             if chan.recv_stderr_ready():
-                result.append_stderr(chan.recv_stderr(1024))
-
-            if timeout and (time.time() > start + timeout):
-                chan.close()
-                raise ExecutionTimeout('Executing `{cmd}` is too long '
-                                       '(more than {timeout} seconds)'.format(
-                                           cmd=command, timeout=timeout))
+                result.append_stderr(chan.recv_stderr(READ_BUFFER_SIZE))
 
         result.exit_code = chan.recv_exit_status()
         stdin.close()
@@ -358,7 +631,7 @@ class SshClient(object):
         """
         if verbose:
             LOGGER.debug("Executing command: '%s'" % command.rstrip())
-        chan = self._ssh.get_transport().open_session(timeout=self._timeout)
+        chan = self._open_session()
         chan.set_combine_stderr(merge_stderr)
         stdin = chan.makefile('wb')
         stdout = chan.makefile('rb')
@@ -380,5 +653,8 @@ class SshClient(object):
         Yields:
             obj: an SFTPFile object representing the open file
         """
-        with self._ssh.open_sftp() as sftp:
-            yield sftp.open(path, mode)
+        if self._sftp is None:
+            self._sftp = self._ssh.open_sftp()
+
+        with self._sftp.open(path, mode) as f:
+            yield f
@@ -0,0 +1,151 @@
+"""
+------------
+SSH executor
+------------
+
+Executor of shell commands on many nodes concurrently over persistent SSH
+connections.
+
+It's lightweight alternative for os-faults ``nodes.run_task({'shell': cmd})``
+which starts ansible play for each command. Results have the same fields as
+os-faults ``AnsibleExecutionRecord`` has, so they can be processed by the same
+code.
+
+Example:
+    .. code:: python
+
+       from stepler.third_party import ssh_executor
+
+       executor = ssh_executor.SshExecutor('root', pkey=pkey)
+       for record in executor.execute(['10.0.0.2', '10.0.0.3'], 'uptime'):
+           print(record.host, record.status, record.payload['stdout'])
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import logging
+import socket
+
+import paramiko
+
+from stepler import config
+from stepler.third_party import ssh
+from stepler.third_party import utils
+
+__all__ = [
+    'ExecutionRecord',
+    'SshExecutor',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+STATUS_FAILED = 'FAILED'
+STATUS_UNREACHABLE = 'UNREACHABLE'
+# exit code of timed out command, the same as `timeout` utility returns
+TIMEOUT_EXIT_CODE = 124
+
+# the same fields as os-faults ``AnsibleExecutionRecord`` has
+ExecutionRecord = collections.namedtuple(
+    'ExecutionRecord', ['host', 'status', 'task', 'payload'])
+
+
+def _get_payload(exit_code, stdout, stderr):
+    # ansible strips trailing newlines of output only
+    stdout = stdout.rstrip('\r\n')
+    stderr = stderr.rstrip('\r\n')
+    return {
+        'rc': exit_code,
+        'stdout': stdout,
+        'stdout_lines': stdout.splitlines(),
+        'stderr': stderr,
+        'stderr_lines': stderr.splitlines(),
+    }
+
+
+class SshExecutor(object):
+    """Executor of shell commands on nodes via SSH."""
+
+    def __init__(self, username, pkey=None, sudo=False, timeout=None,
+                 workers=10):
+        """Constructor.
+
+        Args:
+            username (str): username to connect to nodes
+            pkey (str, optional): private key content
+            sudo (bool, optional): flag whether to execute commands with sudo
+            timeout (int, optional): SSH connection timeout
+            workers (int, optional): max count of nodes to execute command on
+                concurrently
+        """
+        self.username = username
+        self.pkey = pkey
+        self.sudo = sudo
+        self.timeout = timeout
+        self.workers = workers
+
+    def get_client(self, host):
+        """Get SSH client to node.
+
+        Connections are stored in shared pool and reused by next clients.
+
+        Args:
+            host (str): node IP
+
+        Returns:
+            SshClient: SSH client, not connected yet
+        """
+        return ssh.SshClient(host,
+                             username=self.username,
+                             pkey=self.pkey,
+                             timeout=self.timeout)
+
+    def execute(self, hosts, cmd, timeout=None):
+        """Execute shell command on nodes concurrently.
+
+        Args:
+            hosts (list): IPs of nodes to execute command on
+            cmd (str): shell command
+            timeout (int, optional): max command executing time in seconds
+
+        Returns:
+            list: ExecutionRecord(s) in order of hosts
+        """
+        return utils.parallel_map(
+            lambda host: self._execute(host, cmd, timeout), hosts,
+            workers=self.workers)
+
+    def _execute(self, host, cmd, timeout):
+        task = {'shell': cmd}
+        try:
+            with self.get_client(host) as client:
+                if self.sudo:
+                    with client.sudo():
+                        result = client.execute(cmd, timeout=timeout)
+                else:
+                    result = client.execute(cmd, timeout=timeout)
+        except ssh.ExecutionTimeout as e:
+            payload = _get_payload(TIMEOUT_EXIT_CODE, u'', str(e))
+            return ExecutionRecord(host, STATUS_FAILED, task, payload)
+        except (paramiko.SSHException, socket.error, EOFError) as e:
+            LOGGER.debug("Can't execute `{}` on {}: {}".format(cmd, host, e))
+            return ExecutionRecord(host, STATUS_UNREACHABLE, task,
+                                   {'msg': str(e)})
+
+        status = config.STATUS_OK if result.is_ok else STATUS_FAILED
+        payload = _get_payload(
+            result.exit_code,
+            result.stdout_bytes.decode('utf-8', 'replace'),
+            result.stderr_bytes.decode('utf-8', 'replace'))
+        return ExecutionRecord(host, status, task, payload)
@@ -10,6 +10,10 @@ Pytest plugin to check consistency
 
 Checker can be disabled via ``py.test`` key ``--disable-steps-checker``.
 
+Validation results are cached in pytest cache by source file modification
+time and content hash, so only changed files are validated again. Cache can
+be reset via ``py.test`` key ``--steps-checker-cache-clear``.
+
 Checker can be disabled with comments:
 
 .. code:: python
@@ -44,10 +48,13 @@ Checker can be disabled with comments:
 import ast
 import collections
 import functools
+import hashlib
 import importlib
 import inspect
+import os
 import pkgutil
 import re
+import sys
 import tokenize
 
 import pytest
@@ -63,6 +70,7 @@ except ImportError:
     from functools32 import lru_cache
 
 __all__ = [
+    'ValidationCache',
     'pytest_addoption',
     'pytest_collection_modifyitems',
     'pytest_configure',
@@ -128,6 +136,8 @@ DOC_LINK = (' Visit http://stepler.readthedocs.io/steps_concept.html to get'
 DISABLE_COMMENT = 'checker: disable'
 ENABLE_COMMENT = 'checker: enable'
 
+CACHE_KEY = 'stepler/steps_checker'
+
 
 def step(func):
     """Decorator to append step method name to permitted calls.
@@ -152,6 +162,10 @@ def pytest_addoption(parser):
         "--steps-check-only",
         action="store_true",
         help="disable steps checker (warning will be shown)")
+    parser.addoption(
+        "--steps-checker-cache-clear",
+        action="store_true",
+        help="remove steps checker cache before validation")
 
 
 def pytest_collection_modifyitems(config, items):
@@ -160,11 +174,16 @@ def pytest_collection_modifyitems(config, items):
         config.warn('P1', 'Permitted calls checker is disabled!')
         return
 
+    cache = _get_validation_cache(config)
     errors = []
     for item in items:
         permitted_calls = PERMITTED_CALLS + STEPS + item.funcargnames
         validator = TestValidator(item.function, permitted_calls)
-        errors.extend(validator.validate())
+        # call names don't depend on permitted calls, so they are cached
+        call_names = cache.get(item.function, 'test',
+                               validator.get_call_names)
+        errors.extend(validator.validate(call_names))
+    cache.save()
 
     if errors:
         pytest.exit("Only steps and fixtures must be called in test!\n" +
@@ -183,6 +202,13 @@ def pytest_configure(config):
         config.warn('P1', 'Step consistency checker is disabled!')
         return
 
+    if hasattr(config, 'slaveinput'):  # xdist master already checked steps
+        return
+
+    cache = _get_validation_cache(config)
+    if config.option.steps_checker_cache_clear:
+        cache.clear()
+
     errors = []
     for step_cls in _get_step_classes():
         for attr_name in dir(step_cls):
@@ -193,9 +219,11 @@ def pytest_configure(config):
             step_func = six.get_unbound_function(getattr(step_cls, attr_name))
             step_func = utils.get_unwrapped_func(step_func)
 
-            validator = StepValidator(step_func)
+            errors.extend(cache.get(
+                step_func, 'step',
+                functools.partial(_validate_step, step_func)))
+    cache.save()
 
-            errors.extend(validator.validate())
     if errors:
         pytest.exit('Some steps are not consistent!\n' + '\n'.join(errors))
 
@@ -286,6 +314,14 @@ class FuncValidator(object):
 
         return call_names
 
+    def get_call_names(self):
+        """Get sorted names of functions called inside function.
+
+        Returns:
+            list: called function names
+        """
+        return sorted(self._get_call_names())
+
     @lru_cache()
     def _get_tokens(self):
         """Get list of tokens from function."""
@@ -539,10 +575,10 @@ class TestValidator(FuncValidator):
         super(TestValidator, self).__init__(func, *args, **kwargs)
         self._permitted_calls = permitted_calls or []
 
-    def _validate_calls(self):
+    def _validate_calls(self, call_names):
         """Validate that only permitted calls are in the test."""
         errors = []
-        for call_name in self._get_call_names():
+        for call_name in call_names:
             if call_name not in self._permitted_calls:
 
                 error = ("Calling {!r} isn't allowed".format(call_name) +
@@ -550,9 +586,135 @@ class TestValidator(FuncValidator):
                 errors.append(error)
         return errors
 
-    def validate(self):
-        """Validate test with default rules."""
-        return self._validate_calls()
+    def validate(self, call_names=None):
+        """Validate test with default rules.
+
+        Args:
+            call_names (list, optional): names of functions called inside
+                test, if they are known already (ex: from cache)
+
+        Returns:
+            list: errors
+        """
+        if call_names is None:
+            call_names = self._get_call_names()
+        return self._validate_calls(call_names)
+
+
+class ValidationCache(object):
+    """Cache of validation results.
+
+    Results are kept per source file and are dropped if file is changed.
+    File is considered unchanged if its modification time or content hash
+    is the same. All results are dropped if checker itself is changed.
+    """
+
+    def __init__(self, cache=None):
+        """Constructor.
+
+        Args:
+            cache (Cache, optional): pytest cache to load and save results;
+                results aren't persisted without it
+        """
+        self._cache = cache
+        self._version = _get_file_hash(_get_source_file(sys.modules[__name__]))
+        self._data = None
+        self._checked_paths = {}
+        self._is_changed = False
+
+    def get(self, func, kind, validate):
+        """Get validation result of function.
+
+        Args:
+            func (function): validated function
+            kind (str): validation kind, ex: 'step' or 'test'
+            validate (function): function to calculate result if it isn't
+                cached; result must be JSON serializable
+
+        Returns:
+            object: validation result
+        """
+        path = _get_source_file(func)
+        if path is None:
+            return validate()
+
+        results = self._get_file_results(path)
+        key = '{}:{}:{}'.format(kind, func.__name__,
+                                six.get_function_code(func).co_firstlineno)
+        if key not in results:
+            results[key] = validate()
+            self._is_changed = True
+        return results[key]
+
+    def clear(self):
+        """Remove all cached results."""
+        self._data = {'version': self._version, 'files': {}}
+        self._checked_paths.clear()
+        self._is_changed = True
+        self.save()
+
+    def save(self):
+        """Save results to pytest cache if they are changed."""
+        if self._cache is not None and self._is_changed:
+            self._cache.set(CACHE_KEY, self._data)
+        self._is_changed = False
+
+    def _load(self):
+        if self._data is not None:
+            return
+        if self._cache is not None:
+            self._data = self._cache.get(CACHE_KEY, None)
+        if not self._data or self._data.get('version') != self._version:
+            self._data = {'version': self._version, 'files': {}}
+
+    def _get_file_results(self, path):
+        if path in self._checked_paths:
+            return self._checked_paths[path]
+
+        self._load()
+        files = self._data['files']
+        entry = files.get(path)
+        mtime = os.path.getmtime(path)
+
+        if entry is None or entry['mtime'] != mtime:
+            file_hash = _get_file_hash(path)
+            if entry is None or entry['hash'] != file_hash:
+                entry = files[path] = {'hash': file_hash, 'results': {}}
+            entry['mtime'] = mtime
+            self._is_changed = True
+
+        self._checked_paths[path] = entry['results']
+        return entry['results']
+
+
+def _get_validation_cache(config):
+    """Get validation cache shared by checker hooks."""
+    if not hasattr(config, '_steps_checker_cache'):
+        config._steps_checker_cache = ValidationCache(
+            getattr(config, 'cache', None))
+    return config._steps_checker_cache
+
+
+def _validate_step(step_func):
+    """Validate step function."""
+    return StepValidator(step_func).validate()
+
+
+def _get_source_file(obj):
+    """Get path of python source file of object."""
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        return None
+    if path is None or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _get_file_hash(path):
+    """Get hash of file content."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
 
 
 def _get_step_classes():
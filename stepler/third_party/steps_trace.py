@@ -0,0 +1,99 @@
+"""
+------------------------------------
+Pytest plugin to trace steps timings
+------------------------------------
+
+With ``--steps-trace=PATH`` option each test and step (and each function
+decorated with :func:`stepler.third_party.logger.log`) is recorded with its
+parent, monotonic start and end timestamps and outcome. Trace is written at
+session end in Chrome trace events format, which can be loaded to
+chrome://tracing or speedscope to look at flame graph, or as JSON lines if
+path ends with ``.jsonl``. Each pytest-xdist worker writes own file with
+worker ID suffix.
+
+Example:
+    .. code:: bash
+
+       py.test stepler/nova --steps-trace=test_reports/trace.json
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from stepler.third_party import logger
+
+__all__ = [
+    'pytest_addoption',
+    'pytest_configure',
+    'pytest_runtest_logreport',
+    'pytest_runtest_protocol',
+    'pytest_sessionfinish',
+]
+
+
+def pytest_addoption(parser):
+    """Add ``--steps-trace`` option to pytest."""
+    parser.addoption("--steps-trace", action="store", metavar="PATH",
+                     help="Write steps timings trace to file")
+
+
+def pytest_configure(config):
+    """Hook to enable steps tracing."""
+    logger.TRACER.enabled = bool(config.getoption('steps_trace'))
+
+
+# test node ID -> outcome of its failed or skipped phase
+_OUTCOMES = {}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Hook to record test with its setup, call and teardown."""
+    if not logger.TRACER.enabled:
+        yield
+        return
+
+    logger.TRACER.test = item.nodeid
+    event = logger.TRACER.start(item.nodeid)
+    event['parent'] = None
+    yield
+    logger.TRACER.end(event, _OUTCOMES.pop(item.nodeid, 'passed'))
+    logger.TRACER.test = None
+
+
+def pytest_runtest_logreport(report):
+    """Hook to remember outcome of test."""
+    if not logger.TRACER.enabled or report.passed:
+        return
+    if _OUTCOMES.get(report.nodeid) != 'failed':
+        _OUTCOMES[report.nodeid] = report.outcome
+
+
+def pytest_sessionfinish(session):
+    """Hook to write steps trace."""
+    path = session.config.getoption('steps_trace')
+    if not path:
+        return
+
+    slaveinput = getattr(session.config, 'slaveinput', None)
+    if slaveinput:  # each xdist worker writes own file
+        root, ext = os.path.splitext(path)
+        path = '{}.{}{}'.format(root, slaveinput['slaveid'], ext)
+    elif not logger.TRACER.events:  # xdist master doesn't run tests
+        return
+
+    logger.TRACER.dump(path)
@@ -22,11 +22,17 @@ import tempfile
 import time
 
 from hamcrest import assert_that, is_in  # noqa H301
-import scapy.all as scapy
 
+from stepler.third_party import pcap
 
 TYPE_ICMP_REPLY = 0
 
+# BPF filters to select packets on nodes before pcap files are downloaded
+BPF_ICMP_REPLY = 'icmp[icmptype] = icmp-echoreply'
+BPF_VXLAN = 'udp dst port 4789'
+# inner ethertype is IPv4 and inner IP protocol is ICMP
+BPF_VXLAN_ICMP = BPF_VXLAN + ' and udp[28:2] = 0x0800 and udp[39] = 1'
+
 
 def read_pcap(path, lfilter=None):
     """Read pcap file and yields packets.
@@ -37,21 +43,20 @@ def read_pcap(path, lfilter=None):
             default all packets will be returned.
 
     Yields:
-        obj: packet
+        PcapRecord: packet record
     """
-    with scapy.PcapReader(path) as reader:
-        for packet in filter(lfilter, reader):
-            yield packet
+    for packet in filter(lfilter, pcap.read_records(path)):
+        yield packet
 
 
 def filter_icmp(packet):
     """Returns True if packet contains ICMP layer."""
-    return scapy.ICMP in packet
+    return packet.icmp_type is not None
 
 
 def filter_vxlan(packet):
     """Returns True if packet contains VxLAN layer."""
-    return scapy.VXLAN in packet
+    return packet.vni is not None
 
 
 @contextlib.contextmanager
@@ -105,15 +110,11 @@ def get_last_ping_reply_ts(path):
     If there are no replies in packets - it returns None.
 
     Args:
-        packets (list): list packets
+        path (str): path to pcap file
 
     Returns:
         float|None: last ICMP reply timestamp or None
     """
-    last_replied_ts = None
-    for packet in read_pcap(path, lfilter=filter_icmp):
-        if not filter_icmp(packet):
-            continue
-        if packet[scapy.ICMP].type == TYPE_ICMP_REPLY:
-            last_replied_ts = max(last_replied_ts, packet.time)
-    return last_replied_ts
+    replies_ts = [packet.time for packet in read_pcap(path)
+                  if packet.icmp_type == TYPE_ICMP_REPLY]
+    return max(replies_ts) if replies_ts else None
@@ -17,11 +17,11 @@ Utils
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import email.utils
 import hashlib
 import inspect
 import logging
 import multiprocessing as mp
+from multiprocessing import pool as mp_pool
 import os
 import random
 import tempfile
@@ -29,10 +29,11 @@ import uuid
 
 import attrdict
 from hamcrest import equal_to
-import requests
 import six
 
 from stepler.third_party import context
+from stepler.third_party import download_cache
+from stepler.third_party import logger
 from stepler.third_party import waiter
 
 
@@ -41,6 +42,8 @@ if six.PY3:
 
 LOGGER = logging.getLogger(__name__)
 
+_DOWNLOAD_CACHE = None
+
 __all__ = [
     'AttrDict',
     'generate_ids',
@@ -218,6 +221,9 @@ def generate_ips(ip_start=1, ip_end=254, count=1):
 def get_file_path(url, name=None):
     """Download file by URL to local cached storage.
 
+    Downloaded file is shared between processes and is revalidated with
+    server once per process. See :mod:`stepler.third_party.download_cache`.
+
     Arguments:
         url (str): URL of file location.
         name (str|None): file name.
@@ -229,48 +235,16 @@ def get_file_path(url, name=None):
     # configured values. We hack it for usability.
     from stepler import config
 
-    def _get_file_name(url):
-        keepcharacters = (' ', '.', '_', '-')
-        filename = url.rsplit('/')[-1]
-        return "".join(c for c in filename
-                       if c.isalnum() or c in keepcharacters).rstrip()
+    global _DOWNLOAD_CACHE
 
     if os.path.isfile(url):
         return url
 
-    if not os.path.exists(config.TEST_IMAGE_PATH):
-        try:
-            os.makedirs(config.TEST_IMAGE_PATH)
-        except Exception as e:
-            LOGGER.warning("Can't make dir for files: {}".format(e))
-            return None
-
-    if not name:
-        name = _get_file_name(url)
-
-    file_path = os.path.join(config.TEST_IMAGE_PATH, name)
-    headers = {}
-    if os.path.exists(file_path):
-        file_date = os.path.getmtime(file_path)
-        headers['If-Modified-Since'] = email.utils.formatdate(file_date,
-                                                              usegmt=True)
-
-    response = requests.get(url, stream=True, headers=headers)
-
-    if response.status_code == 304:
-        LOGGER.info("Image file is up to date")
-    elif response.status_code == 200:
-        LOGGER.info("Start downloading image")
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(65536):
-                f.write(chunk)
-        LOGGER.info("Image downloaded")
-    else:
-        LOGGER.warning("Can't get fresh image. HTTP status code is "
-                       "{0.status_code}".format(response))
+    if _DOWNLOAD_CACHE is None:
+        _DOWNLOAD_CACHE = download_cache.DownloadCache(
+            config.TEST_IMAGE_PATH, max_size=config.TEST_IMAGE_CACHE_MAX_SIZE)
 
-    response.close()
-    return file_path
+    return _DOWNLOAD_CACHE.get(url, name=name)
 
 
 def get_unwrapped_func(func):
@@ -421,6 +395,43 @@ def grouper(iterable, chunk_size):
         yield chunk
 
 
+def parallel_map(func, iterable, workers=10):
+    """Call function for each item concurrently in threads.
+
+    Example:
+        parallel_map(lambda node: node.get_ips(), nodes) --> [ips1, ips2]
+
+    Args:
+        func (function): function to call with each item
+        iterable (iterable): items to process
+        workers (int, optional): max count of threads
+
+    Returns:
+        list: function results in order of items
+
+    Raises:
+        Exception: first exception raised by function after all items are
+            processed
+    """
+    items = list(iterable)
+    if not items:
+        return []
+
+    # steps called in threads are traced as children of current step
+    parent = logger.TRACER.current
+
+    def _call(item):
+        with logger.TRACER.bind(parent):
+            return func(item)
+
+    pool = mp_pool.ThreadPool(min(len(items), workers))
+    try:
+        return pool.map(_call, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
 def check_ssh_connection_establishment(server_ssh, must_work=True,
                                        timeout=0):
     """Function to check that ssh connection can be established.
@@ -444,4 +455,5 @@ def check_ssh_connection_establishment(server_ssh, must_work=True,
             server_ssh.check(), equal_to(must_work), err_msg)
 
     waiter.wait(_check_ssh_connection_establishment,
-                timeout_seconds=timeout)
+                timeout_seconds=timeout,
+                sleep_seconds=waiter.FAST_BACKOFF)
@@ -17,16 +17,136 @@ Waiter
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import functools
+import random
 import sys
+import threading
+import time
 
 from hamcrest import assert_that
 import six
-import timeout_decorator
 import waiting
 
 from stepler.third_party import logger
 
+__all__ = [
+    'Backoff',
+    'ExpectationError',
+    'FAST_BACKOFF',
+    'PredicateTimeout',
+    'SLOW_BACKOFF',
+    'TimeoutExpired',
+    'expect_that',
+    'get_stats',
+    'reset_stats',
+    'wait',
+    'wait_resources',
+]
+
+
+class Backoff(collections.namedtuple(
+        'Backoff', ['initial', 'maximum', 'multiplier', 'jitter'])):
+    """Polling intervals policy.
+
+    Interval starts with ``initial`` seconds and is multiplied by
+    ``multiplier`` after each poll, but isn't greater than ``maximum``.
+    Each interval is randomly changed by ``jitter`` fraction, so concurrent
+    waiters don't poll API synchronously.
+    """
+
+    def __new__(cls, initial, maximum=None, multiplier=1, jitter=0):
+        """Constructor."""
+        return super(Backoff, cls).__new__(cls, initial, maximum, multiplier,
+                                           jitter)
+
+    @classmethod
+    def from_value(cls, value):
+        """Make backoff from ``sleep_seconds`` value.
+
+        Args:
+            value (float|tuple|Backoff): polling interval, or tuple
+                ``(initial, maximum[, multiplier])`` like in ``waiting``
+                library (multiplier is 2 by default), or backoff itself
+
+        Returns:
+            Backoff: backoff policy
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, (tuple, list)):
+            initial, maximum = value[:2]
+            multiplier = value[2] if len(value) > 2 else 2
+            return cls(initial, maximum, multiplier)
+        return cls(value)
+
+    def intervals(self):
+        """Generate polling intervals.
+
+        Yields:
+            float: seconds to sleep before next poll
+        """
+        interval = self.initial
+        while True:
+            yield max(0, interval * (1 + random.uniform(-self.jitter,
+                                                        self.jitter)))
+            interval *= self.multiplier
+            if self.maximum is not None:
+                interval = min(interval, self.maximum)
+
+
+# default policy: frequent polls at start, rare polls for long operations
+DEFAULT_BACKOFF = Backoff(0.5, maximum=5, multiplier=1.5, jitter=0.1)
+# for fast operations, like ssh connection or port opening
+FAST_BACKOFF = Backoff(0.2, maximum=2, multiplier=1.5, jitter=0.1)
+# for slow operations, like image import or node reboot
+SLOW_BACKOFF = Backoff(2, maximum=30, multiplier=1.5, jitter=0.1)
+
+
+class _Stats(object):
+    """Thread-safe statistics of waitings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def add(self, name, polls, elapsed, success):
+        with self._lock:
+            stats = self._data.setdefault(name, {
+                'calls': 0, 'timeouts': 0, 'polls': 0,
+                'elapsed': 0., 'max_elapsed': 0.})
+            stats['calls'] += 1
+            stats['timeouts'] += not success
+            stats['polls'] += polls
+            stats['elapsed'] += elapsed
+            stats['max_elapsed'] = max(stats['max_elapsed'], elapsed)
+
+    def get(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._data.items()}
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+_STATS = _Stats()
+
+
+def get_stats():
+    """Get statistics of waitings made by current process.
+
+    Returns:
+        dict: waiting name -> dict with count of ``calls``, ``timeouts``,
+            ``polls`` and total and max ``elapsed`` seconds
+    """
+    return _STATS.get()
+
+
+def reset_stats():
+    """Reset statistics of waitings."""
+    _STATS.reset()
+
 
 @six.python_2_unicode_compatible
 class ExpectationError(Exception):
@@ -68,6 +188,47 @@ class TimeoutExpired(Exception):
 class PredicateTimeout(Exception):
     """Predicate timeout exception class."""
 
+    def __init__(self, message, thread=None):
+        super(PredicateTimeout, self).__init__(message)
+        self.thread = thread
+
+
+def _call_with_timeout(func, timeout):
+    """Call function and raise PredicateTimeout if it's not done in time.
+
+    Function is called in separate daemon thread, so it works without
+    signals in any thread. Function which isn't done in time isn't
+    interrupted, its thread is passed with PredicateTimeout to wait it
+    before next call. Steps called by function are traced as children of
+    current step.
+    """
+    if timeout is None:
+        return func()
+
+    result = []
+    parent = logger.TRACER.current
+
+    def _target():
+        try:
+            with logger.TRACER.bind(parent):
+                result.append((True, func()))
+        except BaseException:  # pytest outcomes are BaseException too
+            result.append((False, sys.exc_info()))
+
+    thread = threading.Thread(target=_target, name='waiter-predicate')
+    thread.daemon = True
+    thread.start()
+    thread.join(max(0, timeout))
+
+    if not result:
+        raise PredicateTimeout(
+            "Predicate isn't done in {} seconds".format(timeout), thread)
+
+    ok, value = result[0]
+    if not ok:
+        six.reraise(*value)
+    return value
+
 
 @logger.log
 def wait(predicate,
@@ -75,12 +236,17 @@ def wait(predicate,
          kwargs=None,
          expected_exceptions=(),
          predicate_timeout=None,
-         **wait_kwargs):
+         timeout_seconds=None,
+         sleep_seconds=DEFAULT_BACKOFF,
+         waiting_for=None,
+         on_poll=None):
     """Wait that predicate execution returns non-false result.
 
     It catches all raised ExpectationError and uses last exception to construct
     TimeoutException. It also can pass arguments to predicate.
 
+    Waiting doesn't use signals, so it can be called from any thread.
+
     Example:
         >>> def predicate(foo, bar='baz'):
         ...    expect_that(foo, equal_to(bar))
@@ -102,14 +268,16 @@ def wait(predicate,
 
     Args:
         predicate (function): predicate to wait execution result
-        timeout_seconds (int): seconds to wait result
-        sleep_seconds (float): polling time between predicate executions
-        multiplier (int): coefficient to multiply polling time
+        timeout_seconds (int): seconds to wait result. Predicate isn't
+            polled again after this deadline.
+        sleep_seconds (float|tuple|Backoff): polling interval or backoff
+            policy, ex: ``waiter.FAST_BACKOFF``
         expected_exceptions (tuple): predicate exceptions which will be omitted
             during waiting.
         predicate_timeout (int): max predicate execution timeout. Equals to
             timeout_seconds by default.
         waiting_for (str): custom waiting message.
+        on_poll (function): function to call after each poll
 
     Returns:
         tuple: result of predicate execution in format:
@@ -123,8 +291,11 @@ def wait(predicate,
     raised_exceptions = []
     args = args or ()
     kwargs = kwargs or {}
-    predicate_timeout = predicate_timeout or wait_kwargs.get('timeout_seconds',
-                                                             60)
+    # predicate name without address is used to aggregate statistics
+    stats_name = waiting_for or '{}.{}'.format(
+        getattr(predicate, '__module__', None),
+        getattr(predicate, '__name__', type(predicate).__name__))
+    waiting_for = waiting_for or str(predicate)
 
     if isinstance(expected_exceptions, tuple):
         expected_exceptions += (ExpectationError, PredicateTimeout)
@@ -136,24 +307,155 @@ def wait(predicate,
         raise ValueError('expected_exceptions should be tuple or '
                          'Exception subclass')
 
-    @functools.wraps(predicate)
-    def wrapper():
+    # zero timeout means that predicate execution isn't limited
+    predicate_timeout = predicate_timeout or timeout_seconds or None
+
+    start = time.time()
+    deadline = None if timeout_seconds is None else start + timeout_seconds
+    intervals = Backoff.from_value(sleep_seconds).intervals()
+    polls = 0
+    # thread of timed out predicate call, which is still running
+    running_thread = None
+
+    while True:
+        if running_thread is not None:
+            # predicate calls must not overlap, so wait previous one
+            running_thread.join(
+                None if deadline is None else max(0, deadline - time.time()))
+            if running_thread.is_alive():
+                break
+            running_thread = None
+
+        polls += 1
         try:
-            _predicate = timeout_decorator.timeout(
-                predicate_timeout,
-                timeout_exception=PredicateTimeout)(predicate)
-            return _predicate(*args, **kwargs)
+            result = _call_with_timeout(
+                functools.partial(predicate, *args, **kwargs),
+                predicate_timeout)
+        except PredicateTimeout as e:
+            running_thread = e.thread
+            raised_exceptions.append(e)
+            result = False
         except expected_exceptions as e:
             raised_exceptions.append(e)
-            return False
+            result = False
 
-    try:
-        return waiting.wait(wrapper, **wait_kwargs)
-    except waiting.TimeoutExpired as e:
-        ex = TimeoutExpired(e)
-        if raised_exceptions:
-            ex.message += "\n{0}: {1}".format(
-                type(raised_exceptions[-1]).__name__, raised_exceptions[-1])
-        else:
-            ex.message += "\nNo exception raised during predicate executing"
-        raise ex
+        if on_poll is not None:
+            on_poll()
+
+        now = time.time()
+        if result:
+            _STATS.add(stats_name, polls, now - start, success=True)
+            return result
+
+        if deadline is not None and now >= deadline:
+            break
+
+        sleep = next(intervals)
+        if deadline is not None:
+            sleep = min(sleep, deadline - now)
+        time.sleep(max(0, sleep))
+
+    _STATS.add(stats_name, polls, time.time() - start, success=False)
+
+    ex = TimeoutExpired(waiting.TimeoutExpired(timeout_seconds, waiting_for))
+    if raised_exceptions:
+        ex.message += "\n{0}: {1}".format(
+            type(raised_exceptions[-1]).__name__, raised_exceptions[-1])
+    else:
+        ex.message += "\nNo exception raised during predicate executing"
+    raise ex
+
+
+@logger.log
+def wait_resources(list_resources,
+                   resource_ids,
+                   predicate,
+                   get_resource=None,
+                   expected_exceptions=(),
+                   predicate_timeout=None,
+                   **wait_kwargs):
+    """Wait that predicate returns non-false result for each resource.
+
+    Resources are polled together: ``list_resources`` is called only once per
+    polling iteration, and each listed resource is passed to predicate. If
+    resource is absent in listing, it's requested with ``get_resource``, and
+    predicate gets ``None`` if resource doesn't exist. Resources which
+    already satisfy predicate aren't checked again.
+
+    Example:
+        >>> def predicate(server):
+        ...     return expect_that(server.status, equal_to('ACTIVE'))
+        >>> wait_resources(nova_client.servers.list,
+        ...                [server.id for server in servers],
+        ...                predicate, timeout_seconds=60)
+
+        TimeoutExpired: Timeout of 60 seconds expired waiting for
+        <function _check_resources at 0x7f7798622c08>
+        ExpectationError: 1c2ad8b3-0a40-4bd8-9beb-b3b83b8c4b08:
+        Expected: 'ACTIVE'
+             but: was 'BUILD'
+
+    Args:
+        list_resources (function): function to list resources; its result
+            must contain objects with ``id`` attribute
+        resource_ids (list): ids of resources to wait for
+        predicate (function): predicate to call with each listed resource
+        get_resource (function, optional): function to get resource absent in
+            listing by its id, ex: resource of other project which isn't
+            listed for admin; it must return ``None`` if resource doesn't
+            exist. By default resource absent in listing is ``None``.
+        expected_exceptions (tuple): predicate exceptions which will be omitted
+            during waiting.
+        predicate_timeout (int): max time of one polling iteration. Equals to
+            timeout_seconds by default.
+        **wait_kwargs: ``wait`` keyword arguments, like ``timeout_seconds``
+
+    Returns:
+        collections.OrderedDict: last listed resources (or None for absent
+            ones) by their ids, in order of ``resource_ids``
+
+    Raises:
+        TimeoutExpired: if predicate has false value for any resource after
+            timeout; error message contains status of each pending resource
+    """
+    __tracebackhide__ = True
+    resource_ids = list(resource_ids)
+    if not resource_ids:
+        return collections.OrderedDict()
+
+    pending_ids = set(resource_ids)
+    resources = {}
+
+    def _check_resources():
+        listed = {resource.id: resource for resource in list_resources()}
+        errors = []
+        for resource_id in resource_ids:
+            if resource_id not in pending_ids:
+                continue
+
+            resource = listed.get(resource_id)
+            if resource is None and get_resource is not None:
+                resource = get_resource(resource_id)
+            try:
+                if not predicate(resource):
+                    errors.append(u"{}: predicate result is false".format(
+                        resource_id))
+                    continue
+            except ExpectationError as e:
+                errors.append(u"{}: {}".format(resource_id, e))
+                continue
+
+            resources[resource_id] = resource
+            pending_ids.remove(resource_id)
+
+        if pending_ids:
+            raise ExpectationError(u"\n".join(errors))
+
+        return collections.OrderedDict(
+            (resource_id, resources[resource_id])
+            for resource_id in resource_ids)
+
+    return wait(_check_resources,
+                expected_exceptions=expected_exceptions,
+                predicate_timeout=predicate_timeout,
+                **wait_kwargs)
@@ -0,0 +1,200 @@
+"""
+--------------------
+API client unittests
+--------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import (assert_that, empty, equal_to, is_, is_not,
+                      same_instance)  # noqa H301
+import mock
+import pytest
+
+from stepler import base
+from stepler import config
+from stepler.glance.api_clients import v1
+from stepler.glance.api_clients import v2
+
+ENDPOINT = 'http://example.com:8776/v2'
+
+
+class ApiClient(base.BaseApiClient):
+
+    @property
+    def _endpoint(self):
+        return ENDPOINT
+
+    def volumes_list(self):
+        return self._get('/volumes')
+
+    def snapshots_list(self):
+        return self._get('/snapshots')
+
+
+@pytest.fixture
+def keystone_session():
+    session = mock.Mock()
+    session.get_auth_headers.side_effect = [{'X-Auth-Token': 'token-1'},
+                                            {'X-Auth-Token': 'token-2'}]
+    return session
+
+
+@pytest.fixture
+def http_session():
+    http_session = mock.Mock(responses=[], tokens=[])
+
+    def _request(method, url, headers=None, **kwargs):
+        # headers dict is updated by client, so token is copied
+        http_session.tokens.append(headers['X-Auth-Token'])
+        if http_session.responses:
+            return http_session.responses.pop(0)
+        return mock.Mock(status_code=200)
+
+    http_session.request.side_effect = _request
+    with mock.patch.object(base, '_get_http_session',
+                           return_value=http_session):
+        yield http_session
+
+
+@mock.patch.dict(base._HTTP_SESSIONS, clear=True)
+def test_http_session_per_endpoint():
+    """Verify that one HTTP session is shared by clients of endpoint."""
+    http_session = base._get_http_session(ENDPOINT)
+
+    assert_that(base._get_http_session(ENDPOINT), is_(http_session))
+    assert_that(base._get_http_session('http://example.com:9292'),
+                is_not(http_session))
+    assert_that(http_session.get_adapter(ENDPOINT)._pool_maxsize,
+                equal_to(config.API_POOL_SIZE))
+
+
+def test_token_is_cached(keystone_session, http_session):
+    """Verify that auth token is got once for requests of all namespaces."""
+    client = ApiClient(keystone_session)
+
+    client.volumes.list()
+    client.snapshots.list()
+
+    assert_that(keystone_session.get_auth_headers.call_count, equal_to(1))
+    assert_that(http_session.tokens, equal_to(['token-1', 'token-1']))
+    http_session.request.assert_called_with(
+        'GET', ENDPOINT + '/snapshots', headers=mock.ANY, params=None)
+
+
+def test_token_is_expired(keystone_session, http_session):
+    """Verify that auth token is got again after cache time."""
+    client = ApiClient(keystone_session)
+
+    with mock.patch('time.time', return_value=1000):
+        client.volumes.list()
+    with mock.patch('time.time',
+                    return_value=1001 + config.API_TOKEN_CACHE_TIME):
+        client.volumes.list()
+
+    assert_that(http_session.tokens, equal_to(['token-1', 'token-2']))
+
+
+def test_unauthorized_request_is_retried_once(keystone_session,
+                                              http_session):
+    """Verify that request rejected with 401 is retried once with new token."""
+    http_session.responses = [mock.Mock(status_code=401)]
+    client = ApiClient(keystone_session)
+
+    response = client.volumes.list()
+
+    assert_that(response.status_code, equal_to(200))
+    assert_that(http_session.tokens, equal_to(['token-1', 'token-2']))
+    keystone_session.invalidate.assert_called_once_with()
+
+
+def test_unauthorized_retry_isnt_repeated(keystone_session, http_session):
+    """Verify that request rejected with 401 twice isn't retried again."""
+    http_session.responses = [mock.Mock(status_code=401),
+                              mock.Mock(status_code=401)]
+    client = ApiClient(keystone_session)
+
+    response = client.volumes.list()
+
+    assert_that(response.status_code, equal_to(401))
+    assert_that(http_session.request.call_count, equal_to(2))
+
+
+def test_head_doesnt_follow_redirects(keystone_session, http_session):
+    """Verify that HEAD request doesn't follow redirects by default."""
+    client = ApiClient(keystone_session)
+
+    client._head('/volumes/1')
+
+    http_session.request.assert_called_once_with(
+        'HEAD', ENDPOINT + '/volumes/1', headers=mock.ANY, params=None,
+        allow_redirects=False)
+
+
+def test_namespace_class_is_cached():
+    """Verify that namespace class is created once per client class."""
+    client_1 = v1.ApiClientV1(mock.Mock())
+    client_2 = v1.ApiClientV1(mock.Mock())
+
+    assert_that(client_1.images, same_instance(client_1.images))
+    assert_that(type(client_1.images), same_instance(type(client_2.images)))
+    assert_that(type(client_1.images), same_instance(
+        v1.ApiClientV1._get_namespace_class('images')))
+    # namespaces are registered per client class
+    assert_that(v2.ApiClientV2._namespaces_methods, empty())
+    assert_that(v2.ApiClientV2._namespaces_classes, empty())
+
+
+def test_namespace_methods_are_bound(keystone_session, http_session):
+    """Verify that namespace methods are bound to owner client data."""
+    keystone_session.get_endpoint.return_value = 'http://example.com:9292/'
+    client = v1.ApiClientV1(keystone_session)
+
+    update = client.images.update
+
+    assert_that(update.__func__,
+                same_instance(v1.ApiClientV1.__dict__['images_update']))
+    assert_that(update.__self__._session, same_instance(keystone_session))
+    assert_that(update.__self__._cache, same_instance(client._cache))
+
+    update('image-1', status='active')
+
+    http_session.request.assert_called_once_with(
+        'PUT', 'http://example.com:9292/v1/images/image-1', headers=mock.ANY,
+        data=None)
+    assert_that(client._cache['endpoint'],
+                equal_to('http://example.com:9292'))
+
+
+def test_clients_dont_share_state(http_session):
+    """Verify that namespace clients of different clients are isolated."""
+    session_1 = mock.Mock(**{
+        'get_endpoint.return_value': 'http://glance-1',
+        'get_auth_headers.return_value': {'X-Auth-Token': 'token-1'}})
+    session_2 = mock.Mock(**{
+        'get_endpoint.return_value': 'http://glance-2',
+        'get_auth_headers.return_value': {'X-Auth-Token': 'token-2'}})
+    client_1 = v1.ApiClientV1(session_1)
+    client_2 = v1.ApiClientV1(session_2)
+
+    client_1.images.update('image-1')
+    client_2.images.update('image-1')
+
+    assert_that(client_1.images, is_not(same_instance(client_2.images)))
+    assert_that(client_1.images._cache,
+                is_not(same_instance(client_2.images._cache)))
+    assert_that([call[0][1] for call in http_session.request.call_args_list],
+                equal_to(['http://glance-1/v1/images/image-1',
+                          'http://glance-2/v1/images/image-1']))
+    assert_that(http_session.tokens, equal_to(['token-1', 'token-2']))
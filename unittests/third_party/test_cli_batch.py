@@ -0,0 +1,70 @@
+"""
+----------------------------
+CLI commands batch unittests
+----------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+
+from hamcrest import (assert_that, contains, contains_string, equal_to,
+                      is_not)  # noqa H301
+
+from stepler.cli_clients.steps import base
+
+MARKER = 'f0e4c2f76c58916ec258f246851bea09'
+
+
+def _execute(script):
+    return subprocess.check_output(['bash', '-c', script]).decode()
+
+
+def test_parse_batch_output():
+    """Verify that batch output is split to results of each command."""
+    output = ('\n{0} 0 0\nfirst\nline\n\n{0}\n'
+              '\n{0} 1 2\n\n{0}\nerror\n'
+              '\n{0} end\n').format(MARKER)
+    results = base._parse_batch_output(output, MARKER)
+    assert_that(results, contains((0, 'first\nline', ''),
+                                  (2, '', 'error')))
+
+
+def test_batch_results_are_ordered():
+    """Verify that results are in order of commands, not of finishing."""
+    cmds = ['sleep 0.5; echo slow', 'echo fast; echo error >&2; exit 3']
+    script = base._get_batch_script(cmds, MARKER)
+    results = base._parse_batch_output(_execute(script), MARKER)
+    assert_that(results, contains((0, 'slow', ''),
+                                  (3, 'fast', 'error')))
+
+
+def test_batch_command_without_output():
+    """Verify that command without output is parsed."""
+    script = base._get_batch_script(['true', 'printf ""'], MARKER)
+    results = base._parse_batch_output(_execute(script), MARKER)
+    assert_that(results, equal_to([(0, '', ''), (0, '', '')]))
+
+
+def test_batch_token_is_used_for_openstack_client():
+    """Verify that token is passed to openstack client commands only."""
+    cmds = ['openstack server list', 'nova list', 'glance image-list',
+            'cinder list', 'neutron net-list', 'ironic node-list']
+    script = base._get_batch_script(cmds, MARKER, use_token=True)
+    lines = script.splitlines()
+    assert_that(lines[1], contains_string(base.BATCH_TOKEN_CMD))
+    assert_that(lines[2], contains_string(base.BATCH_TOKEN_ENV + cmds[0]))
+    # legacy clients need endpoint URL to be used with token
+    for line in lines[3:len(cmds) + 2]:
+        assert_that(line, is_not(contains_string('OS_TOKEN')))
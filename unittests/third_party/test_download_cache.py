@@ -0,0 +1,151 @@
+"""
+------------------------
+Download cache unittests
+------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+
+from hamcrest import assert_that, equal_to, has_entries  # noqa H301
+import mock
+import pytest
+
+from stepler.third_party import download_cache
+
+
+def _response(content=b'', status_code=200, headers=None):
+    response = mock.Mock(status_code=status_code,
+                         ok=status_code < 400,
+                         headers=headers or {})
+    response.iter_content.return_value = [content]
+    return response
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return download_cache.DownloadCache(str(tmpdir))
+
+
+@mock.patch('requests.get')
+def test_download(get, cache):
+    get.return_value = _response(b'image', headers={'ETag': '"1"'})
+
+    file_path = cache.get('http://example.com/cirros.img')
+
+    assert_that(os.path.basename(file_path), equal_to('cirros.img'))
+    with open(file_path, 'rb') as f:
+        assert_that(f.read(), equal_to(b'image'))
+    assert_that(os.path.exists(file_path + '.part'), equal_to(False))
+    assert_that(cache._read_manifest(file_path),
+                has_entries(etag='"1"', size=5, complete=True))
+
+
+@mock.patch('requests.head')
+@mock.patch('requests.get')
+def test_file_is_verified_once_per_process(get, head, tmpdir):
+    get.return_value = _response(b'image', headers={'ETag': '"1"'})
+    head.return_value = _response(status_code=304)
+    url = 'http://example.com/cirros.img'
+
+    download_cache.DownloadCache(str(tmpdir)).get(url)
+    cache = download_cache.DownloadCache(str(tmpdir))
+    cache.get(url)
+    cache.get(url)
+
+    assert_that(get.call_count, equal_to(1))
+    assert_that(head.call_count, equal_to(1))
+    assert_that(head.call_args[1]['headers'],
+                equal_to({'If-None-Match': '"1"'}))
+
+
+@mock.patch('requests.get')
+def test_resume_download(get, cache, tmpdir):
+    file_path = str(tmpdir.join('cirros.img'))
+    cache._write_manifest(file_path, {'url': 'http://example.com/cirros.img',
+                                      'etag': '"1"',
+                                      'complete': False})
+    with open(file_path + '.part', 'wb') as f:
+        f.write(b'ima')
+    get.return_value = _response(b'ge', status_code=206,
+                                 headers={'ETag': '"1"',
+                                          'Content-Length': '2'})
+
+    cache.get('http://example.com/cirros.img')
+
+    assert_that(get.call_args[1]['headers'],
+                equal_to({'Range': 'bytes=3-', 'If-Range': '"1"'}))
+    with open(file_path, 'rb') as f:
+        assert_that(f.read(), equal_to(b'image'))
+    assert_that(cache._read_manifest(file_path)['sha256'],
+                equal_to(download_cache._get_sha256(file_path)))
+
+
+@mock.patch('requests.get')
+def test_evict_least_recently_used(get, tmpdir):
+    cache = download_cache.DownloadCache(str(tmpdir), max_size=8)
+
+    get.return_value = _response(b'image1')
+    file_path_1 = cache.get('http://example.com/1.img')
+    get.return_value = _response(b'image2')
+    file_path_2 = cache.get('http://example.com/2.img')
+
+    assert_that(os.path.exists(file_path_1), equal_to(False))
+    assert_that(os.path.exists(file_path_2), equal_to(True))
+
+
+@mock.patch('requests.get')
+def test_unsatisfiable_range_restarts_download(get, cache, tmpdir):
+    file_path = str(tmpdir.join('cirros.img'))
+    cache._write_manifest(file_path, {'url': 'http://example.com/cirros.img',
+                                      'etag': '"1"',
+                                      'complete': False})
+    with open(file_path + '.part', 'wb') as f:
+        f.write(b'image')
+    get.side_effect = [_response(status_code=416),
+                       _response(b'image', headers={'ETag': '"1"'})]
+
+    cache.get('http://example.com/cirros.img')
+
+    assert_that(get.call_args, equal_to(
+        mock.call('http://example.com/cirros.img', stream=True)))
+    with open(file_path, 'rb') as f:
+        assert_that(f.read(), equal_to(b'image'))
+    assert_that(cache._read_manifest(file_path),
+                has_entries(size=5, complete=True))
+
+
+def test_different_files_are_got_concurrently(cache):
+    started = threading.Event()
+    finish = threading.Event()
+
+    def _get(url, **kwargs):
+        if url.endswith('slow.img'):
+            started.set()
+            finish.wait(5)
+        return _response(b'image')
+
+    with mock.patch('requests.get', side_effect=_get):
+        thread = threading.Thread(target=cache.get,
+                                  args=('http://example.com/slow.img',))
+        thread.start()
+        started.wait(5)
+        try:
+            cache.get('http://example.com/fast.img')
+            assert_that(thread.is_alive(), equal_to(True))
+        finally:
+            finish.set()
+            thread.join()
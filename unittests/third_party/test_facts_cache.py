@@ -0,0 +1,64 @@
+"""
+---------------------
+Facts cache unittests
+---------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import assert_that, is_  # noqa H301
+import mock
+
+from stepler.third_party import facts_cache
+
+
+def test_get_calls_getter_once():
+    """Verify that fact value is memoized."""
+    cache = facts_cache.FactsCache()
+    getter = mock.Mock(return_value='vxlan')
+
+    assert_that(cache.get('network_type', getter), is_('vxlan'))
+    assert_that(cache.get('network_type', getter), is_('vxlan'))
+    assert_that(getter.call_count, is_(1))
+
+
+def test_get_passes_args_to_getter():
+    """Verify that getter args are passed."""
+    cache = facts_cache.FactsCache()
+    getter = mock.Mock(return_value=3)
+
+    cache.get('count', getter, 1, foo='bar')
+    getter.assert_called_once_with(1, foo='bar')
+
+
+def test_invalidate_fact():
+    """Verify that only specified fact is invalidated."""
+    cache = facts_cache.FactsCache()
+    cache.set('foo', 1)
+    cache.set('bar', 2)
+
+    cache.invalidate('foo')
+    assert_that('foo' in cache, is_(False))
+    assert_that('bar' in cache, is_(True))
+
+
+def test_invalidate_all_facts():
+    """Verify that all facts are invalidated without names."""
+    cache = facts_cache.FactsCache()
+    cache.set('foo', 1)
+    cache.set('bar', 2)
+
+    cache.invalidate()
+    assert_that('foo' in cache, is_(False))
+    assert_that('bar' in cache, is_(False))
@@ -0,0 +1,124 @@
+"""
+------------------------
+Lease registry unittests
+------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from hamcrest import assert_that, equal_to, is_not, starts_with  # noqa H301
+import mock
+import pytest
+
+from stepler.third_party import lease_registry
+
+
+@pytest.fixture
+def registry(tmpdir):
+    return lease_registry.LeaseRegistry(str(tmpdir.join('leases.json')))
+
+
+def test_last_lease_finalizes_resource(registry):
+    factory = mock.Mock(side_effect=lambda value: value or 'image-1')
+    finalizer = mock.Mock()
+
+    value_1, lease_1 = registry.acquire('cirros', factory)
+    value_2, lease_2 = registry.acquire('cirros', factory)
+
+    assert_that(value_1, equal_to('image-1'))
+    assert_that(value_2, equal_to('image-1'))
+    factory.assert_has_calls([mock.call(None), mock.call('image-1')])
+
+    assert_that(registry.release('cirros', lease_1, finalizer),
+                equal_to(False))
+    assert_that(finalizer.called, equal_to(False))
+
+    assert_that(registry.release('cirros', lease_2, finalizer),
+                equal_to(True))
+    finalizer.assert_called_once_with('image-1')
+
+
+def test_dead_process_lease_is_dropped(registry):
+    with open(registry.path, 'w') as f:
+        json.dump({'cirros': {
+            'value': 'image-1',
+            'leases': {'dead': {'host': registry.host, 'pid': 2 ** 22 + 1}},
+        }}, f)
+    finalizer = mock.Mock()
+
+    _, lease = registry.acquire('cirros', lambda value: value)
+    registry.release('cirros', lease, finalizer)
+
+    finalizer.assert_called_once_with('image-1')
+
+
+def test_failed_factory_doesnt_take_lease(registry):
+    factory = mock.Mock(side_effect=RuntimeError)
+
+    with pytest.raises(RuntimeError):
+        registry.acquire('cirros', factory)
+
+    with open(registry.path) as f:
+        assert_that(json.load(f), equal_to({}))
+
+
+def test_process_leases_are_released(registry):
+    finalizer = mock.Mock()
+    registry.acquire('cirros', lambda value: 'image-1')
+    registry.acquire('cirros', lambda value: value)
+    registry.acquire('ubuntu', lambda value: 'image-2')
+    with open(registry.path) as f:
+        data = json.load(f)
+    data['ubuntu']['leases']['other'] = {'host': 'other', 'pid': 1}
+    with open(registry.path, 'w') as f:
+        json.dump(data, f)
+
+    registry.release_process_leases(finalizer)
+
+    finalizer.assert_called_once_with('image-1')
+    with open(registry.path) as f:
+        assert_that(list(json.load(f)['ubuntu']['leases']),
+                    equal_to(['other']))
+
+
+def test_orphans_are_finalized(registry):
+    with open(registry.path, 'w') as f:
+        json.dump({
+            'cirros': {
+                'value': 'image-1',
+                'leases': {'dead': {'host': registry.host,
+                                    'pid': 2 ** 22 + 1}},
+            },
+            'ubuntu': {
+                'value': 'image-2',
+                'leases': {'other': {'host': 'other', 'pid': 1}},
+            },
+        }, f)
+    finalizer = mock.Mock()
+
+    registry.finalize_orphans(finalizer)
+
+    finalizer.assert_called_once_with('image-1')
+    with open(registry.path) as f:
+        assert_that(list(json.load(f)), equal_to(['ubuntu']))
+
+
+def test_scope_depends_on_path(tmpdir):
+    registry_1 = lease_registry.LeaseRegistry(str(tmpdir.join('1.json')))
+    registry_2 = lease_registry.LeaseRegistry(str(tmpdir.join('2.json')))
+
+    assert_that(registry_1.scope, is_not(equal_to(registry_2.scope)))
+    assert_that(registry_1.scope, starts_with(registry_1.host + ':'))
@@ -0,0 +1,97 @@
+"""
+--------------------
+Log cursor unittests
+--------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import subprocess
+
+from hamcrest import assert_that, contains, equal_to  # noqa H301
+import pytest
+
+from stepler.third_party import log_cursor
+
+
+def _execute(cmd):
+    return subprocess.check_output(['bash', '-c', cmd]).decode()
+
+
+def _search(cursor, keywords=None, regexes=None, non_matching=None):
+    cmd = log_cursor.build_read_command(cursor,
+                                        keywords=keywords,
+                                        regexes=regexes,
+                                        non_matching=non_matching)
+    patterns = log_cursor.get_patterns(keywords, regexes)
+    return log_cursor.parse_read_output(_execute(cmd), patterns)
+
+
+def _mark(log_file):
+    return log_cursor.parse_mark_output(
+        str(log_file),
+        _execute(log_cursor.build_mark_command(str(log_file))))
+
+
+@pytest.fixture
+def log_file(tmpdir):
+    log_file = tmpdir.join('server.log')
+    log_file.write('2017-03-28 10:00:00.000 1 ERROR old\n')
+    return log_file
+
+
+def test_new_lines_are_searched(log_file):
+    cursor = _mark(log_file)
+    log_file.write('2017-03-28 10:00:01.250 1 ERROR new\n'
+                   '2017-03-28 10:00:02.000 1 ERROR %(name)s\n'
+                   '2017-03-28 10:00:03 1 INFO Instance abc spawned\n',
+                   mode='a')
+
+    matches = _search(cursor,
+                      keywords=['ERROR', '%(name)s'],
+                      regexes=['Instance .* spawned'],
+                      non_matching='ERROR %(name)s')
+
+    assert_that([match.line for match in matches['ERROR']],
+                contains('2017-03-28 10:00:01.250 1 ERROR new'))
+    assert_that(matches['%(name)s'], equal_to([]))
+    assert_that([match.timestamp for match in matches['Instance .* spawned']],
+                contains(datetime.datetime(2017, 3, 28, 10, 0, 3)))
+
+
+def test_rotated_log_is_searched(log_file):
+    cursor = _mark(log_file)
+    log_file.write('1 ERROR before rotation\n', mode='a')
+    log_file.rename(log_file.dirpath('server.log.1'))
+    log_file.write('1 ERROR after rotation\n')
+
+    matches = _search(cursor, keywords=['ERROR'])
+
+    assert_that([match.line for match in matches['ERROR']],
+                contains('1 ERROR before rotation', '1 ERROR after rotation'))
+
+
+def test_whole_log_is_searched_without_cursor(log_file):
+    cursor = log_cursor.LogCursor(str(log_file), None, 0)
+
+    matches = _search(cursor, keywords=['ERROR'])
+
+    assert_that(len(matches['ERROR']), equal_to(1))
+
+
+def test_parse_timestamp():
+    assert_that(log_cursor.parse_timestamp('2017-03-28 10:47:40,1234567 x'),
+                equal_to(datetime.datetime(2017, 3, 28, 10, 47, 40, 123456)))
+    assert_that(log_cursor.parse_timestamp('Traceback'), equal_to(None))
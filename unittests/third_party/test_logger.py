@@ -18,10 +18,14 @@ logger helper unittests
 # limitations under the License.
 
 from functools import wraps
+import json
 
+import mock
 import pytest
 
 from stepler.third_party import logger
+from stepler.third_party import utils
+from stepler.third_party import waiter
 
 
 def dec(f):
@@ -104,3 +108,80 @@ def test_log_function_name_and_args(caplog, fn, args, kwargs, msg):
     fn = logger.log(fn)
     fn(*args, **kwargs)
     assert msg in caplog.text
+
+
+def test_log_truncates_args(caplog):
+    fn = logger.log(fn2)
+    fn('x' * 1000, list(range(1000)))
+    assert "'xxx" in caplog.text
+    assert 'x' * 300 not in caplog.text
+    assert '999' not in caplog.text
+
+
+def test_log_skips_args_formatting_without_debug():
+    class Arg(object):
+        def __repr__(self):
+            raise AssertionError('repr is called')
+
+    fn = logger.log(fn2)
+    with mock.patch.object(logger.LOGGER, 'isEnabledFor', return_value=False):
+        fn(Arg(), Arg())
+
+
+def test_tracer_records_nested_steps(tmpdir):
+    tracer = logger.StepTracer()
+    tracer.enabled = True
+    tracer.test = 'test_foo'
+
+    @logger.log
+    def inner():
+        raise ValueError()
+
+    @logger.log
+    def outer():
+        try:
+            inner()
+        except ValueError:
+            pass
+
+    with mock.patch.object(logger, 'TRACER', tracer):
+        outer()
+
+    events = {event['name']: event for event in tracer.events}
+    assert events['inner']['parent'] == 'outer'
+    assert events['inner']['outcome'] == 'ValueError'
+    assert events['outer']['parent'] == 'test_foo'
+    assert events['outer']['outcome'] == 'passed'
+    assert events['outer']['start'] <= events['inner']['start']
+    assert events['inner']['end'] <= events['outer']['end']
+
+    path = str(tmpdir.join('trace.json'))
+    tracer.dump(path)
+    with open(path) as f:
+        trace = json.load(f)
+    assert [event['name'] for event in trace['traceEvents']] == [
+        'outer', 'inner']
+
+
+def test_tracer_records_steps_of_worker_threads():
+    tracer = logger.StepTracer()
+    tracer.enabled = True
+    tracer.test = 'test_foo'
+
+    @logger.log
+    def inner(value):
+        return value
+
+    @logger.log
+    def outer():
+        utils.parallel_map(inner, [1, 2])
+        waiter.wait(inner, args=(True,), predicate_timeout=1,
+                    timeout_seconds=1)
+
+    with mock.patch.object(logger, 'TRACER', tracer):
+        outer()
+
+    parents = [(event['name'], event['parent']) for event in tracer.events]
+    assert parents.count(('inner', 'outer')) == 2
+    assert ('inner', 'wait') in parents
+    assert ('wait', 'outer') in parents
@@ -0,0 +1,107 @@
+"""
+--------------------
+Node probe unittests
+--------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import (assert_that, contains, contains_string, equal_to,
+                      has_entries)  # noqa H301
+import pytest
+
+from stepler.third_party import node_probe
+
+OUTPUT = """### stepler-probe cmdline
+BOOT_IMAGE=/boot/vmlinuz-4.4.0-47-generic ro isolcpus=1-3,5
+### stepler-probe lscpu
+CPU(s):                8
+NUMA node(s):          2
+NUMA node0 CPU(s):     0-3
+NUMA node1 CPU(s):     4-7
+### stepler-probe hugepages
+/sys/kernel/mm/hugepages/hugepages-2048kB/free_hugepages:512
+/sys/kernel/mm/hugepages/hugepages-2048kB/nr_hugepages:1024
+/sys/kernel/mm/hugepages/hugepages-1048576kB/nr_hugepages:4
+### stepler-probe numa_hugepages
+/sys/devices/system/node/node1/hugepages/hugepages-2048kB/nr_hugepages:512
+### stepler-probe numa_meminfo
+Node 0 MemTotal:        4046280 kB
+Node 0 MemFree:         1046280 kB
+Node 1 MemTotal:        4046000 kB
+### stepler-probe ip
+1: lo    inet 127.0.0.1/8 scope host lo\\       valid_lft forever
+2: eth0    inet 10.109.1.4/24 brd 10.109.1.255 scope global eth0\\       valid
+2: eth0    inet6 fe80::1/64 scope link \\       valid_lft forever
+### stepler-probe processes
+    1 /sbin/init
+ 1234 /usr/bin/python /usr/bin/nova-compute
+"""
+
+
+def test_build_command():
+    cmd = node_probe.build_command(['lscpu', 'ip'])
+    assert_that(cmd, equal_to(
+        "echo '### stepler-probe lscpu'; lscpu 2>/dev/null; "
+        "echo '### stepler-probe ip'; ip -o a 2>/dev/null; true"))
+
+
+def test_build_command_all_sections():
+    cmd = node_probe.build_command()
+    for name in node_probe.SECTIONS:
+        assert_that(cmd, contains_string('stepler-probe ' + name))
+
+
+def test_build_command_unknown_section():
+    with pytest.raises(KeyError):
+        node_probe.build_command(['unknown'])
+
+
+def test_parse_output():
+    facts = node_probe.parse_output(OUTPUT)
+
+    assert_that(facts['cmdline'], contains_string('isolcpus=1-3,5'))
+    assert_that(facts['lscpu'], has_entries({'NUMA node(s)': '2',
+                                             'NUMA node1 CPU(s)': '4-7'}))
+    assert_that(facts['hugepages'], equal_to({
+        2048: {'free': 512, 'nr': 1024},
+        1048576: {'nr': 4}}))
+    assert_that(facts['numa_hugepages'], equal_to({
+        'numa1': {2048: {'nr': 512}}}))
+    assert_that(facts['numa_meminfo'], equal_to({
+        'numa0': {'MemTotal': 4046280, 'MemFree': 1046280},
+        'numa1': {'MemTotal': 4046000}}))
+    assert_that(
+        [(ip['interface'], ip['family'], ip['address'])
+         for ip in facts['ip']],
+        contains(('lo', 'inet', '127.0.0.1'),
+                 ('eth0', 'inet', '10.109.1.4'),
+                 ('eth0', 'inet6', 'fe80::1')))
+    assert_that(facts['processes'][1], equal_to(
+        {'pid': 1234, 'args': '/usr/bin/python /usr/bin/nova-compute'}))
+
+
+def test_parse_output_empty_sections():
+    facts = node_probe.parse_output("### stepler-probe numa_hugepages\n"
+                                    "### stepler-probe ip\n")
+    assert_that(facts, equal_to({'numa_hugepages': {}, 'ip': []}))
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('0', [0]),
+    ('0,1', [0, 1]),
+    ('1-3,5', [1, 2, 3, 5]),
+])
+def test_parse_cpu_list(value, expected):
+    assert_that(node_probe.parse_cpu_list(value), equal_to(expected))
@@ -45,3 +45,28 @@ def test_parse_multiline_cells():
                 u'+------+-------+')
     table = output_parser.table(raw_data)
     assert len(table['values']) == 1
+
+
+def test_parse_listing():
+    """Test parsing of listing table."""
+    raw_data = (u'+----+--------+--------+\n'
+                u'| ID | Name   | Status |\n'
+                u'+----+--------+--------+\n'
+                u'| 1  | foo    | ACTIVE |\n'
+                u'| 2  | bar    | ERROR  |\n'
+                u'+----+--------+--------+\n')
+    assert output_parser.listing(raw_data) == [
+        {'ID': '1', 'Name': 'foo', 'Status': 'ACTIVE'},
+        {'ID': '2', 'Name': 'bar', 'Status': 'ERROR'}]
+
+
+def test_iter_listing_from_lines():
+    """Test streaming parsing of table lines."""
+    lines = iter([u'+----+------+\n',
+                  u'| ID | Name |\n',
+                  u'+----+------+\n',
+                  u'| 1  | foo  |\n',
+                  u'+----+------+\n'])
+    items = output_parser.iter_listing(lines)
+    assert next(items) == {'ID': '1', 'Name': 'foo'}
+    assert list(items) == []
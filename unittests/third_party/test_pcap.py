@@ -0,0 +1,105 @@
+"""
+---------------------
+pcap reader unittests
+---------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import struct
+
+from hamcrest import assert_that, contains, equal_to  # noqa H301
+import mock
+import pytest
+
+from stepler.third_party import pcap
+
+ETHERNET = b'\x00' * 12
+
+
+def _ip(src, proto, payload):
+    header = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 20 + len(payload), 0, 0,
+                         64, proto, 0, socket.inet_aton(src),
+                         socket.inet_aton('10.0.0.254'))
+    return header + payload
+
+
+def _icmp(icmp_type):
+    return struct.pack('!BBHHH', icmp_type, 0, 0, 0, 0)
+
+
+def _arp(psrc):
+    return struct.pack('!HHBBH6s4s6s4s', 1, 0x0800, 6, 4, 1, b'\x00' * 6,
+                       socket.inet_aton(psrc), b'\x00' * 6,
+                       socket.inet_aton('10.0.0.254'))
+
+
+def _vxlan(vni, frame):
+    return (struct.pack('!HHHH', 12345, 4789, 16 + len(frame), 0) +
+            struct.pack('!II', 0x08000000, vni << 8) + frame)
+
+
+@pytest.fixture
+def write_pcap(tmpdir):
+
+    def _write_pcap(packets, linktype=1):
+        path = tmpdir.join('dump.cap')
+        data = struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535,
+                           linktype)
+        for timestamp, packet in packets:
+            seconds, microseconds = divmod(timestamp, 1000000)
+            data += struct.pack('<IIII', seconds, microseconds, len(packet),
+                                len(packet)) + packet
+        path.write_binary(data)
+        return str(path)
+
+    return _write_pcap
+
+
+def test_read_records(write_pcap):
+    vxlan_frame = ETHERNET + b'\x08\x00' + _ip('192.168.0.3', 1, _icmp(0))
+    path = write_pcap([
+        (1500000, ETHERNET + b'\x08\x00' + _ip('10.0.0.1', 1, _icmp(8))),
+        (2000000, ETHERNET + b'\x81\x00\x00\x05\x08\x06' + _arp('10.0.0.2')),
+        (2250000, ETHERNET + b'\x08\x00' +
+         _ip('10.0.0.3', 17, _vxlan(42, vxlan_frame))),
+    ])
+
+    records = list(pcap.read_records(path))
+
+    assert_that(records, contains(
+        pcap.PcapRecord(1.5, None, '10.0.0.1', 8, None),
+        pcap.PcapRecord(2.0, None, None, None, '10.0.0.2'),
+        pcap.PcapRecord(2.25, 42, '192.168.0.3', 0, None)))
+
+
+def test_read_linux_cooked_records(write_pcap):
+    sll_header = b'\x00' * 14 + b'\x08\x00'
+    path = write_pcap(
+        [(1000000, sll_header + _ip('10.0.0.1', 1, _icmp(0)))], linktype=113)
+
+    records = list(pcap.read_records(path))
+
+    assert_that(records, equal_to(
+        [pcap.PcapRecord(1.0, None, '10.0.0.1', 0, None)]))
+
+
+@mock.patch.object(pcap, '_read_scapy_records', return_value=iter([]))
+def test_unsupported_linktype_is_read_with_scapy(read_scapy_records,
+                                                 write_pcap):
+    path = write_pcap([], linktype=105)
+
+    assert_that(list(pcap.read_records(path)), equal_to([]))
+    read_scapy_records.assert_called_once_with(path)
@@ -0,0 +1,55 @@
+"""
+--------------
+Ping unittests
+--------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import assert_that, calling, contains, is_, raises  # noqa H301
+import mock
+
+from stepler.third_party import ping
+
+PING_MANY_OUTPUT = """stepler-ping-result 8.8.8.8
+PING 8.8.8.8 (8.8.8.8): 56 data bytes
+
+--- 8.8.8.8 ping statistics ---
+3 packets transmitted, 0 packets received, 100% packet loss
+stepler-ping-result 10.0.0.3
+PING 10.0.0.3 (10.0.0.3): 56 data bytes
+64 bytes from 10.0.0.3: seq=0 ttl=64 time=0.889 ms
+64 bytes from 10.0.0.3: seq=1 ttl=64 time=0.512 ms
+64 bytes from 10.0.0.3: seq=2 ttl=64 time=0.481 ms
+
+--- 10.0.0.3 ping statistics ---
+3 packets transmitted, 3 packets received, 0% packet loss
+stepler-ping-result 10.0.0.4
+ping: sendto: Network unreachable"""
+
+
+def test_ping_many():
+    """Verify that results of concurrent pings are parsed."""
+    remote = mock.Mock()
+    remote.execute.return_value.stdout = PING_MANY_OUTPUT
+    ips = ['10.0.0.3', '10.0.0.4', '8.8.8.8']
+
+    results = ping.ping_many(remote, ips, count=3)
+
+    assert_that(remote.execute.call_count, is_(1))
+    assert_that(list(results), contains(*ips))
+    assert_that(results['10.0.0.3'].loss, is_(0))
+    assert_that(results['8.8.8.8'].loss, is_(3))
+    assert_that(calling(getattr).with_args(results['10.0.0.4'], 'loss'),
+                raises(ValueError))
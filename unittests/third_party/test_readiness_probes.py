@@ -0,0 +1,80 @@
+"""
+--------------------------
+Readiness probes unittests
+--------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+
+from hamcrest import assert_that, contains, empty, equal_to  # noqa H301
+import mock
+import pytest
+
+from stepler.third_party import readiness_probes
+
+
+def test_parse_output():
+    output = ("### stepler-ready glance 1500\n"
+              "some noise\n"
+              "### stepler-ready keystone 12040\n")
+
+    timings = readiness_probes.parse_output(output)
+
+    assert_that(list(timings.items()),
+                contains(('glance', 1.5), ('keystone', 12.04)))
+
+
+def test_unknown_probe():
+    with pytest.raises(KeyError):
+        readiness_probes.build_command(['unknown'])
+
+
+@mock.patch.dict(readiness_probes.PROBES, clear=True,
+                 values={'passed': 'true', 'failed': 'false'})
+def test_command_waits_probes():
+    cmd = readiness_probes.build_command(['passed'])
+    stdout = subprocess.check_output(['bash', '-c', cmd])
+
+    timings = readiness_probes.parse_output(stdout.decode())
+
+    assert_that(list(timings), equal_to(['passed']))
+
+
+@mock.patch.dict(readiness_probes.SERVICES_PROBES, clear=True, values={
+    'nova': "printf 'nova-compute node-1 up\\nnova-compute node-2 down\\n'"})
+def test_services_states():
+    cmd = readiness_probes.build_states_command()
+    stdout = subprocess.check_output(['bash', '-c', cmd])
+
+    states = readiness_probes.parse_states(stdout.decode())
+
+    assert_that(states, equal_to({'nova': ['nova-compute node-1 up']}))
+
+
+@mock.patch.dict(readiness_probes.SERVICES_PROBES, clear=True, values={
+    'nova': "printf 'nova-compute node-1 up\\nnova-compute node-2 down\\n'"})
+def test_services_probe_waits_states():
+    states = {'nova': ['nova-compute node-1 up']}
+    cmd = readiness_probes.build_command(['nova'], states=states)
+    stdout = subprocess.check_output(['timeout', '5', 'bash', '-c', cmd])
+    assert_that(list(readiness_probes.parse_output(stdout.decode())),
+                equal_to(['nova']))
+
+    # without states service which is down blocks probe
+    cmd = readiness_probes.build_command(['nova'])
+    stdout = subprocess.Popen(['timeout', '1', 'bash', '-c', cmd],
+                              stdout=subprocess.PIPE).communicate()[0]
+    assert_that(readiness_probes.parse_output(stdout.decode()), empty())
@@ -0,0 +1,176 @@
+"""
+----------------------
+Remote shell unittests
+----------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import select
+import socket
+import subprocess
+
+from hamcrest import assert_that, equal_to  # noqa H301
+import mock
+import pytest
+
+from stepler.third_party import remote_shell
+
+
+class FakeChannel(object):
+    """Channel which answers to each script with given command results."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.scripts = []
+        self.closed = False
+        self._stdout = b''
+        self._stderr = b''
+
+    def sendall(self, data):
+        self.scripts.append(data.decode('utf-8'))
+        marker = re.search(r'"\\n(\w+) %d', self.scripts[-1]).group(1)
+        exit_code, stdout, stderr = self.results.pop(0)
+        self._stdout += stdout + '\n{} {}\n'.format(marker,
+                                                    exit_code).encode()
+        self._stderr += stderr + '\n{}\n'.format(marker).encode()
+
+    def recv_ready(self):
+        return bool(self._stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self._stderr)
+
+    def recv(self, size):
+        data, self._stdout = self._stdout[:size], self._stdout[size:]
+        return data
+
+    def recv_stderr(self, size):
+        data, self._stderr = self._stderr[:size], self._stderr[size:]
+        return data
+
+    def exit_status_ready(self):
+        return False
+
+    def close(self):
+        self.closed = True
+
+
+class LocalChannel(object):
+    """Channel to local bash process."""
+
+    def __init__(self, cmd):
+        self.proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE)
+
+    @property
+    def closed(self):
+        return self.proc.poll() is not None
+
+    def fileno(self):
+        return self.proc.stdout.fileno()
+
+    def sendall(self, data):
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+
+    def _is_ready(self, stream):
+        return bool(select.select([stream], [], [], 0)[0])
+
+    def recv_ready(self):
+        return self._is_ready(self.proc.stdout)
+
+    def recv_stderr_ready(self):
+        return self._is_ready(self.proc.stderr)
+
+    def recv(self, size):
+        return os.read(self.proc.stdout.fileno(), size)
+
+    def recv_stderr(self, size):
+        return os.read(self.proc.stderr.fileno(), size)
+
+    def exit_status_ready(self):
+        return self.closed
+
+    def close(self):
+        if not self.closed:
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            stream.close()
+
+
+def _shell(*channels, **kwargs):
+    client = mock.Mock(closed=False)
+    client.execute_async.side_effect = [(channel, None, None, None)
+                                        for channel in channels]
+    return remote_shell.RemoteShell(client, **kwargs)
+
+
+@mock.patch('select.select', mock.Mock())
+def test_environment_is_prepared_once():
+    channel = FakeChannel((0, b'', b''),
+                          (0, b'out 1\n', b''),
+                          (1, b'out 2', b'err 2\n'))
+    shell = _shell(channel, init_cmd='source openrc')
+
+    assert_that(shell.execute('nova list'),
+                equal_to((0, 'out 1\n', '')))
+    assert_that(shell.execute('nova show', timeout=10),
+                equal_to((1, 'out 2', 'err 2\n')))
+
+    assert_that(len(channel.scripts), equal_to(3))
+    assert_that(channel.scripts[0].startswith('{\nsource openrc\n}'),
+                equal_to(True))
+    assert_that("timeout 10 bash -c 'nova show'" in channel.scripts[2],
+                equal_to(True))
+
+
+def test_init_environment_is_kept():
+    client = mock.Mock(closed=False)
+    client.execute_async.side_effect = (
+        lambda cmd: (LocalChannel(cmd), None, None, None))
+    shell = remote_shell.RemoteShell(client, init_cmd='export OS_TOKEN=abc')
+
+    with shell:
+        assert_that(shell.execute('echo $OS_TOKEN'),
+                    equal_to((0, 'abc\n', '')))
+        assert_that(shell.execute('echo $OS_TOKEN', timeout=10),
+                    equal_to((0, 'abc\n', '')))
+
+
+@mock.patch('select.select', mock.Mock())
+def test_broken_shell_is_reopened():
+    broken_channel = FakeChannel((0, b'', b''))
+    broken_channel.sendall = mock.Mock(side_effect=socket.error)
+    channel = FakeChannel((0, b'out', b''))
+    shell = _shell(broken_channel, channel)
+
+    assert_that(shell.execute('nova list'), equal_to((0, 'out', '')))
+    assert_that(broken_channel.closed, equal_to(True))
+
+
+@mock.patch('select.select', mock.Mock())
+def test_closed_shell_raises():
+    channel = FakeChannel((0, b'', b''))
+    channel.exit_status_ready = mock.Mock(return_value=True)
+    channel.sendall = mock.Mock()
+    shell = _shell(channel)
+
+    with pytest.raises(remote_shell.RemoteShellError):
+        shell.execute('exit')
+    assert_that(shell.closed, equal_to(True))
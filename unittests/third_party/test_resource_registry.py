@@ -0,0 +1,144 @@
+"""
+---------------------------
+Resource registry unittests
+---------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import assert_that, contains, empty, equal_to, is_  # noqa H301
+import mock
+
+from stepler.third_party import resource_registry
+
+
+def test_register_with_owner_and_nodeid():
+    """Verify that resources are registered with current owner and test."""
+    registry = resource_registry.ResourceRegistry()
+    registry.owner = 'admin'
+    registry.nodeid = 'test_foo'
+    server = mock.Mock(id='server-1')
+
+    registry.register('server', [server])
+    registry.register('port', [{'id': 'port-1'}])
+
+    assert_that(registry.records(), contains(
+        resource_registry.Record('server', 'server-1', server, 'admin',
+                                 'test_foo'),
+        resource_registry.Record('port', 'port-1', {'id': 'port-1'}, 'admin',
+                                 'test_foo')))
+
+
+def test_pop_by_service_and_nodeid():
+    """Verify that only resources of service and test are taken off."""
+    registry = resource_registry.ResourceRegistry()
+    registry.nodeid = 'test_foo'
+    registry.register('server', [{'id': '1'}])
+    registry.owner = 'user'
+    registry.register('server', [{'id': '2'}])
+    registry.register('image', [{'id': '3'}])
+    registry.nodeid = 'test_bar'
+    registry.register('server', [{'id': '4'}])
+
+    records = registry.pop('server', nodeid='test_foo')
+
+    assert_that(list(records), equal_to([None, 'user']))
+    assert_that([record.resource_id for record in records[None]],
+                equal_to(['1']))
+    assert_that([record.resource_id for record in records['user']],
+                equal_to(['2']))
+    assert_that(len(registry), is_(2))
+    assert_that(registry.pop('server', nodeid='test_foo'), empty())
+
+
+def test_pop_all_tests():
+    """Verify that resources of all tests are taken off without nodeid."""
+    registry = resource_registry.ResourceRegistry()
+    registry.nodeid = 'test_foo'
+    registry.register('image', [{'id': '1'}])
+    registry.nodeid = 'test_bar'
+    registry.register('image', [{'id': '2'}])
+
+    records = registry.pop('image')
+
+    assert_that([record.resource_id for record in records[None]],
+                equal_to(['1', '2']))
+    assert_that(len(registry), is_(0))
+
+
+def test_pop_ids_by_owner():
+    """Verify that IDs of resources are taken off grouped by owner."""
+    registry = resource_registry.ResourceRegistry()
+    registry.nodeid = 'test_foo'
+    registry.register('volume', [{'id': '1'}, {'id': '2'}])
+    registry.owner = 'user'
+    registry.register('volume', [{'id': '3'}])
+
+    ids = registry.pop_ids('volume', nodeid='test_foo')
+
+    assert_that(list(ids.items()),
+                equal_to([(None, {'1', '2'}), ('user', {'3'})]))
+    assert_that(len(registry), is_(0))
+
+
+def test_unregister():
+    """Verify that unregistered resources are not taken off."""
+    registry = resource_registry.ResourceRegistry()
+    registry.register('image', [{'id': '1'}, {'id': '2'}])
+
+    registry.unregister('image', [{'id': '1'}])
+
+    assert_that([record.resource_id for record in registry.records()],
+                equal_to(['2']))
+
+
+def test_cleanup_in_dependency_order():
+    """Verify that resources which can use service are deleted first."""
+    registry = resource_registry.ResourceRegistry()
+    registry.nodeid = 'test_foo'
+    registry.register('router', [{'id': 'router-1'}])
+    registry.register('volume', [{'id': 'volume-1'}])
+    registry.register('server', [{'id': 'server-1'}])
+    registry.register('image', [{'id': 'image-1'}])
+    deleted = []
+
+    def _get_cleaner(service):
+        return lambda ids: deleted.append((service, ids[None]))
+
+    for service in ('router', 'image', 'volume', 'server'):
+        registry.set_cleaner(service, _get_cleaner(service))
+
+    registry.cleanup('volume', nodeid='test_foo')
+
+    assert_that(deleted, equal_to([('server', {'server-1'}),
+                                   ('volume', {'volume-1'})]))
+
+    registry.cleanup(nodeid='test_foo')
+
+    assert_that(deleted[2:], equal_to([('router', {'router-1'}),
+                                       ('image', {'image-1'})]))
+    assert_that(len(registry), is_(0))
+
+
+def test_cleanup_skips_services_without_cleaner():
+    """Verify that resources of service without cleaner are kept."""
+    registry = resource_registry.ResourceRegistry()
+    registry.register('server', [{'id': 'server-1'}])
+    cleaner = mock.Mock()
+    registry.set_cleaner('volume', cleaner)
+
+    registry.cleanup('volume')
+
+    assert_that(cleaner.called, is_(False))
+    assert_that(len(registry), is_(1))
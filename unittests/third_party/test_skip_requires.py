@@ -0,0 +1,82 @@
+"""
+-----------------------
+Skip requires unittests
+-----------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import (assert_that, calling, equal_to, is_,
+                      raises)  # noqa H301
+import mock
+import pytest
+
+from stepler.third_party import skip_requires
+
+
+class FakePredicates(object):
+
+    computes_count = 3
+    dvr = False
+
+    def _get_calculated_conditions(self):
+        return ''
+
+    def _clear_calls(self):
+        pass
+
+
+@pytest.mark.parametrize('requires', [
+    ['computes_count > 2'],
+    ['not dvr', 'computes_count == 3'],
+    ['computes_count >= 2 and not dvr'],
+])
+def test_requires_satisfied(requires):
+    """Verify that test isn't skipped if requirements are satisfied."""
+    skip_requires.check_requires(FakePredicates(), requires)
+
+
+@pytest.mark.parametrize('requires', [
+    ['dvr'],
+    ['computes_count > 2', 'computes_count > 3'],
+])
+def test_requires_not_satisfied(requires):
+    """Verify that test is skipped if requirements aren't satisfied."""
+    assert_that(
+        calling(skip_requires.check_requires).with_args(
+            FakePredicates(), requires),
+        raises(pytest.skip.Exception, 'mismatch to condition'))
+
+
+def test_requires_compiled_once():
+    """Verify that requirement expression is compiled once."""
+    code = skip_requires.compile_requires('computes_count > 10')
+    assert_that(skip_requires.compile_requires('computes_count > 10'),
+                is_(code))
+
+
+def test_skip_fixture_is_set_up_first():
+    """Verify that fixture checking requirements is moved to the front."""
+    item = mock.Mock(fixturenames=['request', 'cirros_image', 'skip_test'])
+    item.get_marker.return_value.args = ['computes_count > 2']
+    skipless_item = mock.Mock(fixturenames=['cirros_image', 'skip_test'])
+    skipless_item.get_marker.return_value = None
+
+    skip_requires.pytest_collection_modifyitems(
+        mock.Mock(), [item, skipless_item])
+
+    assert_that(item.fixturenames,
+                equal_to(['skip_test', 'request', 'cirros_image']))
+    assert_that(skipless_item.fixturenames,
+                equal_to(['cirros_image', 'skip_test']))
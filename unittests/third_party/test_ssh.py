@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+------------------------------
+SSH connections pool unittests
+------------------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import assert_that, calling, is_, none, raises  # noqa H301
+import mock
+
+from stepler.third_party import ssh
+
+
+def fake_client(active=True):
+    client = mock.Mock()
+    client.get_transport.return_value.is_active.return_value = active
+    return client
+
+
+def test_acquire_released_connection():
+    """Verify that released connection is reused."""
+    pool = ssh.SshConnectionPool()
+    client = fake_client()
+    entry = pool.put('key', client)
+    pool.release(entry)
+
+    assert_that(pool.acquire('key').client, is_(client))
+    assert_that(client.close.called, is_(False))
+
+
+def test_acquire_dead_connection():
+    """Verify that dead connection isn't reused."""
+    pool = ssh.SshConnectionPool()
+    client = fake_client(active=False)
+    pool.release(pool.put('key', client))
+
+    assert_that(pool.acquire('key'), none())
+    assert_that(client.close.called, is_(True))
+
+
+def test_replaced_connection_closed_after_release():
+    """Verify that replaced connection is closed by its last user."""
+    pool = ssh.SshConnectionPool()
+    old_client = fake_client()
+    old_entry = pool.put('key', old_client)
+    pool.put('key', fake_client())
+
+    assert_that(old_client.close.called, is_(False))
+    pool.release(old_entry)
+    assert_that(old_client.close.called, is_(True))
+
+
+def test_evict_idle_connections():
+    """Verify that idle connections are evicted by timeout and size."""
+    pool = ssh.SshConnectionPool(max_size=1, idle_timeout=0)
+    clients = [fake_client(), fake_client()]
+    entries = [pool.put(('host', i), client)
+               for i, client in enumerate(clients)]
+    assert_that(len(pool), is_(2))  # connections are used
+
+    for entry in entries:
+        pool.release(entry)
+    assert_that(pool.acquire(('host', 1)), none())
+    assert_that(len(pool), is_(0))
+    assert_that(all(client.close.called for client in clients), is_(True))
+
+
+def test_command_result_output():
+    """Verify that output chunks are joined and decoded."""
+    result = ssh.CommandResult()
+    for chunk in (b'foo', b' ', u'бар\n'.encode('utf-8')):
+        result.append_stdout(chunk)
+
+    assert_that(result.stdout, is_(u'foo бар'))
+    result.append_stdout(b'baz')
+    assert_that(result.stdout_bytes, is_(u'foo бар\nbaz'.encode('utf-8')))
+    assert_that(result.stderr, is_(u''))
+
+
+class FakeChannel(object):
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.closed = False
+
+    def recv_ready(self):
+        return bool(self._chunks)
+
+    def recv(self, size):
+        chunk = self._chunks.pop(0)
+        if not self._chunks:
+            self.closed = True
+        return chunk
+
+    def recv_stderr_ready(self):
+        return False
+
+    def recv_exit_status(self):
+        return 0
+
+    def close(self):
+        self.closed = True
+
+
+@mock.patch('select.select')
+def test_execute_stdout_handler(select_mock):
+    """Verify that stdout is streamed to handler if it's passed."""
+    client = ssh.SshClient('localhost')
+    client.execute_async = mock.Mock(return_value=(
+        FakeChannel([b'foo', b'bar']), mock.Mock(), mock.Mock(), mock.Mock()))
+    chunks = []
+
+    result = client.execute('cat foo', stdout_handler=chunks.append)
+    assert_that(chunks, is_([b'foo', b'bar']))
+    assert_that(result.stdout, is_(u''))
+    assert_that(result.exit_code, is_(0))
+
+
+class EndlessChannel(FakeChannel):
+
+    def recv(self, size):
+        return b'y\n'
+
+
+@mock.patch('select.select')
+def test_execute_endless_output_timeout(select_mock):
+    """Verify that command writing output continuously is timed out."""
+    client = ssh.SshClient('localhost')
+    client.execute_async = mock.Mock(return_value=(
+        EndlessChannel([b'y\n']), mock.Mock(), mock.Mock(), mock.Mock()))
+
+    assert_that(calling(client.execute).with_args('yes', timeout=0.1),
+                raises(ssh.ExecutionTimeout))
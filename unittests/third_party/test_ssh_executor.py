@@ -0,0 +1,87 @@
+"""
+----------------------
+SSH executor unittests
+----------------------
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+
+from hamcrest import assert_that, contains, equal_to, has_entries  # noqa H301
+import mock
+
+from stepler.third_party import ssh
+from stepler.third_party import ssh_executor
+
+
+def _client(exit_code=0, stdout=b'', stderr=b'', error=None):
+    result = ssh.CommandResult()
+    result.exit_code = exit_code
+    result.append_stdout(stdout)
+    result.append_stderr(stderr)
+
+    client = mock.MagicMock()
+    client.__enter__.return_value = client
+    client.execute.return_value = result
+    if error:
+        client.__enter__.side_effect = error
+    return client
+
+
+def test_records_have_ansible_shape():
+    clients = {'10.0.0.2': _client(stdout=b' 1\n 2\n'),
+               '10.0.0.3': _client(exit_code=1, stderr=b'error\n'),
+               '10.0.0.4': _client(error=socket.error('refused'))}
+    executor = ssh_executor.SshExecutor('root')
+
+    with mock.patch.object(executor, 'get_client', side_effect=clients.get):
+        records = executor.execute(sorted(clients), 'cmd')
+
+    assert_that(records, contains(
+        ssh_executor.ExecutionRecord(
+            '10.0.0.2', 'OK', {'shell': 'cmd'},
+            {'rc': 0, 'stdout': ' 1\n 2', 'stdout_lines': [' 1', ' 2'],
+             'stderr': '', 'stderr_lines': []}),
+        ssh_executor.ExecutionRecord(
+            '10.0.0.3', 'FAILED', {'shell': 'cmd'},
+            {'rc': 1, 'stdout': '', 'stdout_lines': [],
+             'stderr': 'error', 'stderr_lines': ['error']}),
+        ssh_executor.ExecutionRecord(
+            '10.0.0.4', 'UNREACHABLE', {'shell': 'cmd'},
+            {'msg': 'refused'})))
+
+
+def test_command_is_executed_with_sudo():
+    client = _client()
+    executor = ssh_executor.SshExecutor('ubuntu', sudo=True)
+
+    with mock.patch.object(executor, 'get_client', return_value=client):
+        record, = executor.execute(['10.0.0.2'], 'cmd', timeout=10)
+
+    client.sudo.assert_called_once_with()
+    client.execute.assert_called_once_with('cmd', timeout=10)
+    assert_that(record.payload, has_entries(rc=0))
+
+
+def test_timed_out_command_fails():
+    client = _client()
+    client.execute.side_effect = ssh.ExecutionTimeout('too long')
+    executor = ssh_executor.SshExecutor('root')
+
+    with mock.patch.object(executor, 'get_client', return_value=client):
+        record, = executor.execute(['10.0.0.2'], 'cmd')
+
+    assert_that(record.status, equal_to('FAILED'))
+    assert_that(record.payload, has_entries(rc=124, stderr='too long'))
@@ -17,7 +17,11 @@ Steps checked unittests
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from hamcrest import assert_that, contains, empty, is_not  # noqa: H301
+import json
+
+from hamcrest import (assert_that, contains, contains_string, empty,
+                      equal_to, is_not)  # noqa: H301
+import mock
 import pytest
 
 from stepler.third_party import steps_checker
@@ -87,3 +91,59 @@ def test_tokenize():
     validator = steps_checker.FuncValidator(func_block)
     tokens = validator._get_tokens()
     assert_that(tokens, is_not(empty()))
+
+
+class FakeCache(dict):
+
+    def get(self, key, default):
+        return super(FakeCache, self).get(key, default)
+
+    def set(self, key, value):
+        self[key] = json.loads(json.dumps(value))
+
+
+def test_validation_cache():
+    pytest_cache = FakeCache()
+    validate = mock.Mock(return_value=['error'])
+
+    cache = steps_checker.ValidationCache(pytest_cache)
+    assert_that(cache.get(func_block, 'test', validate), contains('error'))
+    assert_that(cache.get(func_block, 'test', validate), contains('error'))
+    cache.save()
+
+    cache = steps_checker.ValidationCache(pytest_cache)
+    assert_that(cache.get(func_block, 'test', validate), contains('error'))
+    assert_that(cache.get(func_block, 'step', validate), contains('error'))
+    assert_that(validate.call_count, equal_to(2))
+
+    cache.clear()
+    cache.get(func_block, 'test', validate)
+    assert_that(validate.call_count, equal_to(3))
+
+
+def test_validation_cache_changed_file(tmpdir):
+    pytest_cache = FakeCache()
+    validate = mock.Mock(return_value=[])
+    cache = steps_checker.ValidationCache(pytest_cache)
+    cache.get(func_block, 'test', validate)
+    cache.save()
+
+    path = steps_checker._get_source_file(func_block)
+    pytest_cache[steps_checker.CACHE_KEY]['files'][path]['hash'] = 'old'
+    pytest_cache[steps_checker.CACHE_KEY]['files'][path]['mtime'] = 0
+
+    cache = steps_checker.ValidationCache(pytest_cache)
+    cache.get(func_block, 'test', validate)
+    assert_that(validate.call_count, equal_to(2))
+
+
+def func_call():
+    return dict.fromkeys([])
+
+
+def test_test_validator_with_call_names():
+    validator = steps_checker.TestValidator(func_call, ['fromkeys'])
+    assert_that(validator.get_call_names(), contains('fromkeys'))
+    assert_that(validator.validate(['fromkeys']), empty())
+    assert_that(validator.validate(['unknown']), contains(
+        contains_string("Calling 'unknown' isn't allowed")))
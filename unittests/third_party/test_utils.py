@@ -34,3 +34,21 @@ def test_grouper(iterable, chunk_size, expected):
     """Verify correct grouping."""
     result = utils.grouper(iterable, chunk_size)
     assert_that(list(result), contains(*expected))
+
+
+def test_parallel_map():
+    """Verify that results are returned in order of items."""
+    result = utils.parallel_map(lambda x: x * 2, range(20), workers=4)
+    assert_that(result, contains(*[x * 2 for x in range(20)]))
+
+
+def test_parallel_map_raises():
+    """Verify that exception from thread is raised."""
+
+    def func(x):
+        if x == 3:
+            raise ValueError('bad item')
+        return x
+
+    with pytest.raises(ValueError):
+        utils.parallel_map(func, range(5))
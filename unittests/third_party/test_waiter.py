@@ -18,11 +18,13 @@ Waiter unittests
 # limitations under the License.
 
 import logging
+import time
 
-from hamcrest import (assert_that, calling, raises, is_,
-                      string_contains_in_order)  # noqa H301
+from hamcrest import (assert_that, calling, raises, has_entries, is_,
+                      less_than, string_contains_in_order)  # noqa H301
 import pytest
 
+from stepler.third_party import utils
 from stepler.third_party import waiter
 
 lambda_predicate = lambda: False
@@ -112,3 +114,135 @@ def test_not_in_expected_exceptions():
             timeout_seconds=0,
             expected_exceptions=ValueError),
         raises(AttributeError, 'AttributeError was thrown.'))
+
+
+class FakeResource(object):
+
+    def __init__(self, id, status):
+        self.id = id
+        self.status = status
+
+
+def test_wait_resources_lists_once_per_iteration():
+    """Check that resources are polled with one listing per iteration."""
+    statuses = {'a': iter(['build', 'active']), 'b': iter(['active'])}
+    calls = []
+
+    def list_resources():
+        calls.append(1)
+        return [FakeResource(resource_id, next(status, 'active'))
+                for resource_id, status in statuses.items()]
+
+    def predicate(resource):
+        return waiter.expect_that(resource.status, is_('active'))
+
+    result = waiter.wait_resources(list_resources, ['b', 'a'], predicate,
+                                   timeout_seconds=1, sleep_seconds=0.01)
+    assert_that(list(result), is_(['b', 'a']))
+    assert_that(result['a'].status, is_('active'))
+    assert_that(len(calls), is_(2))
+
+
+def test_wait_resources_absent():
+    """Check that predicate gets None for absent resources."""
+    result = waiter.wait_resources(lambda: [FakeResource('a', 'active')],
+                                   ['a', 'b'],
+                                   lambda resource: True,
+                                   timeout_seconds=0)
+    assert_that(result['b'], is_(None))
+
+
+def test_wait_resources_raises_timeout_expired():
+    """Check that timeout message contains pending resources errors."""
+
+    def predicate(resource):
+        return waiter.expect_that(resource.status, is_('active'))
+
+    assert_that(
+        calling(waiter.wait_resources).with_args(
+            lambda: [FakeResource('a', 'active'), FakeResource('b', 'error')],
+            ['a', 'b'],
+            predicate,
+            timeout_seconds=0),
+        raises(waiter.TimeoutExpired,
+               r"b: \s*Expected: 'active'\s+but: was 'error'"))
+
+
+def test_wait_in_thread():
+    """Check that waiting works outside of main thread."""
+    result = utils.parallel_map(
+        lambda value: waiter.wait(lambda: value, timeout_seconds=1),
+        [1, 2, 3])
+    assert_that(result, is_([1, 2, 3]))
+
+
+def test_predicate_timeout():
+    """Check that long predicate is interrupted by timeout without signal."""
+    start = time.time()
+    assert_that(
+        calling(waiter.wait).with_args(
+            lambda: time.sleep(1), timeout_seconds=0.2,
+            sleep_seconds=0.01),
+        raises(waiter.TimeoutExpired, 'PredicateTimeout'))
+    assert_that(time.time() - start, less_than(1))
+
+
+def test_timed_out_predicate_calls_dont_overlap():
+    """Check that next poll waits previous timed out predicate call."""
+    running = []
+    overlaps = []
+
+    def predicate():
+        overlaps.append(len(running))
+        running.append(1)
+        if len(overlaps) == 1:  # first call is timed out
+            time.sleep(0.2)
+        running.pop()
+        return True
+
+    waiter.wait(predicate, predicate_timeout=0.1, timeout_seconds=2,
+                sleep_seconds=0)
+    assert_that(overlaps, is_([0, 0]))
+
+
+def test_backoff_intervals():
+    """Check that backoff intervals grow to maximum."""
+    intervals = waiter.Backoff(1, maximum=3, multiplier=2).intervals()
+    assert_that([next(intervals) for _ in range(4)], is_([1, 2, 3, 3]))
+
+
+def test_backoff_from_waiting_tuple():
+    """Check that tuple of ``waiting`` library is converted to backoff."""
+    assert_that(waiter.Backoff.from_value((1, 10)),
+                is_(waiter.Backoff(1, maximum=10, multiplier=2)))
+
+
+def test_stats():
+    """Check that polls count is recorded."""
+    results = iter([False, False, True])
+    waiter.reset_stats()
+
+    waiter.wait(lambda: next(results), timeout_seconds=1, sleep_seconds=0,
+                waiting_for='three polls')
+
+    assert_that(waiter.get_stats()['three polls'],
+                has_entries(calls=1, timeouts=0, polls=3))
+
+
+def test_wait_resources_gets_not_listed():
+    """Check that resource absent in listing is requested by id."""
+    requested = []
+
+    def get_resource(resource_id):
+        requested.append(resource_id)
+        if resource_id == 'b':
+            return FakeResource('b', 'active')
+
+    result = waiter.wait_resources(lambda: [FakeResource('a', 'active')],
+                                   ['a', 'b', 'c'],
+                                   lambda resource: True,
+                                   get_resource=get_resource,
+                                   timeout_seconds=0)
+    assert_that(requested, is_(['b', 'c']))
+    assert_that(result['b'].status, is_('active'))
+    assert_that(result['c'], is_(None))